@@ -1,9 +1,18 @@
 """Support for the GCE IPX800 V5."""
 
-from datetime import timedelta
+import asyncio
+from collections.abc import Awaitable
+from datetime import datetime, timedelta
+from functools import partial
 import logging
+from time import monotonic
+from typing import Any, TypeVar
 
-from pypx800v5 import IPX800, IPX800CannotConnectError, IPX800InvalidAuthError
+from pypx800v5 import (
+    IPX800CannotConnectError,
+    IPX800InvalidAuthError,
+    IPX800RequestError,
+)
 import voluptuous as vol
 
 from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntry
@@ -14,6 +23,7 @@ from homeassistant.const import (
     CONF_ICON,
     CONF_ID,
     CONF_NAME,
+    CONF_OPTIMISTIC,
     CONF_PORT,
     CONF_SCAN_INTERVAL,
     CONF_TYPE,
@@ -21,13 +31,16 @@ from homeassistant.const import (
 )
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import homeassistant.helpers.config_validation as cv
-from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.loader import async_get_integration
 
 from .const import (
+    CONF_ADAPTIVE_POLLING,
     CONF_COMPONENT,
     CONF_DEFAULT_BRIGHTNESS,
     CONF_DEVICES,
@@ -35,31 +48,68 @@ from .const import (
     CONF_DIAG_SENSORS,
     CONF_EXT_NUMBER,
     CONF_EXT_TYPE,
+    CONF_FAST_POLL_ENTITIES,
+    CONF_FAST_SCAN_INTERVAL,
     CONF_IO_NUMBER,
     CONF_IO_NUMBERS,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_PARTIAL_POLLING,
+    CONF_POLL_TIER,
     CONF_PUSH_PASSWORD,
+    CONF_PUSH_PRIMARY,
+    CONF_RECONCILE_SCAN_INTERVAL,
+    CONF_SLOW_POLL_ENTITIES,
+    CONF_SLOW_SCAN_INTERVAL,
     CONF_TRANSITION,
+    CONFIG_CHECK_INTERVAL,
     CONTROLLER,
     COORDINATOR,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_RECONCILE_SCAN_INTERVAL,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SLOW_SCAN_INTERVAL,
     DEFAULT_TRANSITION,
     DOMAIN,
-    PLATFORMS,
-    REQUEST_REFRESH_DELAY,
+    ENTITY_PLAN,
+    ENTRY_CONFIG,
+    LOADED_PLATFORMS,
+    PLATFORM_ENTITIES,
+    POLL_TIER_FAST,
+    POLL_TIER_NORMAL,
+    POLL_TIER_SLOW,
+    POLL_TIERS,
+    POLLING_OPTIONS,
+    REGISTERED_VIEWS,
+    SETUP_TIMINGS,
+    STORAGE_VERSION,
+    SUBSCRIPTIONS,
     UNDO_UPDATE_LISTENER,
 )
-from .helpers import (
-    build_extensions_entities,
-    build_ipx_entities,
-    build_ipx_system_entities,
-    build_objects_entities,
-    filter_entities_by_platform,
-    remove_duplicate_entities,
+from .controller import IpxController, get_config_hash
+from .coordinator import IpxDataUpdateCoordinator
+from .helpers import build_device_records, build_entities_by_platform, get_entry_config
+from .request_views import (
+    IpxRequestBulkView,
+    IpxRequestDataView,
+    IpxRequestIdsView,
+    IpxRequestRefreshView,
+    IpxRequestView,
 )
-from .request_views import IpxRequestDataView, IpxRequestRefreshView, IpxRequestView
 
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+# options applied by adding or removing entities
+ENTITIES_OPTIONS = {
+    CONF_ADAPTIVE_POLLING,
+    CONF_DEVICES,
+    CONF_DEVICES_AUTO,
+    CONF_DIAG_SENSORS,
+}
+
 IPX800_DEVICES_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_NAME): cv.string,
@@ -75,6 +125,7 @@ IPX800_DEVICES_SCHEMA = vol.Schema(
         vol.Optional(CONF_TRANSITION, default=DEFAULT_TRANSITION): vol.Coerce(float),
         vol.Optional(CONF_DEVICE_CLASS): cv.string,
         vol.Optional(CONF_UNIT_OF_MEASUREMENT): cv.string,
+        vol.Optional(CONF_POLL_TIER): vol.In(POLL_TIERS),
     }
 )
 
@@ -85,6 +136,15 @@ IPX800_SCHEMA = vol.Schema(
         vol.Optional(CONF_PORT, default=80): cv.port,
         vol.Required(CONF_API_KEY): cv.string,
         vol.Optional(CONF_DEVICES_AUTO, default=[]): cv.ensure_list,
+        vol.Optional(CONF_PARTIAL_POLLING): cv.boolean,
+        vol.Optional(CONF_FAST_SCAN_INTERVAL): cv.positive_int,
+        vol.Optional(CONF_SLOW_SCAN_INTERVAL): cv.positive_int,
+        vol.Optional(CONF_ADAPTIVE_POLLING): cv.boolean,
+        vol.Optional(CONF_OPTIMISTIC): cv.boolean,
+        vol.Optional(CONF_MIN_SCAN_INTERVAL): cv.positive_int,
+        vol.Optional(CONF_MAX_SCAN_INTERVAL): cv.positive_int,
+        vol.Optional(CONF_PUSH_PRIMARY): cv.boolean,
+        vol.Optional(CONF_RECONCILE_SCAN_INTERVAL): cv.positive_int,
         vol.Optional(CONF_DEVICES, default=[]): vol.All(
             cv.ensure_list, [IPX800_DEVICES_SCHEMA]
         ),
@@ -114,140 +174,183 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up the IPX800v5."""
     hass.data.setdefault(DOMAIN, {})
+    timings: dict[str, float] = {}
+    setup_started_at = monotonic()
 
-    config = entry.options | entry.data
+    config = get_entry_config(entry)
 
     session = async_get_clientsession(hass, False)
 
-    ipx = IPX800(
+    ipx = IpxController(
         host=config[CONF_HOST],
         port=config[CONF_PORT],
         api_key=config[CONF_API_KEY],
         session=session,
     )
 
-    try:
-        await ipx.ping()
-    except IPX800CannotConnectError as exception:
-        _LOGGER.error(
-            "Cannot connect to the %s IPX800 V5, check host and port",
-            config[CONF_HOST],
-        )
-        raise ConfigEntryNotReady from exception
-    except IPX800InvalidAuthError:
-        _LOGGER.error("Authentication error, check API Key")
-        return False
-
-    await ipx.init_config()
+    coordinator = IpxDataUpdateCoordinator(
+        hass, ipx, name=config[CONF_NAME], **_get_polling_options(config)
+    )
 
-    async def async_update_data():
-        """Fetch data from API."""
+    # the configuration of the last start is used while the IPX800 is checked
+    store: Store[dict] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
+    cached_config = await _async_timed(timings, "load_cache", store.async_load())
+    if cached_config is not None:
+        _LOGGER.debug("Use the cached configuration of the %s", config[CONF_NAME])
+        ipx.restore_config(cached_config)
+        await _async_timed(timings, "first_refresh", coordinator.async_refresh())
+    else:
+        # the first request of init_config checks the connection to the IPX800
         try:
-            return await ipx.global_get()
-        except IPX800InvalidAuthError as err:
-            raise UpdateFailed("Authentication error on IPX800") from err
-        except IPX800CannotConnectError as err:
-            raise UpdateFailed(f"Failed to communicating with API: {err}") from err
-
-    scan_interval = config.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
-
-    if scan_interval < 10:
-        _LOGGER.warning(
-            "A scan interval too low has been set, you will send too many requests to your IPX800"
-        )
-
-    coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name=config[CONF_NAME],
-        update_method=async_update_data,
-        update_interval=timedelta(seconds=scan_interval),
-        request_refresh_debouncer=Debouncer(
-            hass,
-            _LOGGER,
-            cooldown=REQUEST_REFRESH_DELAY,
-            immediate=False,
-        ),
-    )
+            await asyncio.gather(
+                _async_timed(timings, "init_config", ipx.init_config()),
+                _async_timed(timings, "first_refresh", coordinator.async_refresh()),
+            )
+        except IPX800CannotConnectError as exception:
+            _LOGGER.error(
+                "Cannot connect to the %s IPX800 V5, check host and port",
+                config[CONF_HOST],
+            )
+            raise ConfigEntryNotReady from exception
+        except IPX800InvalidAuthError:
+            _LOGGER.error("Authentication error, check API Key")
+            return False
+        await store.async_save(ipx.export_config())
 
     undo_listener = entry.add_update_listener(_async_update_listener)
 
-    await coordinator.async_refresh()
-
     hass.data[DOMAIN][entry.entry_id] = {
         CONF_NAME: config[CONF_NAME],
         CONTROLLER: ipx,
         COORDINATOR: coordinator,
+        SUBSCRIPTIONS: coordinator.subscriptions,
         CONF_DEVICES: {},
+        ENTRY_CONFIG: config,
+        LOADED_PLATFORMS: set(),
+        PLATFORM_ENTITIES: {},
         UNDO_UPDATE_LISTENER: undo_listener,
+        SETUP_TIMINGS: timings,
     }
 
-    # Parse devices config is correct and supported
-    # devices = check_devices_list(devices)
-
-    # build list of entities according to the configuration and discovered extensions and objects
-    auto_entities = []
-    auto_entities.extend(
-        build_ipx_entities(
-            entry.source, config[CONF_DEVICES], config.get(CONF_DEVICES_AUTO, [])
-        )
+    # the entities are only built again when their configuration has changed
+    plan_store = _get_entity_plan_store(hass, entry)
+    plan_hash = await _async_get_entity_plan_hash(hass, entry, ipx)
+    entity_plan = await _async_timed(
+        timings, "load_entity_plan", plan_store.async_load()
     )
-    auto_entities.extend(
-        build_ipx_system_entities(ipx, config.get(CONF_DIAG_SENSORS, False))
+    cache_hit = entity_plan is not None and entity_plan["hash"] == plan_hash
+    if cache_hit:
+        devices = entity_plan["platforms"]
+    else:
+        build_started_at = monotonic()
+        devices = build_entities_by_platform(entry.source, ipx, config)
+        timings["build_entities"] = round(monotonic() - build_started_at, 3)
+        await plan_store.async_save({"hash": plan_hash, "platforms": devices})
+    hass.data[DOMAIN][entry.entry_id][CONF_DEVICES] = build_device_records(devices)
+    hass.data[DOMAIN][entry.entry_id][ENTITY_PLAN] = {
+        "hash": plan_hash,
+        "cache_hit": cache_hit,
+    }
+
+    await _async_timed(
+        timings, "forward_platforms", async_forward_platforms(hass, entry)
     )
-    auto_entities.extend(
-        build_extensions_entities(
-            entry.source, ipx, config[CONF_DEVICES], config.get(CONF_DEVICES_AUTO, [])
+    if cached_config is not None:
+        # checked once the entities are set up, a change updates them in place
+        entry.async_create_background_task(
+            hass,
+            _async_check_cached_config(hass, entry, store),
+            f"{DOMAIN}_{entry.entry_id}_check_config",
         )
-    )
-    auto_entities.extend(
-        build_objects_entities(
-            entry.source, ipx, config[CONF_DEVICES], config.get(CONF_DEVICES_AUTO, [])
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass,
+            partial(_async_check_extensions_config, hass, entry, store),
+            timedelta(seconds=CONFIG_CHECK_INTERVAL),
+            name=f"{DOMAIN}_{entry.entry_id}_check_extensions",
+            cancel_on_shutdown=True,
         )
     )
-    entities = list(config[CONF_DEVICES])
-    entities.extend(remove_duplicate_entities(auto_entities, config[CONF_DEVICES]))
-
-    for platform in PLATFORMS:
-        _LOGGER.debug("Load platform %s", platform)
-        hass.data[DOMAIN][entry.entry_id][CONF_DEVICES][platform] = (
-            filter_entities_by_platform(entities, platform)
-        )
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     # Provide endpoints for the IPX to call to push states
     if CONF_PUSH_PASSWORD in config:
-        hass.http.register_view(
-            IpxRequestView(
-                config[CONF_HOST], config[CONF_PUSH_PASSWORD], config[CONF_NAME]
-            )
-        )
-        hass.http.register_view(
-            IpxRequestDataView(
-                config[CONF_HOST], config[CONF_PUSH_PASSWORD], config[CONF_NAME]
-            )
-        )
-
-        hass.http.register_view(
-            IpxRequestRefreshView(
-                config[CONF_HOST],
-                config[CONF_PUSH_PASSWORD],
-                config[CONF_NAME],
-                coordinator,
-            )
-        )
+        # routes can't be removed from the HTTP server, the views are
+        # registered once and look up the loaded entry on each request
+        registered_views = hass.data[DOMAIN].setdefault(REGISTERED_VIEWS, set())
+        if (entry.entry_id, config[CONF_NAME]) not in registered_views:
+            registered_views.add((entry.entry_id, config[CONF_NAME]))
+            for view_class in (
+                IpxRequestView,
+                IpxRequestDataView,
+                IpxRequestIdsView,
+                IpxRequestBulkView,
+                IpxRequestRefreshView,
+            ):
+                hass.http.register_view(view_class(config[CONF_NAME], entry.entry_id))
     else:
         _LOGGER.info(
             "No %s parameter provided in configuration, skip API call handling for IPX800 PUSH",
             CONF_PUSH_PASSWORD,
         )
 
+    timings["total"] = round(monotonic() - setup_started_at, 3)
+    _LOGGER.debug("Setup of the %s done in %s", config[CONF_NAME], timings)
     return True
 
 
+def _get_polling_options(config: dict) -> dict[str, Any]:
+    """Return the coordinator polling options of the entry configuration."""
+    scan_interval = config.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    poll_intervals = {
+        POLL_TIER_FAST: config.get(CONF_FAST_SCAN_INTERVAL, scan_interval),
+        POLL_TIER_NORMAL: scan_interval,
+        POLL_TIER_SLOW: config.get(CONF_SLOW_SCAN_INTERVAL, DEFAULT_SLOW_SCAN_INTERVAL),
+    }
+
+    adaptive_interval = None
+    if config.get(CONF_ADAPTIVE_POLLING, False):
+        adaptive_interval = (
+            config.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL),
+            config.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL),
+        )
+
+    if min(*poll_intervals.values(), *(adaptive_interval or ())) < 10:
+        _LOGGER.warning(
+            "A scan interval too low has been set, you will send too many requests to your IPX800"
+        )
+
+    # entities selected for the fast tier win over the slow tier
+    poll_tier_overrides = {
+        unique_id: POLL_TIER_SLOW
+        for unique_id in config.get(CONF_SLOW_POLL_ENTITIES, [])
+    } | {
+        unique_id: POLL_TIER_FAST
+        for unique_id in config.get(CONF_FAST_POLL_ENTITIES, [])
+    }
+
+    # pushes drive the updates only once a push password is set
+    push_reconcile_interval = None
+    if config.get(CONF_PUSH_PRIMARY, False) and config.get(CONF_PUSH_PASSWORD):
+        push_reconcile_interval = config.get(
+            CONF_RECONCILE_SCAN_INTERVAL, DEFAULT_RECONCILE_SCAN_INTERVAL
+        )
+
+    return {
+        "poll_intervals": poll_intervals,
+        "partial_polling": config.get(CONF_PARTIAL_POLLING, False),
+        "poll_tier_overrides": poll_tier_overrides,
+        "adaptive_interval": adaptive_interval,
+        "optimistic": config.get(CONF_OPTIMISTIC, False),
+        "push_reconcile_interval": push_reconcile_interval,
+    }
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    await hass.config_entries.async_unload_platforms(
+        entry, hass.data[DOMAIN][entry.entry_id][LOADED_PLATFORMS]
+    )
+    await hass.data[DOMAIN][entry.entry_id][CONTROLLER].async_cancel_writes()
 
     hass.data[DOMAIN][entry.entry_id][UNDO_UPDATE_LISTENER]()
 
@@ -256,6 +359,229 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+async def async_forward_platforms(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Forward the setup to the platforms with entities not loaded yet.
+
+    Platforms without entities are not loaded, they are loaded once a
+    configuration update gives them entities.
+    """
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    loaded_platforms: set[str] = entry_data[LOADED_PLATFORMS]
+    platforms = [
+        platform
+        for platform, devices in entry_data[CONF_DEVICES].items()
+        if devices and platform not in loaded_platforms
+    ]
+    if not platforms:
+        return
+    _LOGGER.debug("Load platforms %s", platforms)
+    loaded_platforms.update(platforms)
+    await hass.config_entries.async_forward_entry_setups(entry, platforms)
+
+
+async def _async_timed(
+    timings: dict[str, float], phase: str, awaitable: Awaitable[_T]
+) -> _T:
+    """Await a setup phase and record its duration."""
+    started_at = monotonic()
+    try:
+        return await awaitable
+    finally:
+        timings[phase] = round(monotonic() - started_at, 3)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached configuration and entities of a removed entry."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+    await _get_entity_plan_store(hass, entry).async_remove()
+
+
+def _get_entity_plan_store(hass: HomeAssistant, entry: ConfigEntry) -> Store[dict]:
+    """Return the storage of the entities built for the entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.entity_plan")
+
+
+async def _async_get_entity_plan_hash(
+    hass: HomeAssistant, entry: ConfigEntry, ipx: IpxController
+) -> str:
+    """Return the hash of everything the entities are built from.
+
+    The integration version is part of it, a new version may build other
+    entities from the same configuration.
+    """
+    integration = await async_get_integration(hass, DOMAIN)
+    return get_config_hash(
+        {
+            "version": str(integration.version),
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+            "ipx": ipx.export_config(),
+        }
+    )
+
+
+async def _async_check_cached_config(
+    hass: HomeAssistant, entry: ConfigEntry, store: Store[dict]
+) -> None:
+    """Compare the cached configuration with the IPX800 one.
+
+    The configuration is read with another controller, so the shared control
+    objects of the entities are kept while it is requested. A new firmware,
+    extension or object adds or removes the entities in place, a new MAC
+    address reloads the entry as the unique ids of the entities change.
+    """
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    ipx: IpxController = entry_data[CONTROLLER]
+    live_ipx = IpxController(
+        host=ipx.host,
+        port=ipx.port,
+        api_key=entry_data[ENTRY_CONFIG][CONF_API_KEY],
+        session=async_get_clientsession(hass, False),
+    )
+    try:
+        await live_ipx.init_config()
+    except (
+        IPX800CannotConnectError,
+        IPX800InvalidAuthError,
+        IPX800RequestError,
+    ) as err:
+        _LOGGER.warning(
+            "Cannot check the cached configuration of the %s: %s", entry.title, err
+        )
+        return
+
+    config = live_ipx.export_config()
+    if config == ipx.export_config():
+        return
+    await store.async_save(config)
+    if config["mac_address"] != ipx.mac_address:
+        _LOGGER.info("MAC address of the %s has changed, reload it", entry.title)
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+        return
+
+    _LOGGER.info(
+        "Configuration of the %s has changed, update its entities", entry.title
+    )
+    ipx.restore_config(config)
+    device_registry = dr.async_get(hass)
+    if device := device_registry.async_get_device(
+        identifiers={(DOMAIN, ipx.mac_address)}
+    ):
+        device_registry.async_update_device(device.id, sw_version=ipx.firmware_version)
+    await _async_update_entities(
+        hass,
+        entry,
+        build_entities_by_platform(entry.source, ipx, entry_data[ENTRY_CONFIG]),
+    )
+
+
 async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Handle options update."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Handle options update.
+
+    Polling options are applied to the running coordinator and a change of the
+    devices only adds or removes their entities, other changes reload the
+    entry.
+    """
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    previous_config = entry_data[ENTRY_CONFIG]
+    config = get_entry_config(entry)
+    changed = {
+        key
+        for key in previous_config.keys() | config.keys()
+        if previous_config.get(key) != config.get(key)
+    }
+    if not changed:
+        return
+    if not changed <= POLLING_OPTIONS | ENTITIES_OPTIONS:
+        _LOGGER.debug("Reload the %s for the %s changes", entry.title, changed)
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    _LOGGER.debug("Apply the %s changes to the %s", changed, entry.title)
+    entry_data[ENTRY_CONFIG] = config
+    ipx: IpxController = entry_data[CONTROLLER]
+    if changed & POLLING_OPTIONS:
+        entry_data[COORDINATOR].async_update_options(**_get_polling_options(config))
+
+    if changed & ENTITIES_OPTIONS:
+        await _async_update_entities(
+            hass, entry, build_entities_by_platform(entry.source, ipx, config)
+        )
+    else:
+        await _async_save_entity_plan(hass, entry)
+
+
+async def _async_check_extensions_config(
+    hass: HomeAssistant, entry: ConfigEntry, store: Store[dict], _now: datetime
+) -> None:
+    """Update the entities when the extensions or objects have changed.
+
+    Only the extensions and objects are requested, their fingerprint is
+    compared with the known one and the entities of the extensions and
+    objects added or removed are added or removed, without a reload.
+    """
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    ipx: IpxController = entry_data[CONTROLLER]
+    fingerprint = ipx.config_fingerprint
+    try:
+        await ipx.update_extensions_and_objects_config()
+    except (
+        IPX800CannotConnectError,
+        IPX800InvalidAuthError,
+        IPX800RequestError,
+    ) as err:
+        _LOGGER.debug(
+            "Cannot check the extensions and objects of the %s: %s", entry.title, err
+        )
+        return
+
+    if ipx.config_fingerprint == fingerprint:
+        return
+    _LOGGER.info(
+        "Extensions or objects of the %s have changed, update its entities",
+        entry.title,
+    )
+    await store.async_save(ipx.export_config())
+    await _async_update_entities(
+        hass,
+        entry,
+        build_entities_by_platform(entry.source, ipx, entry_data[ENTRY_CONFIG]),
+    )
+
+
+async def _async_update_entities(
+    hass: HomeAssistant, entry: ConfigEntry, devices: dict[str, list]
+) -> None:
+    """Add and remove the entities for new entities by platform."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    records = entry_data[CONF_DEVICES] = build_device_records(devices)
+    for platform, platform_entities in entry_data[PLATFORM_ENTITIES].items():
+        await platform_entities.async_update(records[platform])
+    await async_forward_platforms(hass, entry)
+
+    # devices of the extensions and objects removed
+    device_registry = dr.async_get(hass)
+    entity_registry = er.async_get(hass)
+    for device in dr.async_entries_for_config_entry(device_registry, entry.entry_id):
+        if not er.async_entries_for_device(
+            entity_registry, device.id, include_disabled_entities=True
+        ):
+            device_registry.async_update_device(
+                device.id, remove_config_entry_id=entry.entry_id
+            )
+
+    await _async_save_entity_plan(hass, entry)
+
+
+async def _async_save_entity_plan(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Save the entities by platform with the hash of their configuration."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    devices = {
+        platform: [record.as_config() for record in records]
+        for platform, records in entry_data[CONF_DEVICES].items()
+    }
+    plan_hash = await _async_get_entity_plan_hash(hass, entry, entry_data[CONTROLLER])
+    await _get_entity_plan_store(hass, entry).async_save(
+        {"hash": plan_hash, "platforms": devices}
+    )
+    entry_data[ENTITY_PLAN]["hash"] = plan_hash
@@ -1,5 +1,6 @@
 """Support for IPX800 V5 binary sensors."""
 
+from functools import partial
 import logging
 
 from pypx800v5 import (
@@ -7,7 +8,6 @@ from pypx800v5 import (
     EXT_X8R,
     EXT_X24D,
     IPX,
-    IPX800,
     OBJECT_ACCESS_CONTROL,
     OBJECT_TEMPO,
     OBJECT_THERMOSTAT,
@@ -27,20 +27,14 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_TYPE
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import (
-    CONF_DEVICES,
-    CONF_EXT_TYPE,
-    CONTROLLER,
-    COORDINATOR,
-    DOMAIN,
-    TYPE_IPX_OPTO,
-)
+from .const import POLL_TIER_FAST, TYPE_IPX_OPTO
+from .controller import IpxController
 from .entity import IpxEntity
+from .helpers import EntityClasses, IpxDeviceRecord, async_setup_platform_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -51,64 +45,16 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the IPX800 sensors."""
-    controller = hass.data[DOMAIN][entry.entry_id][CONTROLLER]
-    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
-    devices = hass.data[DOMAIN][entry.entry_id][CONF_DEVICES]["binary_sensor"]
-
-    entities: list[BinarySensorEntity] = []
-
-    for device in devices:
-        if device.get(CONF_TYPE) == TYPE_IO:
-            entities.append(IOBinarySensor(device, controller, coordinator))
-        elif device[CONF_EXT_TYPE] == IPX:
-            if device.get(CONF_TYPE) == TYPE_IPX_OPTO:
-                entities.append(
-                    IpxOptoInputBinarySensor(device, controller, coordinator)
-                )
-            else:
-                entities.append(
-                    IpxDigitalInputBinarySensor(device, controller, coordinator)
-                )
-        elif device[CONF_EXT_TYPE] == EXT_X8R:
-            entities.append(X8RLongPushBinarySensor(device, controller, coordinator))
-        elif device[CONF_EXT_TYPE] == EXT_X24D:
-            entities.append(X24DBinarySensor(device, controller, coordinator))
-        elif device[CONF_EXT_TYPE] == EXT_X8D:
-            entities.append(X8DBinarySensor(device, controller, coordinator))
-        elif device[CONF_EXT_TYPE] == OBJECT_TEMPO:
-            entities.append(TempoStateBinarySensor(device, controller, coordinator))
-        elif device[CONF_EXT_TYPE] == OBJECT_THERMOSTAT:
-            entities.append(
-                ThermostatFaultStateBinarySensor(device, controller, coordinator)
-            )
-        elif device[CONF_EXT_TYPE] == OBJECT_ACCESS_CONTROL:
-            entities.append(
-                AccessControlBinarySensor(
-                    device_config=device,
-                    coordinator=coordinator,
-                    ipx=controller,
-                    id_name="io_out_id",
-                    suffix_name="Success",
-                    device_class=BinarySensorDeviceClass.LOCK,
-                )
-            )
-            entities.append(
-                AccessControlBinarySensor(
-                    device_config=device,
-                    coordinator=coordinator,
-                    ipx=controller,
-                    id_name="io_fault_id",
-                    suffix_name="Fail",
-                    device_class=BinarySensorDeviceClass.SAFETY,
-                )
-            )
-
-    async_add_entities(entities, True)
+    async_setup_platform_entities(
+        hass, entry, "binary_sensor", ENTITY_CLASSES, async_add_entities
+    )
 
 
 class IOBinarySensor(IpxEntity, BinarySensorEntity):
     """Representation of a IO value as a binary sensor."""
 
+    _poll_tier = POLL_TIER_FAST
+
     @property
     def is_on(self) -> bool:
         """Return the current value."""
@@ -118,12 +64,18 @@ class IOBinarySensor(IpxEntity, BinarySensorEntity):
 class IpxDigitalInputBinarySensor(IpxEntity, BinarySensorEntity):
     """Representation of a IPX digital input as a binary sensor."""
 
+    _poll_tier = POLL_TIER_FAST
+
     def __init__(
-        self, device_config: dict, ipx: IPX800, coordinator: DataUpdateCoordinator
+        self,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
+        coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the digital input sensor of the IPX800."""
         super().__init__(device_config, ipx, coordinator)
-        self.control = IPX800DigitalInput(ipx, self._io_number)
+        self.control = ipx.get_control(IPX800DigitalInput, self._io_number)
+        self._set_state_ids(self.control.io_state_id)
 
     @property
     def is_on(self) -> bool:
@@ -134,12 +86,18 @@ class IpxDigitalInputBinarySensor(IpxEntity, BinarySensorEntity):
 class IpxOptoInputBinarySensor(IpxEntity, BinarySensorEntity):
     """Representation of a IPX Opto input as a binary sensor."""
 
+    _poll_tier = POLL_TIER_FAST
+
     def __init__(
-        self, device_config: dict, ipx: IPX800, coordinator: DataUpdateCoordinator
+        self,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
+        coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the opto input sensor of the IPX800."""
         super().__init__(device_config, ipx, coordinator)
-        self.control = IPX800OptoInput(ipx, self._io_number)
+        self.control = ipx.get_control(IPX800OptoInput, self._io_number)
+        self._set_state_ids(self.control.io_state_id)
 
     @property
     def is_on(self) -> bool:
@@ -150,12 +108,18 @@ class IpxOptoInputBinarySensor(IpxEntity, BinarySensorEntity):
 class X24DBinarySensor(IpxEntity, BinarySensorEntity):
     """Representation of a X24D digital input as a binary sensor."""
 
+    _poll_tier = POLL_TIER_FAST
+
     def __init__(
-        self, device_config: dict, ipx: IPX800, coordinator: DataUpdateCoordinator
+        self,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
+        coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the digital input sensor of the X-24D."""
         super().__init__(device_config, ipx, coordinator)
-        self.control = X24D(ipx, self._ext_number, self._io_number)
+        self.control = ipx.get_control(X24D, self._ext_number, self._io_number)
+        self._set_state_ids(self.control.io_state_id)
 
     @property
     def is_on(self) -> bool:
@@ -166,12 +130,18 @@ class X24DBinarySensor(IpxEntity, BinarySensorEntity):
 class X8DBinarySensor(IpxEntity, BinarySensorEntity):
     """Representation of a X8D digital input as a binary sensor."""
 
+    _poll_tier = POLL_TIER_FAST
+
     def __init__(
-        self, device_config: dict, ipx: IPX800, coordinator: DataUpdateCoordinator
+        self,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
+        coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the digital input sensor of the X-8D."""
         super().__init__(device_config, ipx, coordinator)
-        self.control = X8D(ipx, self._ext_number, self._io_number)
+        self.control = ipx.get_control(X8D, self._ext_number, self._io_number)
+        self._set_state_ids(self.control.io_state_id)
 
     @property
     def is_on(self) -> bool:
@@ -182,12 +152,18 @@ class X8DBinarySensor(IpxEntity, BinarySensorEntity):
 class TempoStateBinarySensor(IpxEntity, BinarySensorEntity):
     """Representation the tempo state as a binary sensor."""
 
+    _poll_tier = POLL_TIER_FAST
+
     def __init__(
-        self, device_config: dict, ipx: IPX800, coordinator: DataUpdateCoordinator
+        self,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
+        coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the sensor of the tempo."""
         super().__init__(device_config, ipx, coordinator)
-        self.control = Tempo(ipx, self._ext_number)
+        self.control = ipx.get_control(Tempo, self._ext_number)
+        self._set_state_ids(self.control.io_state_id)
 
     @property
     def is_on(self) -> bool:
@@ -198,12 +174,18 @@ class TempoStateBinarySensor(IpxEntity, BinarySensorEntity):
 class X8RLongPushBinarySensor(IpxEntity, BinarySensorEntity):
     """Representation of a X8R long push as a binary sensor."""
 
+    _poll_tier = POLL_TIER_FAST
+
     def __init__(
-        self, device_config: dict, ipx: IPX800, coordinator: DataUpdateCoordinator
+        self,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
+        coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the long push sensor of the X-8R."""
         super().__init__(device_config, ipx, coordinator, suffix_name="Long Push")
-        self.control = X8R(ipx, self._ext_number, self._io_number)
+        self.control = ipx.get_control(X8R, self._ext_number, self._io_number)
+        self._set_state_ids(self.control.io_longpush_id)
 
     @property
     def is_on(self) -> bool:
@@ -215,11 +197,15 @@ class ThermostatFaultStateBinarySensor(IpxEntity, BinarySensorEntity):
     """Representation the thermostat error state as a binary sensor."""
 
     def __init__(
-        self, device_config: dict, ipx: IPX800, coordinator: DataUpdateCoordinator
+        self,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
+        coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the sensor of the tempo."""
         super().__init__(device_config, ipx, coordinator, suffix_name="Fault")
-        self.control = Thermostat(ipx, self._ext_number)
+        self.control = ipx.get_control(Thermostat, self._ext_number)
+        self._set_state_ids(self.control.io_fault_id)
 
     @property
     def is_on(self) -> bool:
@@ -230,10 +216,12 @@ class ThermostatFaultStateBinarySensor(IpxEntity, BinarySensorEntity):
 class AccessControlBinarySensor(IpxEntity, BinarySensorEntity):
     """Representation the Access Control state as a binary sensor."""
 
+    _poll_tier = POLL_TIER_FAST
+
     def __init__(
         self,
-        device_config: dict,
-        ipx: IPX800,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
         coordinator: DataUpdateCoordinator,
         id_name: str,
         suffix_name: str,
@@ -241,11 +229,38 @@ class AccessControlBinarySensor(IpxEntity, BinarySensorEntity):
     ) -> None:
         """Initialize the sensor of the tempo."""
         super().__init__(device_config, ipx, coordinator, suffix_name)
-        self.control = AccessControl(ipx, self._ext_number)
+        self.control = ipx.get_control(AccessControl, self._ext_number)
         self._attr_device_class = device_class
         self._id_name = id_name
+        self._set_state_ids(getattr(self.control, id_name))
 
     @property
     def is_on(self) -> bool:
         """Return the current value."""
         return self.coordinator.data[getattr(self.control, self._id_name)]["on"] is True
+
+
+ENTITY_CLASSES: EntityClasses = {
+    TYPE_IO: (IOBinarySensor,),
+    (IPX, TYPE_IPX_OPTO): (IpxOptoInputBinarySensor,),
+    IPX: (IpxDigitalInputBinarySensor,),
+    EXT_X8R: (X8RLongPushBinarySensor,),
+    EXT_X24D: (X24DBinarySensor,),
+    EXT_X8D: (X8DBinarySensor,),
+    OBJECT_TEMPO: (TempoStateBinarySensor,),
+    OBJECT_THERMOSTAT: (ThermostatFaultStateBinarySensor,),
+    OBJECT_ACCESS_CONTROL: (
+        partial(
+            AccessControlBinarySensor,
+            id_name="io_out_id",
+            suffix_name="Success",
+            device_class=BinarySensorDeviceClass.LOCK,
+        ),
+        partial(
+            AccessControlBinarySensor,
+            id_name="io_fault_id",
+            suffix_name="Fail",
+            device_class=BinarySensorDeviceClass.SAFETY,
+        ),
+    ),
+}
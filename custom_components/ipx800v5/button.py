@@ -9,8 +9,8 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import CONF_DEVICES, CONF_EXT_TYPE, CONTROLLER, COORDINATOR, DOMAIN
 from .entity import IpxEntity
+from .helpers import EntityClasses, async_setup_platform_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,17 +21,9 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the IPX800 buttons."""
-    controller = hass.data[DOMAIN][entry.entry_id][CONTROLLER]
-    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
-    devices = hass.data[DOMAIN][entry.entry_id][CONF_DEVICES]["button"]
-
-    entities: list[ButtonEntity] = []
-
-    for device in devices:
-        if device[CONF_EXT_TYPE] == IPX:
-            entities.append(RebootButton(device, controller, coordinator))  # noqa: PERF401
-
-    async_add_entities(entities, True)
+    async_setup_platform_entities(
+        hass, entry, "button", ENTITY_CLASSES, async_add_entities
+    )
 
 
 class RebootButton(IpxEntity, ButtonEntity):
@@ -40,3 +32,8 @@ class RebootButton(IpxEntity, ButtonEntity):
     async def async_press(self) -> None:
         """Handle the button press."""
         self.ipx.reboot()
+
+
+ENTITY_CLASSES: EntityClasses = {
+    IPX: (RebootButton,),
+}
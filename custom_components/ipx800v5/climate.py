@@ -7,7 +7,6 @@ from pypx800v5 import (
     EXT_X4FP,
     EXT_X8R,
     IPX,
-    IPX800,
     OBJECT_THERMOSTAT,
     X4FP,
     X8R,
@@ -32,8 +31,9 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import CONF_DEVICES, CONF_EXT_TYPE, CONTROLLER, COORDINATOR, DOMAIN
+from .controller import IpxController
 from .entity import IpxEntity
+from .helpers import EntityClasses, IpxDeviceRecord, async_setup_platform_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -44,21 +44,9 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the IPX800 switches."""
-    controller = hass.data[DOMAIN][entry.entry_id][CONTROLLER]
-    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
-    devices = hass.data[DOMAIN][entry.entry_id][CONF_DEVICES]["climate"]
-
-    entities: list[ClimateEntity] = []
-
-    for device in devices:
-        if device[CONF_EXT_TYPE] == EXT_X4FP:
-            entities.append(X4FPClimate(device, controller, coordinator))
-        elif device[CONF_EXT_TYPE] in [IPX, EXT_X8R]:
-            entities.append(RelayClimate(device, controller, coordinator))
-        elif device[CONF_EXT_TYPE] == OBJECT_THERMOSTAT:
-            entities.append(ThermostatClimate(device, controller, coordinator))
-
-    async_add_entities(entities, True)
+    async_setup_platform_entities(
+        hass, entry, "climate", ENTITY_CLASSES, async_add_entities
+    )
 
 
 class X4FPClimate(IpxEntity, ClimateEntity):
@@ -83,13 +71,21 @@ class X4FPClimate(IpxEntity, ClimateEntity):
 
     def __init__(
         self,
-        device_config: dict,
-        ipx: IPX800,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
         coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the X4FPClimate."""
         super().__init__(device_config, ipx, coordinator)
-        self.control = X4FP(ipx, self._ext_number, self._io_number)
+        self.control = ipx.get_control(X4FP, self._ext_number, self._io_number)
+        self._set_state_ids(
+            self.control.io_eco_id,
+            self.control.io_comfort_id,
+            self.control.io_comfort_1_id,
+            self.control.io_comfort_2_id,
+            self.control.io_anti_freeze_id,
+            self.control.io_stop_id,
+        )
 
     @property
     def _mode(self) -> X4FPMode:
@@ -147,7 +143,7 @@ class X4FPClimate(IpxEntity, ClimateEntity):
             f"{PRESET_COMFORT} -2": X4FPMode.COMFORT_2,
         }
         await self.control.set_mode(switcher.get(preset_mode))
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command()
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set hvac mode."""
@@ -155,7 +151,7 @@ class X4FPClimate(IpxEntity, ClimateEntity):
             await self.control.set_mode(X4FPMode.COMFORT)
         elif hvac_mode == HVACMode.OFF:
             await self.control.set_mode(X4FPMode.STOP)
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command()
 
     async def async_turn_off(self) -> None:
         """Turn off."""
@@ -181,18 +177,25 @@ class RelayClimate(IpxEntity, ClimateEntity):
 
     def __init__(
         self,
-        device_config: dict,
-        ipx: IPX800,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
         coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the RelayClimate."""
         super().__init__(device_config, ipx, coordinator)
-        if device_config[CONF_EXT_TYPE] == IPX:
-            self.control_minus = IPX800Relay(ipx, self._io_numbers[0])
-            self.control_plus = IPX800Relay(ipx, self._io_numbers[1])
-        elif device_config[CONF_EXT_TYPE] == EXT_X8R:
-            self.control_minus = X8R(ipx, self._ext_number, self._io_numbers[0])
-            self.control_plus = X8R(ipx, self._ext_number, self._io_numbers[1])
+        if device_config.ext_type == IPX:
+            self.control_minus = ipx.get_control(IPX800Relay, self._io_numbers[0])
+            self.control_plus = ipx.get_control(IPX800Relay, self._io_numbers[1])
+        elif device_config.ext_type == EXT_X8R:
+            self.control_minus = ipx.get_control(
+                X8R, self._ext_number, self._io_numbers[0]
+            )
+            self.control_plus = ipx.get_control(
+                X8R, self._ext_number, self._io_numbers[1]
+            )
+        self._set_state_ids(
+            self.control_minus.io_state_id, self.control_plus.io_state_id
+        )
 
     @property
     def hvac_mode(self) -> HVACMode:
@@ -232,28 +235,37 @@ class RelayClimate(IpxEntity, ClimateEntity):
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set hvac mode."""
         if hvac_mode == HVACMode.HEAT:
-            await self.control_minus.off()
-            await self.control_plus.off()
+            await self._async_set_relays(False, False)
         elif hvac_mode == HVACMode.OFF:
-            await self.control_minus.off()
-            await self.control_plus.on()
-        await self.coordinator.async_request_refresh()
+            await self._async_set_relays(False, True)
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set target preset mode."""
         if preset_mode == PRESET_COMFORT:
-            await self.control_minus.off()
-            await self.control_plus.off()
+            await self._async_set_relays(False, False)
         elif preset_mode == PRESET_ECO:
-            await self.control_minus.on()
-            await self.control_plus.on()
+            await self._async_set_relays(True, True)
         elif preset_mode == PRESET_AWAY:
-            await self.control_minus.on()
-            await self.control_plus.off()
+            await self._async_set_relays(True, False)
         else:
-            await self.control_minus.off()
-            await self.control_plus.on()
-        await self.coordinator.async_request_refresh()
+            await self._async_set_relays(False, True)
+
+    async def _async_set_relays(self, state_minus: bool, state_plus: bool) -> None:
+        """Set the state of the 2 relays."""
+        for control, state in (
+            (self.control_minus, state_minus),
+            (self.control_plus, state_plus),
+        ):
+            if state:
+                await control.on()
+            else:
+                await control.off()
+        await self.async_after_command(
+            {
+                self.control_minus.io_state_id: {"on": state_minus},
+                self.control_plus.io_state_id: {"on": state_plus},
+            }
+        )
 
     async def async_turn_off(self) -> None:
         """Turn off."""
@@ -281,13 +293,22 @@ class ThermostatClimate(IpxEntity, ClimateEntity):
 
     def __init__(
         self,
-        device_config: dict,
-        ipx: IPX800,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
         coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the IPX800 thermostat."""
         super().__init__(device_config, ipx, coordinator)
-        self.control = Thermostat(ipx, self._ext_number)
+        self.control = ipx.get_control(Thermostat, self._ext_number)
+        self._set_state_ids(
+            self.control.ana_measure_id,
+            self.control.ana_consigne_id,
+            self.control.io_onoff_id,
+            self.control.io_state_id,
+            self.control.io_comfort_id,
+            self.control.io_eco_id,
+            self.control.io_nofrost_id,
+        )
 
     @property
     def current_temperature(self) -> float:
@@ -331,7 +352,9 @@ class ThermostatClimate(IpxEntity, ClimateEntity):
     async def async_set_temperature(self, **kwargs: Any) -> None:
         """Set new target temperature."""
         await self.control.set_target_temperature(kwargs[ATTR_TEMPERATURE])
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command(
+            {self.control.ana_consigne_id: {"value": kwargs[ATTR_TEMPERATURE]}}
+        )
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set hvac mode."""
@@ -340,7 +363,7 @@ class ThermostatClimate(IpxEntity, ClimateEntity):
             await self.control.set_mode_comfort()
         elif hvac_mode == HVACMode.OFF:
             await self.control.off()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command()
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set target preset mode."""
@@ -355,7 +378,7 @@ class ThermostatClimate(IpxEntity, ClimateEntity):
             await self.control.set_mode_nofrost()
         else:
             await self.control.off()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command()
 
     async def async_turn_off(self) -> None:
         """Turn off."""
@@ -364,3 +387,11 @@ class ThermostatClimate(IpxEntity, ClimateEntity):
     async def async_turn_on(self) -> None:
         """Turn on."""
         await self.async_set_hvac_mode(HVACMode.HEAT)
+
+
+ENTITY_CLASSES: EntityClasses = {
+    EXT_X4FP: (X4FPClimate,),
+    IPX: (RelayClimate,),
+    EXT_X8R: (RelayClimate,),
+    OBJECT_THERMOSTAT: (ThermostatClimate,),
+}
@@ -1,6 +1,5 @@
 """Config flow to configure the ipx800v5 integration."""
 
-from itertools import groupby
 import logging
 from typing import Any
 
@@ -23,24 +22,42 @@ from homeassistant.const import (
     CONF_DEVICES,
     CONF_HOST,
     CONF_NAME,
+    CONF_OPTIMISTIC,
     CONF_PORT,
     CONF_SCAN_INTERVAL,
 )
 from homeassistant.core import callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+import homeassistant.helpers.config_validation as cv
 
 from .const import (
+    CONF_ADAPTIVE_POLLING,
     CONF_COMPONENT,
     CONF_EXT_NAME,
     CONF_EXT_NUMBER,
     CONF_EXT_TYPE,
+    CONF_FAST_POLL_ENTITIES,
+    CONF_FAST_SCAN_INTERVAL,
     CONF_IO_NUMBER,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_PARTIAL_POLLING,
     CONF_PUSH_PASSWORD,
+    CONF_PUSH_PRIMARY,
+    CONF_RECONCILE_SCAN_INTERVAL,
+    CONF_SLOW_POLL_ENTITIES,
+    CONF_SLOW_SCAN_INTERVAL,
     DEFAULT_IPX_NAME,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_RECONCILE_SCAN_INTERVAL,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SLOW_SCAN_INTERVAL,
     DOMAIN,
 )
-from .helpers import get_device_in_devices_config
+from .controller import IpxController
+from .helpers import DevicesConfigIndex
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -140,8 +157,18 @@ class IpxOptionsFlowHandler(OptionsFlow):
             config = self.config_entry.data
             options = self.config_entry.options
 
+            registry = er.async_get(self.hass)
+            entities = {
+                entity.unique_id: entity.name
+                or entity.original_name
+                or entity.entity_id
+                for entity in er.async_entries_for_config_entry(
+                    registry, self.config_entry.entry_id
+                )
+            }
+
             schema = await _build_param_schema(
-                session, config, options, self.config_entry.source
+                session, config, options, self.config_entry.source, entities
             )
 
             return self.async_show_form(
@@ -180,6 +207,7 @@ async def _build_param_schema(
     base_config,
     options,
     entry_source,
+    entities=None,
 ):
     """Build schema for params and options flow according to the IPX800 config."""
     config = {**base_config, **options}
@@ -189,8 +217,65 @@ async def _build_param_schema(
             CONF_SCAN_INTERVAL,
             default=config.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
         ): int,
+        vol.Required(
+            CONF_FAST_SCAN_INTERVAL,
+            default=config.get(
+                CONF_FAST_SCAN_INTERVAL,
+                config.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+            ),
+        ): int,
+        vol.Required(
+            CONF_SLOW_SCAN_INTERVAL,
+            default=config.get(CONF_SLOW_SCAN_INTERVAL, DEFAULT_SLOW_SCAN_INTERVAL),
+        ): int,
+        vol.Required(
+            CONF_PARTIAL_POLLING,
+            default=config.get(CONF_PARTIAL_POLLING, False),
+        ): bool,
+        vol.Required(
+            CONF_ADAPTIVE_POLLING,
+            default=config.get(CONF_ADAPTIVE_POLLING, False),
+        ): bool,
+        vol.Required(
+            CONF_MIN_SCAN_INTERVAL,
+            default=config.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL),
+        ): int,
+        vol.Required(
+            CONF_MAX_SCAN_INTERVAL,
+            default=config.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL),
+        ): int,
+        vol.Required(
+            CONF_OPTIMISTIC,
+            default=config.get(CONF_OPTIMISTIC, False),
+        ): bool,
+        vol.Required(
+            CONF_PUSH_PRIMARY,
+            default=config.get(CONF_PUSH_PRIMARY, False),
+        ): bool,
+        vol.Required(
+            CONF_RECONCILE_SCAN_INTERVAL,
+            default=config.get(
+                CONF_RECONCILE_SCAN_INTERVAL, DEFAULT_RECONCILE_SCAN_INTERVAL
+            ),
+        ): int,
     }
 
+    # per entity polling tier, only once entities have been created
+    if entities:
+        for conf_poll_entities in (CONF_FAST_POLL_ENTITIES, CONF_SLOW_POLL_ENTITIES):
+            schema.update(
+                {
+                    vol.Optional(
+                        conf_poll_entities,
+                        default=[
+                            unique_id
+                            for unique_id in config.get(conf_poll_entities, [])
+                            if unique_id in entities
+                        ],
+                    ): cv.multi_select(entities),
+                }
+            )
+
     # if entry created with config_flow, add options
     if entry_source == "user":
         _LOGGER.debug("Add options for user entry")
@@ -209,7 +294,7 @@ async def _build_param_schema(
         )
 
         _LOGGER.debug("Connect to the IPX to get its configuration")
-        ipx = IPX800(
+        ipx = IpxController(
             host=base_config[CONF_HOST],
             port=base_config[CONF_PORT],
             api_key=base_config[CONF_API_KEY],
@@ -218,9 +303,9 @@ async def _build_param_schema(
         await ipx.init_config()
 
         _LOGGER.debug("Build schema according to the IPX configuration")
+        devices_index = DevicesConfigIndex(devices_config)
         for i in range(8):
-            device = get_device_in_devices_config(
-                devices_config,
+            device = devices_index.get_device(
                 {
                     CONF_NAME: f"{DEFAULT_IPX_NAME} Relais {i + 1}",
                     CONF_COMPONENT: "switch",
@@ -239,15 +324,13 @@ async def _build_param_schema(
             )
 
         _LOGGER.debug("Build schema according to the extensions found")
-        for ext_type, extensions in groupby(ipx.extensions_config, lambda x: x["type"]):
+        for ext_type, extensions in ipx.extensions_by_type.items():
             _LOGGER.debug("Found %s", ext_type)
-            ext_number = 0
-            for extension in extensions:
+            for ext_number, extension in extensions:
                 if ext_type == EXT_X8R:
                     _LOGGER.debug("Add X8R N°%s to the params", ext_number)
                     for i in range(8):
-                        device = get_device_in_devices_config(
-                            devices_config,
+                        device = devices_index.get_device(
                             {
                                 CONF_NAME: f"{DEFAULT_IPX_NAME} Relais {i + 1}",
                                 CONF_COMPONENT: "switch",
@@ -265,7 +348,6 @@ async def _build_param_schema(
                                 ): vol.All(str, vol.Lower, vol.In(["switch", "light"])),
                             }
                         )
-                ext_number += 1  # noqa: SIM113
 
     return schema
 
@@ -277,6 +359,21 @@ def config_organizer(base_config, user_input):
     # For user and yaml entry
     config[CONF_SCAN_INTERVAL] = user_input[CONF_SCAN_INTERVAL]
     user_input.pop(CONF_SCAN_INTERVAL)
+    config[CONF_PARTIAL_POLLING] = user_input.pop(CONF_PARTIAL_POLLING, False)
+    config[CONF_ADAPTIVE_POLLING] = user_input.pop(CONF_ADAPTIVE_POLLING, False)
+    config[CONF_OPTIMISTIC] = user_input.pop(CONF_OPTIMISTIC, False)
+    config[CONF_PUSH_PRIMARY] = user_input.pop(CONF_PUSH_PRIMARY, False)
+    for conf_scan_interval in (
+        CONF_FAST_SCAN_INTERVAL,
+        CONF_SLOW_SCAN_INTERVAL,
+        CONF_MIN_SCAN_INTERVAL,
+        CONF_MAX_SCAN_INTERVAL,
+        CONF_RECONCILE_SCAN_INTERVAL,
+    ):
+        if conf_scan_interval in user_input:
+            config[conf_scan_interval] = user_input.pop(conf_scan_interval)
+    for conf_poll_entities in (CONF_FAST_POLL_ENTITIES, CONF_SLOW_POLL_ENTITIES):
+        config[conf_poll_entities] = user_input.pop(conf_poll_entities, [])
 
     # Only for user entry
     if CONF_API_KEY in user_input:
@@ -1,24 +1,65 @@
 """Constants for the ipx800v5 integration."""
 
+from homeassistant.const import CONF_OPTIMISTIC, CONF_SCAN_INTERVAL
+
 DOMAIN = "ipx800v5"
 
 CONTROLLER = "controller"
 COORDINATOR = "coordinator"
+ENTRY_CONFIG = "entry_config"
+ENTITY_PLAN = "entity_plan"
+LOADED_PLATFORMS = "loaded_platforms"
+PLATFORM_ENTITIES = "platform_entities"
+# entry ids and names of the IPX800 with registered push views
+REGISTERED_VIEWS = "registered_views"
+SETUP_TIMINGS = "setup_timings"
+SUBSCRIPTIONS = "subscriptions"
 UNDO_UPDATE_LISTENER = "undo_update_listener"
+STORAGE_VERSION = 1
 PUSH_USERNAME = "ipx800"
+# pushed values standing for an IO on
+PUSH_ON_STATES = ("1", "on", "true")
 
 DEFAULT_IPX_NAME = "IPX800 V5"
 DEFAULT_SCAN_INTERVAL = 15
+DEFAULT_SLOW_SCAN_INTERVAL = 300
+DEFAULT_MIN_SCAN_INTERVAL = 5
+DEFAULT_MAX_SCAN_INTERVAL = 60
+DEFAULT_RECONCILE_SCAN_INTERVAL = 600
 DEFAULT_TRANSITION = 0.5
 REQUEST_REFRESH_DELAY = 0.5
+PARTIAL_POLLING_MAX_IDS = 20
+# ids read one by one are requested with a limit of parallel requests
+PARTIAL_POLLING_CONCURRENCY = 4
+# interval is divided on activity, multiplied when nothing changed and kept
+# above the poll latency times the latency factor
+ADAPTIVE_SPEEDUP_FACTOR = 2
+ADAPTIVE_BACKOFF_FACTOR = 1.5
+ADAPTIVE_LATENCY_FACTOR = 20
+# writes sent within the window are batched, with a limit of parallel requests
+COMMAND_BATCH_WINDOW = 0.02
+COMMAND_BATCH_CONCURRENCY = 4
+# seconds between the checks of the extensions and objects of the IPX800
+CONFIG_CHECK_INTERVAL = 900
 
 CONF_DEVICES = "devices"
 
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
 CONF_COMPONENT = "component"
 CONF_DEFAULT_BRIGHTNESS = "default_brightness"
 CONF_DEVICES_AUTO = "devices_auto"
 CONF_DIAG_SENSORS = "diag_sensors"
+CONF_FAST_POLL_ENTITIES = "fast_poll_entities"
+CONF_FAST_SCAN_INTERVAL = "fast_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_PARTIAL_POLLING = "partial_polling"
+CONF_POLL_TIER = "poll_tier"
 CONF_PUSH_PASSWORD = "push_password"
+CONF_PUSH_PRIMARY = "push_primary"
+CONF_RECONCILE_SCAN_INTERVAL = "reconcile_scan_interval"
+CONF_SLOW_POLL_ENTITIES = "slow_poll_entities"
+CONF_SLOW_SCAN_INTERVAL = "slow_scan_interval"
 CONF_TRANSITION = "transition"
 CONF_EXT_TYPE = "ext_type"
 CONF_EXT_NAME = "ext_name"
@@ -26,8 +67,31 @@ CONF_EXT_NUMBER = "ext_number"
 CONF_IO_NUMBER = "io_number"
 CONF_IO_NUMBERS = "io_numbers"
 
+# options applied to the running coordinator, the options flow value of these
+# options wins over the one of the entry data
+POLLING_OPTIONS = {
+    CONF_SCAN_INTERVAL,
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_SLOW_SCAN_INTERVAL,
+    CONF_PARTIAL_POLLING,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_OPTIMISTIC,
+    CONF_PUSH_PRIMARY,
+    CONF_RECONCILE_SCAN_INTERVAL,
+    CONF_FAST_POLL_ENTITIES,
+    CONF_SLOW_POLL_ENTITIES,
+}
+
+POLL_TIER_FAST = "fast"
+POLL_TIER_NORMAL = "normal"
+POLL_TIER_SLOW = "slow"
+POLL_TIERS = [POLL_TIER_FAST, POLL_TIER_NORMAL, POLL_TIER_SLOW]
+
 TYPE_IPX_OPENCOLL = "opencoll"
 TYPE_IPX_OPTO = "opto"
+TYPE_IPX_SCAN_INTERVAL = "scan_interval"
 TYPE_XPWM_RGB = "xpwm_rgb"
 TYPE_XPWM_RGBW = "xpwm_rgbw"
 
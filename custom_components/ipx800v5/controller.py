@@ -0,0 +1,381 @@
+"""IPX800 V5 API client batching the IO/ANA writes."""
+
+import asyncio
+from collections.abc import Awaitable
+import hashlib
+import json
+import logging
+from typing import Any, TypeVar
+
+from pypx800v5 import (
+    API_CONFIG_ID,
+    API_CONFIG_NAME,
+    API_CONFIG_PARAMS,
+    API_CONFIG_TYPE,
+    EXTENSIONS,
+    IPX800,
+    OBJECT_TEMPO,
+    OBJECT_TIMER,
+    OBJECTS,
+    TYPE_ANA,
+    TYPE_IO,
+    IPX800RequestError,
+)
+
+from homeassistant.helpers.device_registry import DeviceInfo
+
+from .const import COMMAND_BATCH_CONCURRENCY, COMMAND_BATCH_WINDOW
+
+_LOGGER = logging.getLogger(__name__)
+
+_C = TypeVar("_C")
+_R = TypeVar("_R")
+
+
+def get_config_hash(config: Any) -> str:
+    """Return a hash of a JSON configuration, independent of the keys order."""
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()
+
+
+def bucket_configs_by_type(configs: list) -> dict[str, list[tuple[int, dict]]]:
+    """Group extensions or objects by type with their number in the type."""
+    buckets: dict[str, list[tuple[int, dict]]] = {}
+    for config in configs:
+        bucket = buckets.setdefault(config[API_CONFIG_TYPE], [])
+        bucket.append((len(bucket), config))
+    return buckets
+
+
+def _fail_writes(pending_writes: dict[tuple[str, int], list["_Write"]]) -> None:
+    """Resolve the callers of writes that won't be sent with an error."""
+    for writes in pending_writes.values():
+        for write in writes:
+            for future in write.futures:
+                if not future.done():
+                    future.set_exception(
+                        IPX800RequestError("Write cancelled before being sent")
+                    )
+
+
+class _Write:
+    """IO/ANA write waiting for the next batch, shared by merged callers."""
+
+    __slots__ = ("data", "futures", "mergeable")
+
+    def __init__(self, data: dict, mergeable: bool) -> None:
+        """Initialize the write."""
+        self.data = data
+        self.mergeable = mergeable
+        self.futures: list[asyncio.Future] = []
+
+
+class IpxController(IPX800):
+    """IPX800 API merging the IO/ANA writes sent within a short window.
+
+    A scene or a group sends one write per entity, they are queued for a few
+    milliseconds then sent concurrently, one request per id. Writes of a value to an id already
+    queued replace the pending one, writes of different ids are sent
+    concurrently and writes to a same id are sent in order, also when they
+    are queued in different batches. Each caller gets the result or the error
+    of its own write.
+    """
+
+    def __init__(
+        self,
+        *args,
+        batch_window: float = COMMAND_BATCH_WINDOW,
+        batch_concurrency: int = COMMAND_BATCH_CONCURRENCY,
+        **kwargs,
+    ) -> None:
+        """Init the IPX800 API."""
+        super().__init__(*args, **kwargs)
+        self._batch_window = batch_window
+        self._batch_concurrency = batch_concurrency
+        self._pending_writes: dict[tuple[str, int], list[_Write]] = {}
+        self._flush_task: asyncio.Task | None = None
+        self._flush_tasks: set[asyncio.Task] = set()
+        self._write_locks: dict[tuple[str, int], asyncio.Lock] = {}
+        # shared by all the configuration requests of the controller
+        self._config_semaphore = asyncio.Semaphore(batch_concurrency)
+        self._buckets: dict[str, tuple[list, dict]] = {}
+        self._controls: dict[tuple, Any] = {}
+        # device info of the IPX800 and of each extension or object
+        self.device_infos: dict[str, DeviceInfo] = {}
+
+    def get_control(self, control_class: type[_C], *args) -> _C:
+        """Return the pypx control object of a channel or an object.
+
+        The entities of a same channel or object share a single control
+        object, built again once the configuration has been updated.
+        """
+        key = (control_class, *args)
+        if (control := self._controls.get(key)) is None:
+            control = self._controls[key] = control_class(self, *args)
+        return control
+
+    def _clear_shared(self) -> None:
+        """Clear the control objects and device info built for the config."""
+        self._controls.clear()
+        self.device_infos.clear()
+
+    def _get_buckets(self, name: str, configs: list) -> dict:
+        """Return the configs by type, grouped again when they have changed."""
+        source, buckets = self._buckets.get(name, (None, {}))
+        if source is not configs:
+            buckets = bucket_configs_by_type(configs)
+            self._buckets[name] = (configs, buckets)
+        return buckets
+
+    @property
+    def extensions_by_type(self) -> dict[str, list[tuple[int, dict]]]:
+        """Return the extensions by type with their number in the type."""
+        return self._get_buckets("extensions", self._extensions_config)
+
+    @property
+    def objects_by_type(self) -> dict[str, list[tuple[int, dict]]]:
+        """Return the objects by type with their number in the type."""
+        return self._get_buckets("objects", self._objects_config)
+
+    async def init_config(self) -> None:
+        """Init the full config of the IPX, with the requests sent concurrently.
+
+        All the configuration requests share a same limit of parallel
+        requests, however many updates are run together.
+        """
+        _LOGGER.info("Init the IPX800V5 configuration.")
+        await asyncio.gather(
+            self._async_limit_config_request(self.update_ipx_info()),
+            self._async_limit_config_request(self.update_ipx_config()),
+            self.update_extensions_config(),
+            self.update_objects_config(),
+        )
+        self._clear_shared()
+
+    async def _async_limit_config_request(self, request: Awaitable[_R]) -> _R:
+        """Wait for a free slot of the configuration requests to send one."""
+        async with self._config_semaphore:
+            return await request
+
+    async def update_extensions_and_objects_config(self) -> None:
+        """Update the extensions and objects, without the IPX800 config."""
+        await asyncio.gather(
+            self.update_extensions_config(),
+            self.update_objects_config(),
+        )
+
+    @property
+    def config_fingerprint(self) -> str:
+        """Return a hash of the extensions and objects configuration."""
+        return get_config_hash([self._extensions_config, self._objects_config])
+
+    async def update_extensions_config(self) -> None:
+        """Update the list of connected extensions.
+
+        The extensions of a type that can't be requested are kept as known
+        so far, a request error doesn't remove them.
+        """
+        extensions_config = []
+        responses = await self._async_request_configs(
+            [f"ebx/{type_extension}" for type_extension in EXTENSIONS]
+        )
+        for type_extension, response in zip(EXTENSIONS, responses, strict=True):
+            if response is None:
+                _LOGGER.error("Error to get %s extensions", type_extension)
+                extensions_config.extend(
+                    config
+                    for _, config in self.extensions_by_type.get(type_extension, [])
+                )
+                continue
+            extensions_config.extend(
+                {
+                    API_CONFIG_TYPE: type_extension,
+                    API_CONFIG_ID: extension["_id"],
+                    API_CONFIG_NAME: extension["name"],
+                    API_CONFIG_PARAMS: extension,
+                }
+                for extension in response
+            )
+        fingerprint = self.config_fingerprint
+        self._extensions_config = extensions_config
+        # the controls read their ids from the config, keep them if unchanged
+        if self.config_fingerprint != fingerprint:
+            self._clear_shared()
+
+    async def update_objects_config(self) -> None:
+        """Update the list of configured objects.
+
+        As for the extensions, the objects of a type that can't be requested
+        are kept as known so far.
+        """
+        objects_config = []
+        # tempo objects are timers, request the timers only once
+        search_objects = {
+            type_object: OBJECT_TIMER if type_object == OBJECT_TEMPO else type_object
+            for type_object in OBJECTS
+        }
+        paths = list(dict.fromkeys(search_objects.values()))
+        responses = dict(
+            zip(
+                paths,
+                await self._async_request_configs(
+                    [f"object/{search_object}" for search_object in paths]
+                ),
+                strict=True,
+            )
+        )
+        for type_object, search_object in search_objects.items():
+            if (response := responses[search_object]) is None:
+                _LOGGER.error("Error to get %s object", type_object)
+                objects_config.extend(
+                    config for _, config in self.objects_by_type.get(type_object, [])
+                )
+                continue
+            objects_config.extend(
+                {
+                    API_CONFIG_TYPE: type_object,
+                    API_CONFIG_ID: obj["_id"],
+                    API_CONFIG_NAME: obj["name"],
+                    API_CONFIG_PARAMS: obj,
+                }
+                for obj in response
+                # ignore objects with same parent object
+                if search_object != OBJECT_TIMER or obj["func"] == type_object
+            )
+        fingerprint = self.config_fingerprint
+        self._objects_config = objects_config
+        if self.config_fingerprint != fingerprint:
+            self._clear_shared()
+
+    async def _async_request_configs(self, paths: list[str]) -> list[list | None]:
+        """Request configuration lists concurrently, None for request errors."""
+
+        async def _async_request_config(path: str) -> list | None:
+            try:
+                return await self._async_limit_config_request(
+                    self.request_api(path, params={"option": "filter_id"})
+                )
+            except IPX800RequestError:
+                return None
+
+        return await asyncio.gather(*(_async_request_config(path) for path in paths))
+
+    def export_config(self) -> dict:
+        """Return the configuration read by init_config to cache it."""
+        return {
+            "mac_address": self._mac_address,
+            "firmware_version": self._firmware_version,
+            "host_name": self._host_name,
+            "ipx_config": self._ipx_config,
+            "extensions_config": self._extensions_config,
+            "objects_config": self._objects_config,
+        }
+
+    def restore_config(self, config: dict) -> None:
+        """Restore a cached configuration instead of calling init_config."""
+        self._mac_address = config["mac_address"]
+        self._firmware_version = config["firmware_version"]
+        self._host_name = config["host_name"]
+        self._ipx_config = config["ipx_config"]
+        self._extensions_config = config["extensions_config"]
+        self._objects_config = config["objects_config"]
+        self._clear_shared()
+
+    async def update_io(self, io_id: int, value: bool, command: str = "on") -> None:
+        """Update an IO on the IPX."""
+        # toggles are not idempotent, they are never merged
+        await self._async_queue_write(
+            TYPE_IO, io_id, {command: value}, mergeable=command != "toggle"
+        )
+
+    async def update_ana(self, ana_id: int, value) -> None:
+        """Update an Analog on the IPX."""
+        if type(value) not in [int, float]:
+            raise IPX800RequestError("Ana value need to be a int or a float type.")
+        await self._async_queue_write(TYPE_ANA, ana_id, {"value": value})
+
+    async def _async_queue_write(
+        self, value_type: str, state_id: int, data: dict, mergeable: bool = True
+    ) -> None:
+        """Queue a write for the next batch and wait for its result."""
+        writes = self._pending_writes.setdefault((value_type, state_id), [])
+        if mergeable and writes and writes[-1].mergeable:
+            write = writes[-1]
+            write.data = data
+        else:
+            write = _Write(data, mergeable)
+            writes.append(write)
+
+        future = asyncio.get_running_loop().create_future()
+        write.futures.append(future)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._async_flush())
+            self._flush_tasks.add(self._flush_task)
+            self._flush_task.add_done_callback(self._flush_tasks.discard)
+        await future
+
+    async def async_cancel_writes(self) -> None:
+        """Cancel the queued and running writes, their callers get an error."""
+        flush_tasks = list(self._flush_tasks)
+        for flush_task in flush_tasks:
+            flush_task.cancel()
+        await asyncio.gather(*flush_tasks, return_exceptions=True)
+        self._flush_task = None
+        pending_writes = self._pending_writes
+        self._pending_writes = {}
+        _fail_writes(pending_writes)
+
+    async def _async_flush(self) -> None:
+        """Send the writes queued during the batch window.
+
+        The IPX800 API only writes a single IO/ANA id per request, so a batch
+        isn't sent as one request: the repeated writes of an id are merged
+        and each id left gets its own PUT, sent concurrently.
+        """
+        await asyncio.sleep(self._batch_window)
+        pending_writes = self._pending_writes
+        self._pending_writes = {}
+        self._flush_task = None
+
+        _LOGGER.debug(
+            "Send %s batched writes to %s ids",
+            sum(len(writes) for writes in pending_writes.values()),
+            len(pending_writes),
+        )
+        semaphore = asyncio.Semaphore(self._batch_concurrency)
+        try:
+            await asyncio.gather(
+                *(
+                    self._async_send_writes(semaphore, value_type, state_id, writes)
+                    for (value_type, state_id), writes in pending_writes.items()
+                )
+            )
+        finally:
+            # writes not sent when the flush is cancelled
+            _fail_writes(pending_writes)
+
+    async def _async_send_writes(
+        self,
+        semaphore: asyncio.Semaphore,
+        value_type: str,
+        state_id: int,
+        writes: list[_Write],
+    ) -> None:
+        """Send in order the writes of an id and resolve their callers.
+
+        The writes of an id wait for the ones of the previous batches.
+        """
+        lock = self._write_locks.setdefault((value_type, state_id), asyncio.Lock())
+        async with lock, semaphore:
+            for write in writes:
+                try:
+                    await self.request_api(
+                        f"core/{value_type}/{state_id}", method="PUT", data=write.data
+                    )
+                except Exception as err:  # noqa: BLE001
+                    for future in write.futures:
+                        if not future.done():
+                            future.set_exception(err)
+                else:
+                    for future in write.futures:
+                        if not future.done():
+                            future.set_result(None)
@@ -0,0 +1,555 @@
+"""Data update coordinator for the IPX800 V5."""
+
+import asyncio
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+import logging
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from pypx800v5 import (
+    IPX800,
+    TYPE_ANA,
+    TYPE_IO,
+    IPX800CannotConnectError,
+    IPX800InvalidAuthError,
+)
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .const import (
+    ADAPTIVE_BACKOFF_FACTOR,
+    ADAPTIVE_LATENCY_FACTOR,
+    ADAPTIVE_SPEEDUP_FACTOR,
+    PARTIAL_POLLING_CONCURRENCY,
+    PARTIAL_POLLING_MAX_IDS,
+    POLL_TIER_NORMAL,
+    REQUEST_REFRESH_DELAY,
+)
+
+if TYPE_CHECKING:
+    from .entity import IpxEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def get_changed_state_ids(previous: dict, current: dict) -> set:
+    """Return the IO/ANA ids whose value differs between two snapshots."""
+    changed = {
+        state_id
+        for state_id, value in current.items()
+        if previous.get(state_id) != value
+    }
+    changed.update(state_id for state_id in previous if state_id not in current)
+    return changed
+
+
+class StateIdIndex:
+    """Reverse index from IPX IO/ANA ids to the entities reading them."""
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._entities: defaultdict[int, set[IpxEntity]] = defaultdict(set)
+        # entities that don't declare their ids are notified on every update
+        self._unfiltered: set[IpxEntity] = set()
+        self._tier_ids: defaultdict[str, Counter[int]] = defaultdict(Counter)
+        self._by_entity_id: dict[str, IpxEntity] = {}
+
+    @property
+    def state_ids(self) -> set[int]:
+        """Return the ids read by at least one entity."""
+        return set(self._entities)
+
+    def get_state_ids(self, poll_tiers: Iterable[str]) -> set[int]:
+        """Return the ids read by the entities of the given polling tiers."""
+        state_ids: set[int] = set()
+        for poll_tier in poll_tiers:
+            state_ids.update(self._tier_ids[poll_tier])
+        return state_ids
+
+    def get_entity(self, entity_id: str) -> "IpxEntity | None":
+        """Return the subscribed entity with the given entity id."""
+        return self._by_entity_id.get(entity_id)
+
+    @callback
+    def async_subscribe(self, entity: "IpxEntity") -> None:
+        """Add an entity for the ids it declared."""
+        self._by_entity_id[entity.entity_id] = entity
+        if entity.state_ids is None:
+            self._unfiltered.add(entity)
+            return
+        for state_id in entity.state_ids:
+            self._entities[state_id].add(entity)
+        self._tier_ids[entity.poll_tier].update(entity.state_ids)
+
+    @callback
+    def async_unsubscribe(self, entity: "IpxEntity") -> None:
+        """Remove an entity from the index."""
+        if self._by_entity_id.get(entity.entity_id) is entity:
+            del self._by_entity_id[entity.entity_id]
+        if entity.state_ids is None:
+            self._unfiltered.discard(entity)
+            return
+        for state_id in entity.state_ids:
+            subscribers = self._entities.get(state_id)
+            if subscribers is None:
+                continue
+            subscribers.discard(entity)
+            if not subscribers:
+                del self._entities[state_id]
+        tier_ids = self._tier_ids[entity.poll_tier]
+        tier_ids.subtract(entity.state_ids)
+        for state_id in entity.state_ids:
+            if tier_ids[state_id] <= 0:
+                del tier_ids[state_id]
+
+    def get_entities(self, state_ids: Iterable[int]) -> set["IpxEntity"]:
+        """Return the entities to notify when the given ids changed."""
+        entities = set(self._unfiltered)
+        for state_id in state_ids:
+            entities.update(self._entities.get(state_id, ()))
+        return entities
+
+    def get_all_entities(self) -> set["IpxEntity"]:
+        """Return every subscribed entity."""
+        entities = set(self._unfiltered)
+        for subscribers in self._entities.values():
+            entities.update(subscribers)
+        return entities
+
+
+class IpxDataUpdateCoordinator(DataUpdateCoordinator[dict]):
+    """Poll the IPX800 and only notify entities whose values have changed.
+
+    Entities are spread in polling tiers with their own interval, the
+    coordinator runs at the shortest one and only polls the ids of the tiers
+    that are due on scheduled refreshes.
+
+    With adaptive polling, the interval of the normal tier is shortened after
+    state changes or commands and backs off while nothing changes, within the
+    configured bounds and never below a multiple of the IPX800 latency.
+
+    In optimistic mode, the expected values of a command are applied to the
+    data at once, and only the ids written are read back later to roll back
+    the values the IPX800 didn't apply.
+
+    Values pushed by the IPX800 are applied to the data as well, a poll
+    started before a push keeps the pushed values of its ids.
+
+    In push primary mode, the coordinator only polls at a long reconciliation
+    interval once pushes are received. It falls back to the polling intervals
+    when a push fails or when a reconciliation finds an IO change that wasn't
+    pushed, until the next push.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        ipx: IPX800,
+        name: str,
+        poll_intervals: dict[str, float],
+        partial_polling: bool = False,
+        poll_tier_overrides: dict[str, str] | None = None,
+        adaptive_interval: tuple[int, int] | None = None,
+        optimistic: bool = False,
+        push_reconcile_interval: float | None = None,
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=name,
+            update_interval=timedelta(seconds=min(poll_intervals.values())),
+            request_refresh_debouncer=Debouncer(
+                hass,
+                _LOGGER,
+                cooldown=REQUEST_REFRESH_DELAY,
+                immediate=False,
+            ),
+        )
+        self.ipx = ipx
+        self.subscriptions = StateIdIndex()
+        self.partial_polling = partial_polling
+        self.poll_intervals = poll_intervals
+        self.poll_tier_overrides = poll_tier_overrides or {}
+        self.adaptive_interval = adaptive_interval
+        self.latency: float | None = None
+        self.optimistic = optimistic
+        self.push_reconcile_interval = push_reconcile_interval
+        self.push_active = False
+        self._unverified_ids: set[int] = set()
+        self._pushed_at: dict[int, float] = {}
+        self._verify_started_at: float | None = None
+        self._fetch_semaphore = asyncio.Semaphore(PARTIAL_POLLING_CONCURRENCY)
+        self._verify_debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=REQUEST_REFRESH_DELAY,
+            immediate=False,
+            function=self._async_verify_optimistic,
+        )
+        if adaptive_interval is not None:
+            self._set_normal_interval(poll_intervals[POLL_TIER_NORMAL])
+        self._tiers_polled_at: dict[str, float] = {}
+        self._scheduled_refresh = False
+        # None means every listener has to be notified
+        self.changed_ids: set | None = None
+        self._notified_success = True
+
+    @callback
+    def async_update_options(
+        self,
+        poll_intervals: dict[str, float],
+        partial_polling: bool = False,
+        poll_tier_overrides: dict[str, str] | None = None,
+        adaptive_interval: tuple[int, int] | None = None,
+        optimistic: bool = False,
+        push_reconcile_interval: float | None = None,
+    ) -> None:
+        """Apply new polling options while keeping the data and the entities.
+
+        The entities are indexed again as their polling tier may have changed.
+        """
+        entities = self.subscriptions.get_all_entities()
+        for entity in entities:
+            self.subscriptions.async_unsubscribe(entity)
+        self.partial_polling = partial_polling
+        self.poll_intervals = poll_intervals
+        self.poll_tier_overrides = poll_tier_overrides or {}
+        self.adaptive_interval = adaptive_interval
+        self.optimistic = optimistic
+        self.push_reconcile_interval = push_reconcile_interval
+        if push_reconcile_interval is None:
+            self.push_active = False
+        for entity in entities:
+            self.subscriptions.async_subscribe(entity)
+
+        self._apply_update_interval()
+        if adaptive_interval is not None:
+            self._set_normal_interval(poll_intervals[POLL_TIER_NORMAL])
+        if self._listeners:
+            self._schedule_refresh()
+
+    async def _handle_refresh_interval(self, _now: datetime | None = None) -> None:
+        """Handle a refresh interval occurrence."""
+        self._scheduled_refresh = True
+        try:
+            await super()._handle_refresh_interval(_now)
+        finally:
+            self._scheduled_refresh = False
+
+    def _get_due_poll_tiers(self) -> list[str]:
+        """Return the polling tiers whose interval has elapsed."""
+        now = monotonic()
+        # tolerate the jitter of the refresh scheduling
+        margin = self.update_interval.total_seconds() / 2
+        return [
+            poll_tier
+            for poll_tier, interval in self.poll_intervals.items()
+            if poll_tier not in self._tiers_polled_at
+            or now - self._tiers_polled_at[poll_tier] + margin >= interval
+        ]
+
+    async def _async_update_data(self) -> dict:
+        """Fetch data from API."""
+        poll_tiers = list(self.poll_intervals)
+        if self._scheduled_refresh and self.data is not None:
+            poll_tiers = self._get_due_poll_tiers()
+
+        poll_started_at = monotonic()
+        try:
+            if len(poll_tiers) < len(self.poll_intervals):
+                _LOGGER.debug("Poll %s tiers", ", ".join(poll_tiers))
+                data = await self._async_fetch_state_ids(
+                    self.subscriptions.get_state_ids(poll_tiers)
+                )
+            elif self.partial_polling and self.data is not None:
+                data = await self._async_fetch_state_ids(self.subscriptions.state_ids)
+            else:
+                started_at = monotonic()
+                data = await self.ipx.global_get()
+                self._update_latency(monotonic() - started_at)
+        except IPX800InvalidAuthError as err:
+            raise UpdateFailed("Authentication error on IPX800") from err
+        except IPX800CannotConnectError as err:
+            raise UpdateFailed(f"Failed to communicating with API: {err}") from err
+
+        polled_at = monotonic()
+        for poll_tier in poll_tiers:
+            self._tiers_polled_at[poll_tier] = polled_at
+
+        # values pushed during the poll are more recent than the polled ones
+        for state_id, pushed_at in self._pushed_at.items():
+            if pushed_at >= poll_started_at and state_id in data:
+                data[state_id] = self.data[state_id]
+        # a read back of optimistic values still running needs its pushed ids
+        self._pushed_at = {
+            state_id: pushed_at
+            for state_id, pushed_at in self._pushed_at.items()
+            if self._verify_started_at is not None
+            and pushed_at >= self._verify_started_at
+        }
+
+        if self.data is not None:
+            self.changed_ids = get_changed_state_ids(self.data, data)
+            _LOGGER.debug(
+                "%s IO/ANA values changed since last poll", len(self.changed_ids)
+            )
+            if self.adaptive_interval is not None and POLL_TIER_NORMAL in poll_tiers:
+                self._adapt_interval(bool(self.changed_ids))
+            if self.push_active and self._scheduled_refresh:
+                self._check_missed_push(data)
+        return data
+
+    def _check_missed_push(self, data: dict) -> None:
+        """Fall back to polling when a reconciliation finds unpushed IO changes.
+
+        Analog values aren't expected to be pushed, only the IO read by an
+        entity are checked.
+        """
+        missed_ids = [
+            state_id
+            for state_id in self.changed_ids & self.subscriptions.state_ids
+            if "on" in data.get(state_id, {})
+        ]
+        if missed_ids:
+            _LOGGER.warning(
+                "%s IO changes were not pushed by the IPX800, poll again",
+                len(missed_ids),
+            )
+            self._set_push_active(False)
+
+    def _update_latency(self, latency: float) -> None:
+        """Smooth the measured duration of a full poll."""
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency = 0.8 * self.latency + 0.2 * latency
+
+    def _adapt_interval(self, activity: bool) -> None:
+        """Shorten the normal interval on activity and back off otherwise."""
+        interval = self.poll_intervals[POLL_TIER_NORMAL]
+        if activity:
+            interval /= ADAPTIVE_SPEEDUP_FACTOR
+        else:
+            interval *= ADAPTIVE_BACKOFF_FACTOR
+        self._set_normal_interval(interval)
+
+    def _set_normal_interval(self, interval: float) -> None:
+        """Set the normal interval within the bounds and the latency ceiling."""
+        min_interval, max_interval = self.adaptive_interval
+        interval = min(max(interval, min_interval), max_interval)
+        if self.latency is not None:
+            # don't spend more than a fraction of the time polling
+            interval = max(interval, self.latency * ADAPTIVE_LATENCY_FACTOR)
+        interval = round(interval, 1)
+        if interval == self.poll_intervals[POLL_TIER_NORMAL]:
+            return
+        _LOGGER.debug("Set scan interval to %ss", interval)
+        self.poll_intervals[POLL_TIER_NORMAL] = interval
+        self._apply_update_interval()
+
+    def _apply_update_interval(self) -> None:
+        """Set the coordinator interval from the tiers and the push mode."""
+        interval = min(self.poll_intervals.values())
+        if self.push_active:
+            interval = max(interval, self.push_reconcile_interval)
+        self.update_interval = timedelta(seconds=interval)
+
+    def _set_push_active(self, push_active: bool) -> None:
+        """Switch between the reconciliation and the polling intervals."""
+        if push_active == self.push_active:
+            return
+        self.push_active = push_active
+        self._apply_update_interval()
+        _LOGGER.debug("Set scan interval to %s", self.update_interval)
+
+    @callback
+    def async_push_received(self) -> None:
+        """Only poll to reconcile the data while the IPX800 pushes."""
+        if self.push_reconcile_interval is None or self.push_active:
+            return
+        self._set_push_active(True)
+        if self._listeners:
+            self._schedule_refresh()
+
+    @callback
+    def async_push_failed(self) -> None:
+        """Fall back to polling after a failed push."""
+        if not self.push_active:
+            return
+        self._set_push_active(False)
+        if self._listeners:
+            self._schedule_refresh()
+
+    @callback
+    def async_note_activity(self) -> None:
+        """Poll at the shortest interval after a command or a push."""
+        if self.adaptive_interval is not None:
+            self._set_normal_interval(self.adaptive_interval[0])
+
+    async def async_request_refresh(self) -> None:
+        """Request a refresh, which follows a command or a push."""
+        self.async_note_activity()
+        await super().async_request_refresh()
+
+    @callback
+    def _async_merge_values(self, values: dict[int, dict]) -> None:
+        """Merge IO/ANA values in the data and update the entities reading them."""
+        data = dict(self.data)
+        for state_id, value in values.items():
+            if state_id in data:
+                data[state_id] = data[state_id] | value
+        changed_ids = get_changed_state_ids(self.data, data)
+        self.data = data
+        self.async_update_entities(changed_ids)
+
+    @callback
+    def async_set_optimistic(self, values: dict[int, dict]) -> None:
+        """Apply the expected values of a command and update its entities."""
+        self._unverified_ids.update(values)
+        self.async_note_activity()
+        self._async_merge_values(values)
+
+    @callback
+    def async_set_pushed(self, values: dict[int, dict]) -> None:
+        """Apply the IO/ANA values pushed by the IPX800 and update its entities.
+
+        A value pushed as an IO for an ANA id, or the opposite, is skipped:
+        merged, it would change the type the id is polled as.
+        """
+        mismatched_ids = [
+            state_id
+            for state_id, value in values.items()
+            if state_id in self.data
+            and ("on" in value) != ("on" in self.data[state_id])
+        ]
+        if mismatched_ids:
+            _LOGGER.warning(
+                "Skip the values pushed with a wrong IO/ANA type for ids %s",
+                mismatched_ids,
+            )
+            values = {
+                state_id: value
+                for state_id, value in values.items()
+                if state_id not in mismatched_ids
+            }
+        pushed_at = monotonic()
+        for state_id in values:
+            self._pushed_at[state_id] = pushed_at
+        self._async_merge_values(values)
+
+    async def async_request_verification(self) -> None:
+        """Request a debounced read back of the optimistic values."""
+        await self._verify_debouncer.async_call()
+
+    async def _async_verify_optimistic(self) -> None:
+        """Read back the ids set optimistically and roll back on mismatch.
+
+        The values read are merged in the current data, except the ones of
+        the ids pushed meanwhile, which are more recent.
+        """
+        state_ids = self._unverified_ids
+        self._unverified_ids = set()
+        self._verify_started_at = started_at = monotonic()
+        try:
+            values = await self._async_fetch_values(state_ids)
+        except (IPX800InvalidAuthError, IPX800CannotConnectError) as err:
+            _LOGGER.debug("Cannot verify optimistic values, refresh all: %s", err)
+            await self.async_request_refresh()
+            return
+        finally:
+            self._verify_started_at = None
+
+        data = self.data | {
+            state_id: values[state_id]
+            for state_id in state_ids
+            if state_id in values and self._pushed_at.get(state_id, 0) < started_at
+        }
+        changed_ids = get_changed_state_ids(self.data, data)
+        if changed_ids:
+            _LOGGER.debug(
+                "Roll back %s IO/ANA values not applied by the IPX800",
+                len(changed_ids),
+            )
+        self.data = data
+        self.async_update_entities(changed_ids)
+
+    async def async_shutdown(self) -> None:
+        """Cancel any scheduled call, and ignore new runs."""
+        await super().async_shutdown()
+        self._verify_debouncer.async_shutdown()
+
+    async def _async_fetch_state_ids(self, state_ids: set[int]) -> dict:
+        """Fetch only the given IO/ANA ids and merge them in the current data."""
+        values = await self._async_fetch_values(state_ids)
+        return self.data | values
+
+    async def _async_fetch_values(self, state_ids: set[int]) -> dict:
+        """Fetch the values of the given IO/ANA ids.
+
+        The IPX800 API returns either a whole IO/ANA table or a single id, so
+        ids are requested one by one when there are only a few of them for a
+        type, and the table of that type is requested otherwise. Only a few
+        ids are requested at a time, to keep the load of the IPX800 low.
+        """
+        ids_by_type: dict[str, list[int]] = {TYPE_IO: [], TYPE_ANA: []}
+        for state_id in state_ids:
+            value = self.data.get(state_id)
+            if value is None:
+                # type of the id is unknown, fall back to a full refresh
+                return await self.ipx.global_get()
+            ids_by_type[TYPE_IO if "on" in value else TYPE_ANA].append(state_id)
+
+        data = {}
+        for value_type, ids in ids_by_type.items():
+            if len(ids) > PARTIAL_POLLING_MAX_IDS:
+                data.update(
+                    {
+                        x["_id"]: x
+                        for x in await self.ipx.request_api(f"core/{value_type}")
+                    }
+                )
+            elif ids:
+                values = await asyncio.gather(
+                    *(
+                        self._async_request_state(f"core/{value_type}/{state_id}")
+                        for state_id in ids
+                    )
+                )
+                data.update(zip(ids, values, strict=True))
+        _LOGGER.debug(
+            "Partial polling of %s IO and %s ANA",
+            len(ids_by_type[TYPE_IO]),
+            len(ids_by_type[TYPE_ANA]),
+        )
+        return data
+
+    async def _async_request_state(self, path: str) -> dict:
+        """Request a single IO/ANA id, within the limit of parallel requests."""
+        async with self._fetch_semaphore:
+            return await self.ipx.request_api(path)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update entities subscribed to a changed IO/ANA id.
+
+        Availability changes and full updates are sent to every listener.
+        """
+        changed_ids = self.changed_ids
+        self.changed_ids = None
+        if changed_ids is None or self.last_update_success != self._notified_success:
+            self._notified_success = self.last_update_success
+            super().async_update_listeners()
+            return
+
+        self.async_update_entities(changed_ids)
+
+    @callback
+    def async_update_entities(self, state_ids: Iterable[int]) -> None:
+        """Write the state of the entities reading one of the ids."""
+        for entity in self.subscriptions.get_entities(state_ids):
+            entity.async_handle_state_ids_update()
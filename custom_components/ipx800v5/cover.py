@@ -3,7 +3,7 @@
 import logging
 from typing import Any
 
-from pypx800v5 import EXT_X4VR, IPX800, X4VR
+from pypx800v5 import EXT_X4VR, X4VR
 
 from homeassistant.components.cover import (
     ATTR_POSITION,
@@ -16,8 +16,9 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import CONF_DEVICES, CONF_EXT_TYPE, CONTROLLER, COORDINATOR, DOMAIN
+from .controller import IpxController
 from .entity import IpxEntity
+from .helpers import EntityClasses, IpxDeviceRecord, async_setup_platform_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,17 +29,9 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the IPX800 switches."""
-    controller = hass.data[DOMAIN][entry.entry_id][CONTROLLER]
-    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
-    devices = hass.data[DOMAIN][entry.entry_id][CONF_DEVICES]["cover"]
-
-    entities: list[CoverEntity] = []
-
-    for device in devices:
-        if device[CONF_EXT_TYPE] == EXT_X4VR:
-            entities.append(X4VRCover(device, controller, coordinator))  # noqa: PERF401
-
-    async_add_entities(entities, True)
+    async_setup_platform_entities(
+        hass, entry, "cover", ENTITY_CLASSES, async_add_entities
+    )
 
 
 class X4VRCover(IpxEntity, CoverEntity):
@@ -46,13 +39,14 @@ class X4VRCover(IpxEntity, CoverEntity):
 
     def __init__(
         self,
-        device_config: dict,
-        ipx: IPX800,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
         coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the X4VR Cover."""
         super().__init__(device_config, ipx, coordinator)
-        self.control = X4VR(ipx, self._ext_number, self._io_number)
+        self.control = ipx.get_control(X4VR, self._ext_number, self._io_number)
+        self._set_state_ids(self.control.ana_position_id)
         self._attr_device_class = CoverDeviceClass.SHUTTER
         self._attr_supported_features = (
             CoverEntityFeature.OPEN
@@ -78,29 +72,34 @@ class X4VRCover(IpxEntity, CoverEntity):
     async def async_open_cover(self, **kwargs: Any) -> None:
         """Open cover."""
         await self.control.open()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command()
 
     async def async_close_cover(self, **kwargs: Any) -> None:
         """Close cover."""
         await self.control.close()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command()
 
     async def async_stop_cover(self, **kwargs: Any) -> None:
         """Stop the cover."""
         await self.control.stop()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command()
 
     async def async_set_cover_position(self, **kwargs: Any) -> None:
         """Set the cover to a specific position."""
         await self.control.set_position(kwargs[ATTR_POSITION])
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command()
 
     async def async_open_cover_tilt(self, **kwargs: Any) -> None:
         """Open the cover tilt."""
         await self.control.open_bso()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command()
 
     async def async_close_cover_tilt(self, **kwargs: Any) -> None:
         """Close the cover tilt."""
         await self.control.close_bso()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command()
+
+
+ENTITY_CLASSES: EntityClasses = {
+    EXT_X4VR: (X4VRCover,),
+}
@@ -0,0 +1,47 @@
+"""Diagnostics support for the IPX800 V5."""
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_API_KEY
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_PUSH_PASSWORD,
+    CONTROLLER,
+    COORDINATOR,
+    DOMAIN,
+    ENTITY_PLAN,
+    LOADED_PLATFORMS,
+    SETUP_TIMINGS,
+)
+from .helpers import get_entry_config
+
+TO_REDACT = {CONF_API_KEY, CONF_PUSH_PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    ipx = data[CONTROLLER]
+    coordinator = data[COORDINATOR]
+    return {
+        "config": async_redact_data(get_entry_config(entry), TO_REDACT),
+        "ipx": {
+            "firmware_version": ipx.firmware_version,
+            "extensions": len(ipx.extensions_config),
+            "objects": len(ipx.objects_config),
+        },
+        "setup_timings": data[SETUP_TIMINGS],
+        "entity_plan": data[ENTITY_PLAN],
+        "loaded_platforms": sorted(data[LOADED_PLATFORMS]),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "poll_intervals": coordinator.poll_intervals,
+            "latency": coordinator.latency,
+            "push_active": coordinator.push_active,
+        },
+    }
@@ -1,44 +1,31 @@
 """Represent the IPX800V5 base entity."""
 
-from pypx800v5 import EXTENSIONS, IPX, IPX800
-from voluptuous.util import Upper
-
-from homeassistant.const import (
-    CONF_DEVICE_CLASS,
-    CONF_ENTITY_CATEGORY,
-    CONF_ICON,
-    CONF_ID,
-    CONF_NAME,
-    CONF_UNIT_OF_MEASUREMENT,
-)
+from pypx800v5 import IPX
+
+from homeassistant.const import EntityCategory
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC, DeviceInfo
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-)
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import slugify
 
-from .const import (
-    CONF_COMPONENT,
-    CONF_EXT_NAME,
-    CONF_EXT_NUMBER,
-    CONF_EXT_TYPE,
-    CONF_IO_NUMBER,
-    CONF_IO_NUMBERS,
-    CONF_TRANSITION,
-    DEFAULT_TRANSITION,
-    DOMAIN,
-)
+from .const import DOMAIN, POLL_TIER_NORMAL, POLL_TIER_SLOW, PUSH_ON_STATES
+from .controller import IpxController
+from .coordinator import IpxDataUpdateCoordinator
+from .helpers import IpxDeviceRecord, IpxExtensionRecord, parse_ana_value
 
 
 class IpxEntity(CoordinatorEntity):
     """Representation of a IPX800 generic device entity."""
 
+    _poll_tier = POLL_TIER_NORMAL
+    # whether a pushed number is the analog value of the entity
+    _push_analog = False
+
     def __init__(
         self,
-        device_config: dict,
-        ipx: IPX800,
-        coordinator: DataUpdateCoordinator,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
+        coordinator: IpxDataUpdateCoordinator,
         suffix_name=None,
         device_name=None,
     ) -> None:
@@ -46,25 +33,27 @@ class IpxEntity(CoordinatorEntity):
         super().__init__(coordinator)
 
         self.ipx = ipx
-        self._transition = int(
-            device_config.get(CONF_TRANSITION, DEFAULT_TRANSITION) * 1000
-        )
-        self._component: str = device_config[CONF_COMPONENT]
-        self._ext_type: str = device_config[CONF_EXT_TYPE]
-        self._ext_number: int | None = device_config.get(CONF_EXT_NUMBER)
-        self._io_number: int | None = device_config.get(CONF_IO_NUMBER)
-        self._io_numbers: list[int] = device_config.get(CONF_IO_NUMBERS, [])
-        self._io_id: int | None = device_config.get(CONF_ID)
-
-        self._attr_name: str = device_config[CONF_NAME]
+        self.state_ids: frozenset[int] | None = None
+        self._transition = int(device_config.transition * 1000)
+        self._component: str = device_config.component
+        self._ext_type: str = device_config.ext_type
+        self._ext_number: int | None = device_config.ext_number
+        self._io_number: int | None = device_config.io_number
+        self._io_numbers: tuple[int, ...] = device_config.io_numbers
+        self._io_id: int | None = device_config.id
+        self._config_poll_tier: str | None = device_config.poll_tier
+        if self._io_id is not None:
+            self._set_state_ids(self._io_id)
+
+        self._attr_name: str = device_config.name
+        slug = device_config.slug
         if suffix_name:
             self._attr_name = f"{self._attr_name} {suffix_name}"
-        self._attr_device_class = device_config.get(CONF_DEVICE_CLASS)
-        self._attr_native_unit_of_measurement = device_config.get(
-            CONF_UNIT_OF_MEASUREMENT
-        )
-        self._attr_icon = device_config.get(CONF_ICON)
-        self._attr_entity_category = device_config.get(CONF_ENTITY_CATEGORY)
+            slug = slugify(self._attr_name)
+        self._attr_device_class = device_config.device_class
+        self._attr_native_unit_of_measurement = device_config.unit_of_measurement
+        self._attr_icon = device_config.icon
+        self._attr_entity_category = device_config.entity_category
         self._attr_unique_id = "_".join(
             [
                 DOMAIN,
@@ -72,36 +61,119 @@ class IpxEntity(CoordinatorEntity):
                 self._ext_type,
                 str(self._ext_number),
                 self._component,
-                slugify(self._attr_name),
+                slug,
             ]
         )
 
-        configuration_url = f"http://{self.ipx.host}:{self.ipx.port}/"
-
-        device_model = (
-            Upper(self._ext_type[:1] + "-" + self._ext_type[1:])
-            if self._ext_type in EXTENSIONS
-            else "IPX800 V5"
+        self._attr_device_info = self._get_device_info(
+            device_config.extension, coordinator.name, device_name
         )
+
+    def _get_device_info(
+        self, extension: IpxExtensionRecord, ipx_name: str, device_name: str | None
+    ) -> DeviceInfo:
+        """Return the device info shared by the entities of a same device."""
         if self._ext_type == IPX:
-            self._attr_device_info = DeviceInfo(
-                identifiers={(DOMAIN, self.ipx.mac_address)},
+            identifier = self.ipx.mac_address
+        else:
+            identifier = slugify(device_name) if device_name else extension.slug
+        if (device_info := self.ipx.device_infos.get(identifier)) is not None:
+            return device_info
+
+        configuration_url = f"http://{self.ipx.host}:{self.ipx.port}/"
+        if self._ext_type == IPX:
+            device_info = DeviceInfo(
+                identifiers={(DOMAIN, identifier)},
                 manufacturer="GCE Electronics",
-                model=device_model,
-                name=coordinator.name,
+                model=extension.model,
+                name=ipx_name,
                 configuration_url=configuration_url,
-                sw_version=self.ipx.firmware_version if self._ext_type == IPX else None,
+                sw_version=self.ipx.firmware_version,
                 connections={(CONNECTION_NETWORK_MAC, str(self.ipx.mac_address))},
             )
         else:
-            device_name = device_name or device_config.get(
-                CONF_EXT_NAME, f"{Upper(self._ext_type)} N°{self._ext_number}"
-            )
-            self._attr_device_info = DeviceInfo(
-                identifiers={(DOMAIN, slugify(device_name))},
+            device_info = DeviceInfo(
+                identifiers={(DOMAIN, identifier)},
                 manufacturer="GCE Electronics",
-                model=device_model,
-                name=device_name,
+                model=extension.model,
+                name=device_name or extension.name,
                 configuration_url=configuration_url,
                 via_device=(DOMAIN, self.ipx.mac_address),
             )
+        self.ipx.device_infos[identifier] = device_info
+        return device_info
+
+    @property
+    def poll_tier(self) -> str:
+        """Return the polling tier of the entity ids.
+
+        A tier chosen in the options flow or the yaml configuration takes
+        precedence over the default tier of the entity class.
+        """
+        if poll_tier := self.coordinator.poll_tier_overrides.get(self.unique_id):
+            return poll_tier
+        if self._config_poll_tier is not None:
+            return self._config_poll_tier
+        if self.entity_category == EntityCategory.DIAGNOSTIC:
+            return POLL_TIER_SLOW
+        return self._poll_tier
+
+    def _set_state_ids(self, *state_ids: int) -> None:
+        """Set the IO/ANA ids the entity state is read from.
+
+        The coordinator only notifies the entity when one of these ids changes,
+        entities that don't set them are notified on every update.
+        """
+        self.state_ids = frozenset(state_ids)
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the coordinator updates of the entity ids."""
+        await super().async_added_to_hass()
+        self.coordinator.subscriptions.async_subscribe(self)
+        self.async_on_remove(
+            lambda: self.coordinator.subscriptions.async_unsubscribe(self)
+        )
+
+    async def async_after_command(
+        self, expected: dict[int, dict] | None = None
+    ) -> None:
+        """Update the entity state after a command sent to the IPX800.
+
+        In optimistic mode, the expected IO/ANA values are shown at once and
+        read back later, otherwise a refresh is requested.
+        """
+        if self.coordinator.optimistic and expected and self.coordinator.data:
+            self.coordinator.async_set_optimistic(expected)
+            await self.coordinator.async_request_verification()
+        else:
+            await self.coordinator.async_request_refresh()
+
+    @property
+    def pushed_state_id(self) -> int | None:
+        """Return the IO/ANA id a state pushed for the entity stands for."""
+        if not self.state_ids or len(self.state_ids) != 1:
+            return None
+        (state_id,) = self.state_ids
+        return state_id
+
+    def get_pushed_values(self, state: str) -> dict[int, dict] | None:
+        """Return the IO/ANA values standing for a state pushed by the IPX800.
+
+        Entities reading a single IO translate a pushed state, analog entities
+        a pushed number, None is returned for the others. A ValueError is
+        raised when an analog value isn't a number.
+        """
+        state_id = self.pushed_state_id
+        if state_id is None or not self.coordinator.data:
+            return None
+        value = self.coordinator.data.get(state_id, {})
+        if "on" in value:
+            return {state_id: {"on": state.lower() in PUSH_ON_STATES}}
+        if self._push_analog and "value" in value:
+            return {state_id: {"value": parse_ana_value(state)}}
+        return None
+
+    @callback
+    def async_handle_state_ids_update(self) -> None:
+        """Handle a change of one of the entity IO/ANA ids."""
+        self._handle_coordinator_update()
@@ -1,11 +1,11 @@
 """Tools to manage IPX800V5 tools."""
 
-from itertools import groupby
+from collections.abc import Callable
+from dataclasses import dataclass
 import logging
 
 from pypx800v5 import (
     API_CONFIG_NAME,
-    API_CONFIG_TYPE,
     EXT_X010V,
     EXT_X4FP,
     EXT_X4VR,
@@ -16,8 +16,8 @@ from pypx800v5 import (
     EXT_XDISPLAY,
     EXT_XPWM,
     EXT_XTHL,
+    EXTENSIONS,
     IPX,
-    IPX800,
     OBJECT_ACCESS_CONTROL,
     OBJECT_COUNTER,
     OBJECT_TEMPO,
@@ -25,35 +25,344 @@ from pypx800v5 import (
     TYPE_ANA,
     TYPE_IO,
 )
+from voluptuous.util import Upper
 
+from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
+    CONF_DEVICE_CLASS,
     CONF_ENTITY_CATEGORY,
+    CONF_ICON,
     CONF_ID,
     CONF_NAME,
     CONF_TYPE,
+    CONF_UNIT_OF_MEASUREMENT,
     EntityCategory,
 )
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util import slugify
 
 from .const import (
+    CONF_ADAPTIVE_POLLING,
     CONF_COMPONENT,
+    CONF_DEFAULT_BRIGHTNESS,
+    CONF_DEVICES,
+    CONF_DEVICES_AUTO,
+    CONF_DIAG_SENSORS,
     CONF_EXT_NAME,
     CONF_EXT_NUMBER,
     CONF_EXT_TYPE,
     CONF_IO_NUMBER,
     CONF_IO_NUMBERS,
+    CONF_POLL_TIER,
+    CONF_TRANSITION,
+    CONTROLLER,
+    COORDINATOR,
     DEFAULT_IPX_NAME,
+    DEFAULT_TRANSITION,
+    DOMAIN,
+    PLATFORM_ENTITIES,
+    PLATFORMS,
+    POLLING_OPTIONS,
     TYPE_IPX_OPENCOLL,
     TYPE_IPX_OPTO,
+    TYPE_IPX_SCAN_INTERVAL,
     TYPE_XPWM_RGB,
     TYPE_XPWM_RGBW,
 )
+from .controller import IpxController
+from .coordinator import IpxDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
+# entity classes of a platform by IO/ANA type, by extension or object type
+# with the device type, or by extension or object type
+EntityClasses = dict[str | tuple[str, str | None], tuple[Callable[..., Entity], ...]]
 
-def filter_entities_by_platform(devices: list, component: str) -> list:
-    """Filter device list by platform."""
-    return list(filter(lambda d: d[CONF_COMPONENT] == component, devices))
+
+@dataclass(frozen=True, slots=True)
+class IpxExtensionRecord:
+    """Extension or object of the IPX800, shared by the records of its entities."""
+
+    ext_type: str
+    ext_number: int | None
+    name: str
+    slug: str
+    model: str
+
+
+@dataclass(frozen=True, slots=True)
+class IpxDeviceRecord:
+    """Immutable configuration of a device, built once for its entities."""
+
+    name: str
+    slug: str
+    component: str
+    extension: IpxExtensionRecord
+    type: str | None = None
+    id: int | None = None
+    io_number: int | None = None
+    io_numbers: tuple[int, ...] = ()
+    transition: float = DEFAULT_TRANSITION
+    default_brightness: int = 255
+    device_class: str | None = None
+    unit_of_measurement: str | None = None
+    icon: str | None = None
+    entity_category: EntityCategory | None = None
+    poll_tier: str | None = None
+
+    @property
+    def ext_type(self) -> str:
+        """Return the type of the extension or object."""
+        return self.extension.ext_type
+
+    @property
+    def ext_number(self) -> int | None:
+        """Return the number of the extension or object in its type."""
+        return self.extension.ext_number
+
+    def as_config(self) -> dict:
+        """Return the device config the record was built from, to store it."""
+        config = {
+            CONF_NAME: self.name,
+            CONF_COMPONENT: self.component,
+            CONF_EXT_TYPE: self.ext_type,
+            CONF_EXT_NUMBER: self.ext_number,
+            CONF_EXT_NAME: self.extension.name,
+            CONF_TYPE: self.type,
+            CONF_ID: self.id,
+            CONF_IO_NUMBER: self.io_number,
+            CONF_IO_NUMBERS: list(self.io_numbers),
+            CONF_TRANSITION: self.transition,
+            CONF_DEFAULT_BRIGHTNESS: self.default_brightness,
+            CONF_DEVICE_CLASS: self.device_class,
+            CONF_UNIT_OF_MEASUREMENT: self.unit_of_measurement,
+            CONF_ICON: self.icon,
+            CONF_ENTITY_CATEGORY: self.entity_category,
+            CONF_POLL_TIER: self.poll_tier,
+        }
+        return {key: value for key, value in config.items() if value is not None}
+
+
+def get_entry_config(entry: ConfigEntry) -> dict:
+    """Return the configuration of an entry from its data and options.
+
+    The data wins over the options, except for the polling options. They are
+    only changed from the options flow, while the data keeps the values chosen
+    when the entry was created.
+    """
+    return (
+        entry.options
+        | entry.data
+        | {key: value for key, value in entry.options.items() if key in POLLING_OPTIONS}
+    )
+
+
+def build_device_records(
+    devices_by_platform: dict[str, list],
+) -> dict[str, list[IpxDeviceRecord]]:
+    """Build the records of the device configs by platform.
+
+    The name, slug and model of an extension or object are computed once and
+    shared by the records of its devices.
+    """
+    extensions: dict[tuple, IpxExtensionRecord] = {}
+    records: dict[str, list[IpxDeviceRecord]] = {}
+    for platform, devices in devices_by_platform.items():
+        platform_records = records[platform] = []
+        for device in devices:
+            ext_type = device[CONF_EXT_TYPE]
+            ext_number = device.get(CONF_EXT_NUMBER)
+            ext_name = device.get(CONF_EXT_NAME)
+            extension_key = (ext_type, ext_number, ext_name)
+            if (extension := extensions.get(extension_key)) is None:
+                ext_name = ext_name or f"{Upper(ext_type)} N°{ext_number}"
+                extension = extensions[extension_key] = IpxExtensionRecord(
+                    ext_type=ext_type,
+                    ext_number=ext_number,
+                    name=ext_name,
+                    slug=slugify(ext_name),
+                    model=(
+                        Upper(ext_type[:1] + "-" + ext_type[1:])
+                        if ext_type in EXTENSIONS
+                        else "IPX800 V5"
+                    ),
+                )
+            # the category is a string in the entities cached in the storage
+            entity_category = device.get(CONF_ENTITY_CATEGORY)
+            platform_records.append(
+                IpxDeviceRecord(
+                    name=device[CONF_NAME],
+                    slug=slugify(device[CONF_NAME]),
+                    component=device[CONF_COMPONENT],
+                    extension=extension,
+                    type=device.get(CONF_TYPE),
+                    id=device.get(CONF_ID),
+                    io_number=device.get(CONF_IO_NUMBER),
+                    io_numbers=tuple(device.get(CONF_IO_NUMBERS, ())),
+                    transition=device.get(CONF_TRANSITION, DEFAULT_TRANSITION),
+                    default_brightness=device.get(CONF_DEFAULT_BRIGHTNESS, 255),
+                    device_class=device.get(CONF_DEVICE_CLASS),
+                    unit_of_measurement=device.get(CONF_UNIT_OF_MEASUREMENT),
+                    icon=device.get(CONF_ICON),
+                    entity_category=(
+                        EntityCategory(entity_category) if entity_category else None
+                    ),
+                    poll_tier=device.get(CONF_POLL_TIER),
+                )
+            )
+    return records
+
+
+def build_entities_by_platform(source: str, ipx: IpxController, config: dict) -> dict:
+    """Build the entities of the IPX800 configuration by platform."""
+    devices_index = DevicesConfigIndex(config[CONF_DEVICES])
+    devices_auto = config.get(CONF_DEVICES_AUTO, [])
+    auto_entities = []
+    auto_entities.extend(build_ipx_entities(source, devices_index, devices_auto))
+    auto_entities.extend(
+        build_ipx_system_entities(
+            ipx,
+            config.get(CONF_DIAG_SENSORS, False),
+            config.get(CONF_ADAPTIVE_POLLING, False),
+        )
+    )
+    auto_entities.extend(
+        build_extensions_entities(source, ipx, devices_index, devices_auto)
+    )
+    auto_entities.extend(
+        build_objects_entities(source, ipx, devices_index, devices_auto)
+    )
+    # the devices config with the ext_name of their automatic device
+    entities = list(devices_index.devices)
+    entities.extend(remove_duplicate_entities(auto_entities, devices_index))
+    return partition_entities_by_platform(entities)
+
+
+def partition_entities_by_platform(devices: list) -> dict[str, list]:
+    """Split the device list by platform in a single pass."""
+    platforms: dict[str, list] = {platform: [] for platform in PLATFORMS}
+    for device in devices:
+        if (platform_devices := platforms.get(device[CONF_COMPONENT])) is not None:
+            platform_devices.append(device)
+    return platforms
+
+
+def get_entity_classes(
+    device: IpxDeviceRecord, entity_classes: EntityClasses
+) -> tuple[Callable[..., Entity], ...]:
+    """Return the entity classes to build with a device of a platform.
+
+    The IO/ANA type of a device is looked up first, then its extension or
+    object type with its type, then its extension or object type alone.
+    """
+    device_type = device.type
+    ext_type = device.ext_type
+    return (
+        entity_classes.get(device_type)
+        or entity_classes.get((ext_type, device_type))
+        or entity_classes.get(ext_type, ())
+    )
+
+
+class IpxPlatformEntities:
+    """Entities of a platform by device, to add or remove them later on."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entity_classes: EntityClasses,
+        async_add_entities: AddEntitiesCallback,
+        ipx: IpxController,
+        coordinator: IpxDataUpdateCoordinator,
+    ) -> None:
+        """Initialize the platform entities."""
+        self.hass = hass
+        self._entity_classes = entity_classes
+        self._async_add_entities = async_add_entities
+        self._ipx = ipx
+        self._coordinator = coordinator
+        self._entities: dict[IpxDeviceRecord, list[Entity]] = {}
+        self._waiting_devices: list[IpxDeviceRecord] = []
+        self._remove_data_listener: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_add(self, devices: list[IpxDeviceRecord]) -> None:
+        """Add the entities of the devices not added yet.
+
+        The entities read the coordinator data, while the IPX800 hasn't
+        answered yet they are only added once its first data is received.
+        """
+        if self._coordinator.data is None:
+            self._waiting_devices = devices
+            if self._remove_data_listener is None:
+                self._remove_data_listener = self._coordinator.async_add_listener(
+                    self._async_add_waiting_devices
+                )
+            return
+        new_entities: list[Entity] = []
+        for device in devices:
+            if device in self._entities:
+                continue
+            entities = [
+                entity_class(device, self._ipx, self._coordinator)
+                for entity_class in get_entity_classes(device, self._entity_classes)
+            ]
+            self._entities[device] = entities
+            new_entities.extend(entities)
+        if new_entities:
+            self._async_add_entities(new_entities)
+
+    @callback
+    def _async_add_waiting_devices(self) -> None:
+        """Add the entities waiting for the first data of the coordinator."""
+        if self._coordinator.data is None:
+            return
+        self.async_cancel()
+        self.async_add(self._waiting_devices)
+
+    @callback
+    def async_cancel(self) -> None:
+        """Stop waiting for the first data of the coordinator."""
+        if self._remove_data_listener is not None:
+            self._remove_data_listener()
+            self._remove_data_listener = None
+
+    async def async_update(self, devices: list[IpxDeviceRecord]) -> None:
+        """Remove the entities of the devices gone and add the new ones."""
+        kept = set(devices)
+        entity_registry = er.async_get(self.hass)
+        for device in [device for device in self._entities if device not in kept]:
+            for entity in self._entities.pop(device):
+                if entity.registry_entry is not None:
+                    entity_registry.async_remove(entity.entity_id)
+                else:
+                    await entity.async_remove()
+        self.async_add(devices)
+
+
+@callback
+def async_setup_platform_entities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    platform: str,
+    entity_classes: EntityClasses,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Add the entities of a platform and keep them for the options updates."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    platform_entities = IpxPlatformEntities(
+        hass,
+        entity_classes,
+        async_add_entities,
+        entry_data[CONTROLLER],
+        entry_data[COORDINATOR],
+    )
+    entry_data[PLATFORM_ENTITIES][platform] = platform_entities
+    entry.async_on_unload(platform_entities.async_cancel)
+    platform_entities.async_add(entry_data[CONF_DEVICES][platform])
 
 
 def check_devices_config(devices_config: list) -> list:
@@ -111,63 +420,107 @@ def check_devices_config(devices_config: list) -> list:
     return devices
 
 
-def get_device_in_devices_config(
-    devices_config: list, device_auto: dict, use_device_name_as_ext_name: bool = False
-) -> dict:
-    """Build a device config from config and automatic config."""
-    device = None
-    # Filter on base keys
-    found_devices = [
-        device_conf
-        for device_conf in devices_config
-        if str(device_conf[CONF_EXT_TYPE]) == str(device_auto[CONF_EXT_TYPE])
-        and int(device_conf[CONF_EXT_NUMBER]) == int(device_auto[CONF_EXT_NUMBER])
-        and (
-            str(device_conf[CONF_COMPONENT]) == str(device_auto[CONF_COMPONENT])
-            or (
-                str(device_auto[CONF_EXT_TYPE]) in [IPX, EXT_X8R]
-                and str(device_auto[CONF_COMPONENT]) in ["light", "switch"]
-                and str(device_conf[CONF_COMPONENT]) in ["light", "switch"]
+# objects and extensions matched without io number when they are configured once
+SINGLE_DEVICE_TYPES = [
+    OBJECT_ACCESS_CONTROL,
+    OBJECT_TEMPO,
+    OBJECT_COUNTER,
+    OBJECT_THERMOSTAT,
+    EXT_XTHL,
+]
+
+
+def _get_device_config_key(device: dict) -> tuple:
+    """Return the base keys a device config is matched on."""
+    ext_type = str(device[CONF_EXT_TYPE])
+    component = str(device[CONF_COMPONENT])
+    # relays of the IPX and X-8R can be either a light or a switch
+    if ext_type in [IPX, EXT_X8R] and component in ["light", "switch"]:
+        component = "switch"
+    return (ext_type, int(device[CONF_EXT_NUMBER]), component, device.get(CONF_TYPE))
+
+
+class DevicesConfigIndex:
+    """Lookup of the devices config by the keys of the automatic devices.
+
+    The devices config list is indexed once, then each automatic device is
+    matched with dict lookups instead of a scan of the list. When several
+    devices config match, the first one of the list is used.
+
+    The devices config are copied, the ext_name of a matched device is set
+    on its copy and the given list is left unchanged.
+    """
+
+    def __init__(self, devices_config: list) -> None:
+        """Index the devices config."""
+        self.devices: list[dict] = [dict(device) for device in devices_config]
+        self._devices: dict[tuple, list[dict]] = {}
+        self._by_io_number: dict[tuple, dict] = {}
+        self._by_io_numbers: dict[tuple, dict] = {}
+        self._by_io_numbers_only: dict[tuple, dict] = {}
+        for device in self.devices:
+            key = _get_device_config_key(device)
+            devices = self._devices.setdefault(key, [])
+            position = (len(devices), device)
+            devices.append(device)
+            if CONF_IO_NUMBER in device:
+                self._by_io_number.setdefault((key, device[CONF_IO_NUMBER]), position)
+            if CONF_IO_NUMBERS in device:
+                io_numbers_key = (key, tuple(device[CONF_IO_NUMBERS]))
+                self._by_io_numbers.setdefault(io_numbers_key, position)
+                if CONF_IO_NUMBER not in device:
+                    self._by_io_numbers_only.setdefault(io_numbers_key, position)
+
+    def _find_device(self, device_auto: dict) -> dict | None:
+        """Return the first device config matching an automatic device."""
+        key = _get_device_config_key(device_auto)
+        devices = self._devices.get(key)
+        if not devices:
+            return None
+        if len(devices) == 1 and devices[0][CONF_EXT_TYPE] in SINGLE_DEVICE_TYPES:
+            return devices[0]
+        candidates = []
+        if CONF_IO_NUMBER in device_auto:
+            candidates.append(
+                self._by_io_number.get((key, device_auto[CONF_IO_NUMBER]))
             )
-        )
-        and (device_conf.get(CONF_TYPE) == device_auto.get(CONF_TYPE))
-    ]
-    # Filter on others keys
-    for device_config in found_devices:
-        # if filter return only one result and don't need io_number(s)
-        if (
-            device_config[CONF_EXT_TYPE]
-            in [
-                OBJECT_ACCESS_CONTROL,
-                OBJECT_TEMPO,
-                OBJECT_COUNTER,
-                OBJECT_THERMOSTAT,
-                EXT_XTHL,
-            ]
-            and len(found_devices) == 1
-        ):
-            device = device_config
-            break
-        # elif io_number(s) are equals
-        if CONF_IO_NUMBER in device_auto and CONF_IO_NUMBER in device_config:
-            if device_config[CONF_IO_NUMBER] == device_auto[CONF_IO_NUMBER]:
-                device = device_config
-                break
-        elif CONF_IO_NUMBERS in device_auto and CONF_IO_NUMBERS in device_config:
-            if device_config[CONF_IO_NUMBERS] == device_auto[CONF_IO_NUMBERS]:
-                device = device_config
-                break
-    if device is not None:
-        _LOGGER.debug("Found custom config for device %s", device[CONF_NAME])
-        if use_device_name_as_ext_name:
-            device[CONF_EXT_NAME] = device[CONF_NAME]
-        elif CONF_EXT_NAME not in device:
-            device[CONF_EXT_NAME] = device_auto.get(CONF_EXT_NAME, device[CONF_NAME])
-        return dict(device)
-    return device_auto
-
-
-def build_ipx_system_entities(ipx: IPX800, enable_diag_sensors: bool = False) -> list:
+        if CONF_IO_NUMBERS in device_auto:
+            # io numbers are only compared when both don't have an io number
+            by_io_numbers = (
+                self._by_io_numbers_only
+                if CONF_IO_NUMBER in device_auto
+                else self._by_io_numbers
+            )
+            candidates.append(
+                by_io_numbers.get((key, tuple(device_auto[CONF_IO_NUMBERS])))
+            )
+        candidates = [candidate for candidate in candidates if candidate is not None]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda candidate: candidate[0])[1]
+
+    def get_device(
+        self, device_auto: dict, use_device_name_as_ext_name: bool = False
+    ) -> dict:
+        """Build a device config from config and automatic config."""
+        device = self._find_device(device_auto)
+        if device is not None:
+            _LOGGER.debug("Found custom config for device %s", device[CONF_NAME])
+            if use_device_name_as_ext_name:
+                device[CONF_EXT_NAME] = device[CONF_NAME]
+            elif CONF_EXT_NAME not in device:
+                device[CONF_EXT_NAME] = device_auto.get(
+                    CONF_EXT_NAME, device[CONF_NAME]
+                )
+            return dict(device)
+        return device_auto
+
+
+def build_ipx_system_entities(
+    ipx: IpxController,
+    enable_diag_sensors: bool = False,
+    adaptive_polling: bool = False,
+) -> list:
     """Add system, configuration and diagnostic IPX800 entities."""
     entities = [
         {
@@ -199,6 +552,17 @@ def build_ipx_system_entities(ipx: IPX800, enable_diag_sensors: bool = False) ->
                         CONF_ENTITY_CATEGORY: EntityCategory.DIAGNOSTIC,
                     }
                 )
+    if adaptive_polling:
+        entities.append(
+            {
+                CONF_NAME: f"{DEFAULT_IPX_NAME} Scan interval",
+                CONF_COMPONENT: "sensor",
+                CONF_EXT_TYPE: IPX,
+                CONF_EXT_NUMBER: 0,
+                CONF_TYPE: TYPE_IPX_SCAN_INTERVAL,
+                CONF_ENTITY_CATEGORY: EntityCategory.DIAGNOSTIC,
+            }
+        )
     if ipx.io_acpower_id in ipx.ipx_config:
         entities.append(
             {
@@ -215,7 +579,7 @@ def build_ipx_system_entities(ipx: IPX800, enable_diag_sensors: bool = False) ->
 
 
 def build_ipx_entities(
-    entry_source: str, devices_config: list, auto_ext_list: list
+    entry_source: str, devices_index: DevicesConfigIndex, auto_ext_list: list
 ) -> list:
     """Build entities list for the IPX800 from config and discovery."""
     entities = []
@@ -225,8 +589,7 @@ def build_ipx_entities(
         for i in range(8):
             # relais
             entities.append(  # noqa: PERF401
-                get_device_in_devices_config(
-                    devices_config,
+                devices_index.get_device(
                     {
                         CONF_NAME: f"{DEFAULT_IPX_NAME} Relais {i + 1}",
                         CONF_COMPONENT: "switch",
@@ -239,8 +602,7 @@ def build_ipx_entities(
         for i in range(4):
             # open collector
             entities.append(  # noqa: PERF401
-                get_device_in_devices_config(
-                    devices_config,
+                devices_index.get_device(
                     {
                         CONF_NAME: f"{DEFAULT_IPX_NAME} Open Collector {i + 1}",
                         CONF_COMPONENT: "switch",
@@ -254,8 +616,7 @@ def build_ipx_entities(
         for i in range(8):
             # digital inputs
             entities.append(  # noqa: PERF401
-                get_device_in_devices_config(
-                    devices_config,
+                devices_index.get_device(
                     {
                         CONF_NAME: f"{DEFAULT_IPX_NAME} Digital Input {i + 1}",
                         CONF_COMPONENT: "binary_sensor",
@@ -268,8 +629,7 @@ def build_ipx_entities(
         for i in range(4):
             # analog inputs
             entities.append(  # noqa: PERF401
-                get_device_in_devices_config(
-                    devices_config,
+                devices_index.get_device(
                     {
                         CONF_NAME: f"{DEFAULT_IPX_NAME} Analog Input {i + 1}",
                         CONF_COMPONENT: "sensor",
@@ -282,8 +642,7 @@ def build_ipx_entities(
         for i in range(4):
             # opto inputs
             entities.append(  # noqa: PERF401
-                get_device_in_devices_config(
-                    devices_config,
+                devices_index.get_device(
                     {
                         CONF_NAME: f"{DEFAULT_IPX_NAME} Opto Input {i + 1}",
                         CONF_COMPONENT: "binary_sensor",
@@ -298,22 +657,20 @@ def build_ipx_entities(
 
 
 def build_extensions_entities(
-    entry_source: str, ipx: IPX800, devices_config: list, auto_ext_list: list
+    entry_source: str,
+    ipx: IpxController,
+    devices_index: DevicesConfigIndex,
+    auto_ext_list: list,
 ) -> list:
     """Build entities list for extensions from config and discovery."""
     entities = []
-    ext_type = None
-    for ext_type, extensions in groupby(
-        ipx.extensions_config, lambda x: x[API_CONFIG_TYPE]
-    ):
+    for ext_type, extensions in ipx.extensions_by_type.items():
         if entry_source == "user" or ext_type in auto_ext_list:
             _LOGGER.debug("Build entities for %s extension", ext_type)
-            ext_number = 0
-            for extension in extensions:
+            for ext_number, extension in extensions:
                 if ext_type == EXT_X8R:
                     for i in range(8):
-                        main_entity = get_device_in_devices_config(
-                            devices_config,
+                        main_entity = devices_index.get_device(
                             {
                                 CONF_NAME: f"{extension[API_CONFIG_NAME]} Relais {i + 1}",
                                 CONF_COMPONENT: "switch",
@@ -337,8 +694,7 @@ def build_extensions_entities(
                 elif ext_type == EXT_XDIMMER:
                     for i in range(4):
                         entities.append(  # noqa: PERF401
-                            get_device_in_devices_config(
-                                devices_config,
+                            devices_index.get_device(
                                 {
                                     CONF_NAME: f"{extension[API_CONFIG_NAME]} Sortie {i + 1}",
                                     CONF_COMPONENT: "light",
@@ -352,8 +708,7 @@ def build_extensions_entities(
                 elif ext_type == EXT_XPWM:
                     for i in range(12):
                         entities.append(  # noqa: PERF401
-                            get_device_in_devices_config(
-                                devices_config,
+                            devices_index.get_device(
                                 {
                                     CONF_NAME: f"{extension[API_CONFIG_NAME]} Sortie {i + 1}",
                                     CONF_COMPONENT: "light",
@@ -367,8 +722,7 @@ def build_extensions_entities(
                 elif ext_type in [EXT_X24D, EXT_X8D]:
                     for i in range(24 if ext_type == EXT_X24D else 8):
                         entities.append(  # noqa: PERF401
-                            get_device_in_devices_config(
-                                devices_config,
+                            devices_index.get_device(
                                 {
                                     CONF_NAME: f"{extension[API_CONFIG_NAME]} Digital Input {i + 1}",
                                     CONF_COMPONENT: "binary_sensor",
@@ -382,8 +736,7 @@ def build_extensions_entities(
                 elif ext_type == EXT_X4FP:
                     for i in range(4):
                         entities.append(  # noqa: PERF401
-                            get_device_in_devices_config(
-                                devices_config,
+                            devices_index.get_device(
                                 {
                                     CONF_NAME: f"{extension['name']} FP {i + 1}",
                                     CONF_COMPONENT: "climate",
@@ -397,8 +750,7 @@ def build_extensions_entities(
                 elif ext_type == EXT_X4VR:
                     for i in range(4):
                         entities.append(  # noqa: PERF401
-                            get_device_in_devices_config(
-                                devices_config,
+                            devices_index.get_device(
                                 {
                                     CONF_NAME: f"{extension['name']} VR {i + 1}",
                                     CONF_COMPONENT: "cover",
@@ -411,8 +763,7 @@ def build_extensions_entities(
                         )
                 elif ext_type == EXT_XTHL:
                     entities.append(
-                        get_device_in_devices_config(
-                            devices_config,
+                        devices_index.get_device(
                             {
                                 CONF_NAME: extension[API_CONFIG_NAME],
                                 CONF_COMPONENT: "sensor",
@@ -423,8 +774,7 @@ def build_extensions_entities(
                         )
                     )
                 elif ext_type == EXT_XDISPLAY:
-                    main_entity = get_device_in_devices_config(
-                        devices_config,
+                    main_entity = devices_index.get_device(
                         {
                             CONF_NAME: extension[API_CONFIG_NAME],
                             CONF_COMPONENT: "select",
@@ -455,8 +805,7 @@ def build_extensions_entities(
                 elif ext_type == EXT_X010V:
                     for i in range(4):
                         entities.append(  # noqa: PERF401
-                            get_device_in_devices_config(
-                                devices_config,
+                            devices_index.get_device(
                                 {
                                     CONF_NAME: f"{extension[API_CONFIG_NAME]} Sortie {i + 1}",
                                     CONF_COMPONENT: "light",
@@ -471,25 +820,23 @@ def build_extensions_entities(
                     _LOGGER.warning(
                         "%s extension type not currently supported", ext_type
                     )
-
-                ext_number += 1  # noqa: SIM113
     return entities
 
 
 def build_objects_entities(
-    entry_source: str, ipx: IPX800, devices_config: list, auto_ext_list: list
+    entry_source: str,
+    ipx: IpxController,
+    devices_index: DevicesConfigIndex,
+    auto_ext_list: list,
 ) -> list:
     """Build entities list for objects from config and discory."""
     entities = []
-    obj_type = None
-    for obj_type, objs in groupby(ipx.objects_config, lambda x: x[API_CONFIG_TYPE]):
+    for obj_type, objs in ipx.objects_by_type.items():
         if entry_source == "user" or obj_type in auto_ext_list:
             _LOGGER.debug("Build entities for objects type of %s", obj_type)
-            obj_number = 0
-            for obj in objs:
+            for obj_number, obj in objs:
                 if obj_type == OBJECT_THERMOSTAT:
-                    main_entity = get_device_in_devices_config(
-                        devices_config,
+                    main_entity = devices_index.get_device(
                         {
                             CONF_NAME: obj[API_CONFIG_NAME],
                             CONF_COMPONENT: "climate",
@@ -520,8 +867,7 @@ def build_objects_entities(
                     )
                 elif obj_type == OBJECT_COUNTER:
                     entities.append(
-                        get_device_in_devices_config(
-                            devices_config,
+                        devices_index.get_device(
                             {
                                 CONF_NAME: obj[API_CONFIG_NAME],
                                 CONF_COMPONENT: "number",
@@ -533,8 +879,7 @@ def build_objects_entities(
                         )
                     )
                 elif obj_type == OBJECT_TEMPO:
-                    main_entity = get_device_in_devices_config(
-                        devices_config,
+                    main_entity = devices_index.get_device(
                         {
                             CONF_NAME: obj[API_CONFIG_NAME],
                             CONF_COMPONENT: "binary_sensor",
@@ -565,8 +910,7 @@ def build_objects_entities(
                     )
                 elif obj_type == OBJECT_ACCESS_CONTROL:
                     entities.append(
-                        get_device_in_devices_config(
-                            devices_config,
+                        devices_index.get_device(
                             {
                                 CONF_NAME: obj[API_CONFIG_NAME],
                                 CONF_COMPONENT: "binary_sensor",
@@ -580,20 +924,29 @@ def build_objects_entities(
                 else:
                     _LOGGER.warning("%s object type not currently supported", obj_type)
 
-                obj_number += 1  # noqa: SIM113
-
     return entities
 
 
-def remove_duplicate_entities(auto_entities: list, devices_config: list) -> list:
+def remove_duplicate_entities(
+    auto_entities: list, devices_index: DevicesConfigIndex
+) -> list:
     """Remove existing entities in auto_entities from device_config."""
-    filtered_auto_entities = list(auto_entities)
+    filtered_auto_entities = []
     for entity in auto_entities:
-        entity["original"] = True
-        config = get_device_in_devices_config(devices_config, entity)
-        if "original" not in config:
+        # the automatic device is returned as is when nothing is configured
+        config = devices_index.get_device(entity)
+        if config is entity:
+            filtered_auto_entities.append(entity)
+        else:
             _LOGGER.debug(
                 "Remove already auto configured device config %s", config[CONF_NAME]
             )
-            filtered_auto_entities.remove(entity)
     return filtered_auto_entities
+
+
+def parse_ana_value(value: str) -> int | float:
+    """Return an analog value pushed by the IPX800, an int without decimals."""
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
@@ -10,7 +10,6 @@ from pypx800v5 import (
     EXT_XDIMMER,
     EXT_XPWM,
     IPX,
-    IPX800,
     X010V,
     X8R,
     XPWM,
@@ -28,24 +27,14 @@ from homeassistant.components.light import (
     LightEntityFeature,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_TYPE
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import (
-    CONF_DEFAULT_BRIGHTNESS,
-    CONF_DEVICES,
-    CONF_EXT_TYPE,
-    CONF_TRANSITION,
-    CONTROLLER,
-    COORDINATOR,
-    DEFAULT_TRANSITION,
-    DOMAIN,
-    TYPE_XPWM_RGB,
-    TYPE_XPWM_RGBW,
-)
+from .const import TYPE_XPWM_RGB, TYPE_XPWM_RGBW
+from .controller import IpxController
 from .entity import IpxEntity
+from .helpers import EntityClasses, IpxDeviceRecord, async_setup_platform_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -66,34 +55,9 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the IPX800 lights."""
-    controller = hass.data[DOMAIN][entry.entry_id][CONTROLLER]
-    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
-    devices = hass.data[DOMAIN][entry.entry_id][CONF_DEVICES]["light"]
-
-    entities: list[LightEntity] = []
-
-    for device in devices:
-        if device[CONF_EXT_TYPE] == IPX:
-            entities.append(IpxLight(device, controller, coordinator))
-        elif device[CONF_EXT_TYPE] == EXT_X8R:
-            entities.append(X8RLight(device, controller, coordinator))
-        elif device[CONF_EXT_TYPE] == EXT_XDIMMER:
-            entities.append(XDimmerLight(device, controller, coordinator))
-        elif device[CONF_EXT_TYPE] == EXT_XPWM and CONF_TYPE not in device:
-            entities.append(XPWMLight(device, controller, coordinator))
-        elif (
-            device[CONF_EXT_TYPE] == EXT_XPWM and device.get(CONF_TYPE) == TYPE_XPWM_RGB
-        ):
-            entities.append(XPWMRGBLight(device, controller, coordinator))
-        elif (
-            device[CONF_EXT_TYPE] == EXT_XPWM
-            and device.get(CONF_TYPE) == TYPE_XPWM_RGBW
-        ):
-            entities.append(XPWMRGBWLight(device, controller, coordinator))
-        elif device[CONF_EXT_TYPE] == EXT_X010V:
-            entities.append(X010VLight(device, controller, coordinator))
-
-    async_add_entities(entities, True)
+    async_setup_platform_entities(
+        hass, entry, "light", ENTITY_CLASSES, async_add_entities
+    )
 
 
 class IpxLight(IpxEntity, LightEntity):
@@ -104,13 +68,14 @@ class IpxLight(IpxEntity, LightEntity):
 
     def __init__(
         self,
-        device_config: dict,
-        ipx: IPX800,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
         coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the RelayLight."""
         super().__init__(device_config, ipx, coordinator)
-        self.control = IPX800Relay(ipx, self._io_number)
+        self.control = ipx.get_control(IPX800Relay, self._io_number)
+        self._set_state_ids(self.control.io_state_id)
 
     @property
     def is_on(self) -> bool:
@@ -120,17 +85,19 @@ class IpxLight(IpxEntity, LightEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the light."""
         await self.control.on()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command({self.control.io_state_id: {"on": True}})
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the light."""
         await self.control.off()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command({self.control.io_state_id: {"on": False}})
 
     async def async_toggle(self, **kwargs: Any) -> None:
         """Toggle the light."""
         await self.control.toggle()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command(
+            {self.control.io_state_id: {"on": not self.is_on}}
+        )
 
 
 class X8RLight(IpxEntity, LightEntity):
@@ -141,13 +108,14 @@ class X8RLight(IpxEntity, LightEntity):
 
     def __init__(
         self,
-        device_config: dict,
-        ipx: IPX800,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
         coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the RelayLight."""
         super().__init__(device_config, ipx, coordinator)
-        self.control = X8R(ipx, self._ext_number, self._io_number)
+        self.control = ipx.get_control(X8R, self._ext_number, self._io_number)
+        self._set_state_ids(self.control.io_state_id)
 
     @property
     def is_on(self) -> bool:
@@ -157,17 +125,19 @@ class X8RLight(IpxEntity, LightEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the light."""
         await self.control.on()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command({self.control.io_state_id: {"on": True}})
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the light."""
         await self.control.off()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command({self.control.io_state_id: {"on": False}})
 
     async def async_toggle(self, **kwargs: Any) -> None:
         """Toggle the light."""
         await self.control.toggle()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command(
+            {self.control.io_state_id: {"on": not self.is_on}}
+        )
 
 
 class XDimmerLight(IpxEntity, LightEntity):
@@ -179,14 +149,15 @@ class XDimmerLight(IpxEntity, LightEntity):
 
     def __init__(
         self,
-        device_config: dict,
-        ipx: IPX800,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
         coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the class XDimmerLight."""
         super().__init__(device_config, ipx, coordinator)
-        self.control = XDimmer(ipx, self._ext_number, self._io_number)
-        self._transition = device_config.get(CONF_TRANSITION, DEFAULT_TRANSITION)
+        self.control = ipx.get_control(XDimmer, self._ext_number, self._io_number)
+        self._set_state_ids(self.control.io_state_id, self.control.ana_state_id)
+        self._transition = device_config.transition
 
     @property
     def is_on(self) -> bool:
@@ -208,23 +179,26 @@ class XDimmerLight(IpxEntity, LightEntity):
             await self.control.set_level(
                 scaleto100(kwargs[ATTR_BRIGHTNESS]), self._transition * 1000
             )
+            await self.async_after_command()
         else:
             await self.control.on(self._transition * 1000)
-        await self.coordinator.async_request_refresh()
+            await self.async_after_command({self.control.io_state_id: {"on": True}})
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the light."""
         if ATTR_TRANSITION in kwargs:
             self._transition = kwargs[ATTR_TRANSITION]
         await self.control.off(self._transition * 1000)
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command({self.control.io_state_id: {"on": False}})
 
     async def async_toggle(self, **kwargs: Any) -> None:
         """Toggle the light."""
         if ATTR_TRANSITION in kwargs:
             self._transition = kwargs[ATTR_TRANSITION]
         await self.control.toggle(self._transition * 1000)
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command(
+            {self.control.io_state_id: {"on": not self.is_on}}
+        )
 
 
 class XPWMLight(IpxEntity, LightEntity):
@@ -236,18 +210,17 @@ class XPWMLight(IpxEntity, LightEntity):
 
     def __init__(
         self,
-        device_config: dict,
-        ipx: IPX800,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
         coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the XPWMLight."""
         super().__init__(device_config, ipx, coordinator)
-        self.control = XPWM(ipx, self._ext_number, self._io_number)
+        self.control = ipx.get_control(XPWM, self._ext_number, self._io_number)
+        self._set_state_ids(self.control.ana_state_id)
 
-        self._default_brightness = scaleto100(
-            device_config.get(CONF_DEFAULT_BRIGHTNESS, 255)
-        )
-        self._transition = device_config.get(CONF_TRANSITION, DEFAULT_TRANSITION)
+        self._default_brightness = scaleto100(device_config.default_brightness)
+        self._transition = device_config.transition
 
     @property
     def is_on(self) -> bool:
@@ -266,26 +239,26 @@ class XPWMLight(IpxEntity, LightEntity):
         if ATTR_TRANSITION in kwargs:
             self._transition = kwargs[ATTR_TRANSITION]
         if ATTR_BRIGHTNESS in kwargs:
-            await self.control.set_level(
-                scaleto100(kwargs[ATTR_BRIGHTNESS]), self._transition * 1000
-            )
+            level = scaleto100(kwargs[ATTR_BRIGHTNESS])
+            await self.control.set_level(level, self._transition * 1000)
         else:
+            level = 100
             await self.control.on(self._transition * 1000)
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command({self.control.ana_state_id: {"value": level}})
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the light."""
         if ATTR_TRANSITION in kwargs:
             self._transition = kwargs[ATTR_TRANSITION]
         await self.control.off(self._transition * 1000)
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command({self.control.ana_state_id: {"value": 0}})
 
     async def async_toggle(self, **kwargs: Any) -> None:
         """Toggle the light."""
         if ATTR_TRANSITION in kwargs:
             self._transition = kwargs[ATTR_TRANSITION]
         await self.control.toggle(self._transition * 1000)
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command()
 
 
 class XPWMRGBLight(IpxEntity, LightEntity):
@@ -297,20 +270,23 @@ class XPWMRGBLight(IpxEntity, LightEntity):
 
     def __init__(
         self,
-        device_config: dict,
-        ipx: IPX800,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
         coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the XPWMRGBLight."""
         super().__init__(device_config, ipx, coordinator)
-        self.xpwm_rgb_r = XPWM(ipx, self._ext_number, self._io_numbers[0])
-        self.xpwm_rgb_g = XPWM(ipx, self._ext_number, self._io_numbers[1])
-        self.xpwm_rgb_b = XPWM(ipx, self._ext_number, self._io_numbers[2])
-
-        self._default_brightness = scaleto100(
-            device_config.get(CONF_DEFAULT_BRIGHTNESS, 255)
+        self.xpwm_rgb_r = ipx.get_control(XPWM, self._ext_number, self._io_numbers[0])
+        self.xpwm_rgb_g = ipx.get_control(XPWM, self._ext_number, self._io_numbers[1])
+        self.xpwm_rgb_b = ipx.get_control(XPWM, self._ext_number, self._io_numbers[2])
+        self._set_state_ids(
+            self.xpwm_rgb_r.ana_state_id,
+            self.xpwm_rgb_g.ana_state_id,
+            self.xpwm_rgb_b.ana_state_id,
         )
-        self._transition = device_config.get(CONF_TRANSITION, DEFAULT_TRANSITION)
+
+        self._default_brightness = scaleto100(device_config.default_brightness)
+        self._transition = device_config.transition
 
     @property
     def is_on(self) -> bool:
@@ -400,7 +376,7 @@ class XPWMRGBLight(IpxEntity, LightEntity):
                     self._transition * 1000,
                 ),
             )
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the light."""
@@ -411,7 +387,7 @@ class XPWMRGBLight(IpxEntity, LightEntity):
             self.xpwm_rgb_g.off(self._transition * 1000),
             self.xpwm_rgb_b.off(self._transition * 1000),
         )
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command()
 
 
 class XPWMRGBWLight(IpxEntity, LightEntity):
@@ -423,21 +399,25 @@ class XPWMRGBWLight(IpxEntity, LightEntity):
 
     def __init__(
         self,
-        device_config: dict,
-        ipx: IPX800,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
         coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the XPWMRGBWLight."""
         super().__init__(device_config, ipx, coordinator)
-        self.xpwm_rgbw_r = XPWM(ipx, self._ext_number, self._io_numbers[0])
-        self.xpwm_rgbw_g = XPWM(ipx, self._ext_number, self._io_numbers[1])
-        self.xpwm_rgbw_b = XPWM(ipx, self._ext_number, self._io_numbers[2])
-        self.xpwm_rgbw_w = XPWM(ipx, self._ext_number, self._io_numbers[3])
-
-        self._default_brightness = scaleto100(
-            device_config.get(CONF_DEFAULT_BRIGHTNESS, 255)
+        self.xpwm_rgbw_r = ipx.get_control(XPWM, self._ext_number, self._io_numbers[0])
+        self.xpwm_rgbw_g = ipx.get_control(XPWM, self._ext_number, self._io_numbers[1])
+        self.xpwm_rgbw_b = ipx.get_control(XPWM, self._ext_number, self._io_numbers[2])
+        self.xpwm_rgbw_w = ipx.get_control(XPWM, self._ext_number, self._io_numbers[3])
+        self._set_state_ids(
+            self.xpwm_rgbw_r.ana_state_id,
+            self.xpwm_rgbw_g.ana_state_id,
+            self.xpwm_rgbw_b.ana_state_id,
+            self.xpwm_rgbw_w.ana_state_id,
         )
-        self._transition = device_config.get(CONF_TRANSITION, DEFAULT_TRANSITION)
+
+        self._default_brightness = scaleto100(device_config.default_brightness)
+        self._transition = device_config.transition
 
     @property
     def is_on(self) -> bool:
@@ -518,7 +498,7 @@ class XPWMRGBWLight(IpxEntity, LightEntity):
             await self.xpwm_rgbw_w.set_level(
                 self._default_brightness, self._transition * 1000
             )
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the light."""
@@ -530,7 +510,7 @@ class XPWMRGBWLight(IpxEntity, LightEntity):
             self.xpwm_rgbw_g.off(self._transition * 1000),
             self.xpwm_rgbw_b.off(self._transition * 1000),
         )
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command()
 
 
 class X010VLight(IpxEntity, LightEntity):
@@ -542,13 +522,14 @@ class X010VLight(IpxEntity, LightEntity):
 
     def __init__(
         self,
-        device_config: dict,
-        ipx: IPX800,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
         coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the class XDimmerLight."""
         super().__init__(device_config, ipx, coordinator)
-        self.control = X010V(ipx, self._ext_number, self._io_number)
+        self.control = ipx.get_control(X010V, self._ext_number, self._io_number)
+        self._set_state_ids(self.control.io_state_id, self.control.ana_level_id)
 
     @property
     def is_on(self) -> bool:
@@ -566,16 +547,30 @@ class X010VLight(IpxEntity, LightEntity):
         """Turn on the output."""
         if ATTR_BRIGHTNESS in kwargs:
             await self.control.set_level(scaleto100(kwargs[ATTR_BRIGHTNESS]))
+            await self.async_after_command()
         else:
             await self.control.on()
-        await self.coordinator.async_request_refresh()
+            await self.async_after_command({self.control.io_state_id: {"on": True}})
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the output."""
         await self.control.off()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command({self.control.io_state_id: {"on": False}})
 
     async def async_toggle(self, **kwargs: Any) -> None:
         """Toggle the output."""
         await self.control.toggle()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command(
+            {self.control.io_state_id: {"on": not self.is_on}}
+        )
+
+
+ENTITY_CLASSES: EntityClasses = {
+    IPX: (IpxLight,),
+    EXT_X8R: (X8RLight,),
+    EXT_XDIMMER: (XDimmerLight,),
+    (EXT_XPWM, None): (XPWMLight,),
+    (EXT_XPWM, TYPE_XPWM_RGB): (XPWMRGBLight,),
+    (EXT_XPWM, TYPE_XPWM_RGBW): (XPWMRGBWLight,),
+    EXT_X010V: (X010VLight,),
+}
@@ -1,9 +1,9 @@
 """Support for IPX800 V5 numbers."""
 
+from functools import partial
 import logging
 
 from pypx800v5 import (
-    IPX800,
     OBJECT_COUNTER,
     OBJECT_TEMPO,
     OBJECT_THERMOSTAT,
@@ -15,13 +15,15 @@ from pypx800v5 import (
 
 from homeassistant.components.number import NumberDeviceClass, NumberEntity, NumberMode
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_TYPE, EntityCategory, UnitOfTemperature, UnitOfTime
+from homeassistant.const import EntityCategory, UnitOfTemperature, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import CONF_DEVICES, CONF_EXT_TYPE, CONTROLLER, COORDINATOR, DOMAIN
+from .const import POLL_TIER_SLOW
+from .controller import IpxController
 from .entity import IpxEntity
+from .helpers import EntityClasses, IpxDeviceRecord, async_setup_platform_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,31 +34,9 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the IPX800 switches."""
-    controller = hass.data[DOMAIN][entry.entry_id][CONTROLLER]
-    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
-    devices = hass.data[DOMAIN][entry.entry_id][CONF_DEVICES]["number"]
-
-    entities: list[NumberEntity] = []
-
-    for device in devices:
-        if device.get(CONF_TYPE) == TYPE_ANA:
-            entities.append(AnalogNumber(device, controller, coordinator))
-        elif device[CONF_EXT_TYPE] == OBJECT_COUNTER:
-            entities.append(CounterNumber(device, controller, coordinator))
-        elif device[CONF_EXT_TYPE] == OBJECT_THERMOSTAT:
-            entities.append(
-                ThermostatParamNumber(device, controller, coordinator, param="Comfort")
-            )
-            entities.append(
-                ThermostatParamNumber(device, controller, coordinator, param="Eco")
-            )
-            entities.append(
-                ThermostatParamNumber(device, controller, coordinator, param="NoFrost")
-            )
-        elif device[CONF_EXT_TYPE] == OBJECT_TEMPO:
-            entities.append(TempoDelayNumber(device, controller, coordinator))
-
-    async_add_entities(entities, True)
+    async_setup_platform_entities(
+        hass, entry, "number", ENTITY_CLASSES, async_add_entities
+    )
 
 
 class AnalogNumber(IpxEntity, NumberEntity):
@@ -78,22 +58,29 @@ class CounterNumber(IpxEntity, NumberEntity):
     _attr_mode = NumberMode.BOX
     _attr_native_min_value = -21474836
     _attr_native_max_value = 21474836
+    _push_analog = True
 
     def __init__(
         self,
-        device_config: dict,
-        ipx: IPX800,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
         coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the RelaySwitch."""
         super().__init__(device_config, ipx, coordinator)
-        self.control = Counter(ipx, self._ext_number)
+        self.control = ipx.get_control(Counter, self._ext_number)
+        self._set_state_ids(self.control.ana_state_id, self.control.ana_step_id)
 
     @property
     def native_value(self) -> float:
         """Return the current value."""
         return float(self.coordinator.data[self.control.ana_state_id]["value"])
 
+    @property
+    def pushed_state_id(self) -> int:
+        """Return the counter value id, the step is never pushed."""
+        return self.control.ana_state_id
+
     @property
     def native_step(self) -> float:
         """Return the step value."""
@@ -117,8 +104,8 @@ class ThermostatParamNumber(IpxEntity, NumberEntity):
 
     def __init__(
         self,
-        device_config: dict,
-        ipx: IPX800,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
         coordinator: DataUpdateCoordinator,
         param: str,
     ) -> None:
@@ -126,7 +113,8 @@ class ThermostatParamNumber(IpxEntity, NumberEntity):
         super().__init__(
             device_config, ipx, coordinator, suffix_name=f"{param} Temperature"
         )
-        self.control = Thermostat(ipx, self._ext_number)
+        self.control = ipx.get_control(Thermostat, self._ext_number)
+        self._set_state_ids()
         self._param = param
         self._value = self.control.init_config[f"setPoint{param}"]
 
@@ -156,16 +144,18 @@ class TempoDelayNumber(IpxEntity, NumberEntity):
     _attr_mode = NumberMode.BOX
     _attr_entity_category = EntityCategory.CONFIG
     _attr_icon = "mdi:clock-time-two"
+    _poll_tier = POLL_TIER_SLOW
 
     def __init__(
         self,
-        device_config: dict,
-        ipx: IPX800,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
         coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the entity."""
         super().__init__(device_config, ipx, coordinator, suffix_name="Delay")
-        self.control = Tempo(ipx, self._ext_number)
+        self.control = ipx.get_control(Tempo, self._ext_number)
+        self._set_state_ids(self.control.ana_time_id)
 
     @property
     def native_value(self) -> int:
@@ -175,3 +165,15 @@ class TempoDelayNumber(IpxEntity, NumberEntity):
     async def async_set_native_value(self, value: float) -> None:
         """Update the current value."""
         await self.control.set_time(int(value))
+
+
+ENTITY_CLASSES: EntityClasses = {
+    TYPE_ANA: (AnalogNumber,),
+    OBJECT_COUNTER: (CounterNumber,),
+    OBJECT_THERMOSTAT: (
+        partial(ThermostatParamNumber, param="Comfort"),
+        partial(ThermostatParamNumber, param="Eco"),
+        partial(ThermostatParamNumber, param="NoFrost"),
+    ),
+    OBJECT_TEMPO: (TempoDelayNumber,),
+}
@@ -1,22 +1,36 @@
 """IPX800V5 request views to handle push information."""
 
 from base64 import b64decode
+from collections.abc import Iterable
 from http import HTTPStatus
 import logging
+from typing import Any
 
 from aiohttp import web
+from pypx800v5 import TYPE_ANA, TYPE_IO
 
 from homeassistant.components.http import HomeAssistantView
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.const import CONF_HOST
 from homeassistant.util import slugify
 
-from .const import PUSH_USERNAME
+from .const import (
+    CONF_PUSH_PASSWORD,
+    COORDINATOR,
+    DOMAIN,
+    ENTRY_CONFIG,
+    PUSH_ON_STATES,
+    PUSH_USERNAME,
+)
+from .coordinator import IpxDataUpdateCoordinator
+from .helpers import parse_ana_value
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def check_api_auth(request, host, push_password) -> bool:
-    """Check authentication on API call."""
+def check_api_auth(request, config: dict) -> bool:
+    """Check authentication on API call with the current entry configuration."""
+    host = config[CONF_HOST]
+    push_password = config.get(CONF_PUSH_PASSWORD)
     _LOGGER.debug(
         "Check API authentication from %s (expected %s)", request.remote, host
     )
@@ -38,16 +52,64 @@ def check_api_auth(request, host, push_password) -> bool:
     return True
 
 
+def get_entry_data(request: web.Request, entry_id: str) -> dict | None:
+    """Return the data of an entry, None while the entry isn't loaded.
+
+    Views are registered once and stay registered once their entry is
+    unloaded, so the coordinator and the configuration are looked up on each
+    request to get the ones of the reloaded entry.
+    """
+    return request.app["hass"].data.get(DOMAIN, {}).get(entry_id)
+
+
+def get_pushed_values(
+    coordinator: IpxDataUpdateCoordinator, entity_id: str, state: str
+) -> dict[int, dict] | None:
+    """Return the IO/ANA values of a state pushed for an entity.
+
+    None is returned when the entity doesn't translate the state, which is
+    then written as is to the state machine. A ValueError is raised for an
+    analog value that isn't a number.
+    """
+    if (entity := coordinator.subscriptions.get_entity(entity_id)) is None:
+        return None
+    return entity.get_pushed_values(state)
+
+
+def parse_pushed_items(items: Iterable[tuple[str, Any]]) -> dict[int, dict]:
+    """Return the IO/ANA values of pushed items keyed like `io/65` or `ana/12`.
+
+    A ValueError is raised when an item is malformed.
+    """
+    values: dict[int, dict] = {}
+    for key, value in items:
+        value_type, _, state_id = key.partition("/")
+        value = str(value)
+        if value_type == TYPE_IO:
+            values[int(state_id)] = {"on": value.lower() in PUSH_ON_STATES}
+        elif value_type == TYPE_ANA:
+            values[int(state_id)] = {"value": parse_ana_value(value)}
+        else:
+            raise ValueError(f"Unknown IPX800 value type: {value_type}")
+    return values
+
+
+def parse_pushed_ids(data: str) -> dict[int, dict]:
+    """Return the IO/ANA values of a push like `io/65=1&ana/12=23.4`."""
+    return parse_pushed_items(
+        id_data.partition("=")[::2] for id_data in data.split("&")
+    )
+
+
 class IpxRequestView(HomeAssistantView):
     """Provide a page for the device to call."""
 
     requires_auth = False
     name = "api:ipx800v5"
 
-    def __init__(self, host: str, password: str, ipx_name: str) -> None:
+    def __init__(self, ipx_name: str, entry_id: str) -> None:
         """Init the IPX view."""
-        self.host = host
-        self.password = password
+        self.entry_id = entry_id
         self.url = "/api/%s/{entity_id}/{state}" % slugify(ipx_name)
         self.extra_urls = [
             "/api/ipx800v5/{entity_id}/{state}"
@@ -63,8 +125,13 @@ class IpxRequestView(HomeAssistantView):
 
     async def get(self, request, entity_id, state):
         """Respond to requests from the device."""
-        if not check_api_auth(request, self.host, self.password):
+        if (entry_data := get_entry_data(request, self.entry_id)) is None:
+            return web.Response(status=HTTPStatus.SERVICE_UNAVAILABLE)
+        coordinator: IpxDataUpdateCoordinator = entry_data[COORDINATOR]
+        if not check_api_auth(request, entry_data[ENTRY_CONFIG]):
+            coordinator.async_push_failed()
             return web.Response(status=HTTPStatus.UNAUTHORIZED)
+        coordinator.async_push_received()
         # To be removed in next major version
         if "/api/ipx800v5/" in str(request.url) and "/api/ipx800v5/" not in self.url:
             _LOGGER.warning(
@@ -72,9 +139,17 @@ class IpxRequestView(HomeAssistantView):
                 str(request.url),
             )
         _LOGGER.debug("State update pushed from IPX")
+        _LOGGER.debug("Update %s to state %s", entity_id, state)
+        try:
+            values = get_pushed_values(coordinator, entity_id, state)
+        except ValueError:
+            _LOGGER.warning("Invalid value pushed for %s: %s", entity_id, state)
+            return web.Response(status=HTTPStatus.BAD_REQUEST)
+        if values:
+            coordinator.async_set_pushed(values)
+            return web.Response(status=HTTPStatus.OK, text="OK")
         hass = request.app["hass"]
         old_state = hass.states.get(entity_id)
-        _LOGGER.debug("Update %s to state %s", entity_id, state)
         if old_state:
             hass.states.async_set(entity_id, state, old_state.attributes)
             return web.Response(status=HTTPStatus.OK, text="OK")
@@ -88,10 +163,9 @@ class IpxRequestDataView(HomeAssistantView):
     requires_auth = False
     name = "api:ipx800v5_data"
 
-    def __init__(self, host: str, password: str, ipx_name: str) -> None:
+    def __init__(self, ipx_name: str, entry_id: str) -> None:
         """Init the IPX view."""
-        self.host = host
-        self.password = password
+        self.entry_id = entry_id
         self.url = "/api/%s_data/{data}" % slugify(ipx_name)
         self.extra_urls = ["/api/ipx800v5_data/{data}"]  # retrocompat
         _LOGGER.info("Dedicated push data url for '%s': '%s'", ipx_name, self.url)
@@ -105,8 +179,13 @@ class IpxRequestDataView(HomeAssistantView):
 
     async def get(self, request, data):
         """Respond to requests from the device."""
-        if not check_api_auth(request, self.host, self.password):
+        if (entry_data := get_entry_data(request, self.entry_id)) is None:
+            return web.Response(status=HTTPStatus.SERVICE_UNAVAILABLE)
+        coordinator: IpxDataUpdateCoordinator = entry_data[COORDINATOR]
+        if not check_api_auth(request, entry_data[ENTRY_CONFIG]):
+            coordinator.async_push_failed()
             return web.Response(status=HTTPStatus.UNAUTHORIZED)
+        coordinator.async_push_received()
         # To be removed in next major version
         if (
             "/api/ipx800v5_data/" in str(request.url)
@@ -118,18 +197,105 @@ class IpxRequestDataView(HomeAssistantView):
             )
         _LOGGER.debug("State update pushed from IPX")
         hass = request.app["hass"]
+        pushed_values: dict[int, dict] = {}
         entities_data = data.split("&")
         for entity_data in entities_data:
-            entity_id = entity_data.split("=")[0]
-            state = "on" if entity_data.split("=")[1] in ["1", "on", "true"] else "off"
+            entity_id, _, value = entity_data.partition("=")
+            _LOGGER.debug("Update %s to value %s", entity_id, value)
+            try:
+                values = get_pushed_values(coordinator, entity_id, value)
+            except ValueError:
+                _LOGGER.warning("Invalid value pushed for %s: %s", entity_id, value)
+                continue
+            if values:
+                pushed_values.update(values)
+                continue
 
+            # entities not translating the value only have an on/off state
+            state = "on" if value in PUSH_ON_STATES else "off"
             old_state = hass.states.get(entity_id)
-            _LOGGER.debug("Update %s to state %s", entity_id, state)
             if old_state:
                 hass.states.async_set(entity_id, state, old_state.attributes)
             else:
                 _LOGGER.warning("Entity not found for state updating: %s", entity_id)
 
+        if pushed_values:
+            coordinator.async_set_pushed(pushed_values)
+        return web.Response(status=HTTPStatus.OK, text="OK")
+
+
+class IpxRequestIdsView(HomeAssistantView):
+    """Provide a page for the device to push IO/ANA values by their ids."""
+
+    requires_auth = False
+    name = "api:ipx800v5_ids"
+
+    def __init__(self, ipx_name: str, entry_id: str) -> None:
+        """Init the IPX view."""
+        self.entry_id = entry_id
+        self.url = "/api/%s_ids/{data:.+}" % slugify(ipx_name)
+        _LOGGER.info("Dedicated push ids url for '%s': '%s'", ipx_name, self.url)
+        super().__init__()
+
+    async def get(self, request, data):
+        """Respond to requests from the device."""
+        if (entry_data := get_entry_data(request, self.entry_id)) is None:
+            return web.Response(status=HTTPStatus.SERVICE_UNAVAILABLE)
+        coordinator: IpxDataUpdateCoordinator = entry_data[COORDINATOR]
+        if not check_api_auth(request, entry_data[ENTRY_CONFIG]):
+            coordinator.async_push_failed()
+            return web.Response(status=HTTPStatus.UNAUTHORIZED)
+        coordinator.async_push_received()
+        try:
+            values = parse_pushed_ids(data)
+        except ValueError as err:
+            _LOGGER.warning("Malformed push data %s: %s", data, err)
+            return web.Response(status=HTTPStatus.BAD_REQUEST)
+        _LOGGER.debug("%s IO/ANA values pushed from IPX", len(values))
+        if coordinator.data:
+            coordinator.async_set_pushed(values)
+        return web.Response(status=HTTPStatus.OK, text="OK")
+
+
+class IpxRequestBulkView(HomeAssistantView):
+    """Provide a page for the device to post many IO/ANA values at once."""
+
+    requires_auth = False
+    name = "api:ipx800v5_bulk"
+
+    def __init__(self, ipx_name: str, entry_id: str) -> None:
+        """Init the IPX view."""
+        self.entry_id = entry_id
+        self.url = f"/api/{slugify(ipx_name)}_bulk"
+        _LOGGER.info("Dedicated push bulk url for '%s': '%s'", ipx_name, self.url)
+        super().__init__()
+
+    async def post(self, request):
+        """Respond to requests from the device.
+
+        The body is a JSON object or a form, keyed like the ids push.
+        """
+        if (entry_data := get_entry_data(request, self.entry_id)) is None:
+            return web.Response(status=HTTPStatus.SERVICE_UNAVAILABLE)
+        coordinator: IpxDataUpdateCoordinator = entry_data[COORDINATOR]
+        if not check_api_auth(request, entry_data[ENTRY_CONFIG]):
+            coordinator.async_push_failed()
+            return web.Response(status=HTTPStatus.UNAUTHORIZED)
+        coordinator.async_push_received()
+        try:
+            if request.content_type == "application/json":
+                body = await request.json()
+                if not isinstance(body, dict):
+                    raise ValueError("JSON body is not an object")
+                values = parse_pushed_items(body.items())
+            else:
+                values = parse_pushed_items((await request.post()).items())
+        except ValueError as err:
+            _LOGGER.warning("Malformed push body: %s", err)
+            return web.Response(status=HTTPStatus.BAD_REQUEST)
+        _LOGGER.debug("%s IO/ANA values pushed from IPX", len(values))
+        if coordinator.data:
+            coordinator.async_set_pushed(values)
         return web.Response(status=HTTPStatus.OK, text="OK")
 
 
@@ -139,17 +305,9 @@ class IpxRequestRefreshView(HomeAssistantView):
     requires_auth = False
     name = "api:ipx800v5_refresh"
 
-    def __init__(
-        self,
-        host: str,
-        password: str,
-        ipx_name: str,
-        coordinator: DataUpdateCoordinator,
-    ) -> None:
+    def __init__(self, ipx_name: str, entry_id: str) -> None:
         """Init the IPX view."""
-        self.host = host
-        self.password = password
-        self.coordinator = coordinator
+        self.entry_id = entry_id
         self.url = f"/api/{slugify(ipx_name)}_refresh"
         self.extra_urls = [
             "/api/ipx800v5_refresh",  # retrocompat
@@ -166,8 +324,13 @@ class IpxRequestRefreshView(HomeAssistantView):
 
     async def get(self, request):
         """Respond to requests from the device."""
-        if not check_api_auth(request, self.host, self.password):
+        if (entry_data := get_entry_data(request, self.entry_id)) is None:
+            return web.Response(status=HTTPStatus.SERVICE_UNAVAILABLE)
+        coordinator: IpxDataUpdateCoordinator = entry_data[COORDINATOR]
+        if not check_api_auth(request, entry_data[ENTRY_CONFIG]):
+            coordinator.async_push_failed()
             return web.Response(status=HTTPStatus.UNAUTHORIZED)
+        coordinator.async_push_received()
         # To be removed in next major version
         if (
             "/api/ipx800v5_refresh" in str(request.url)
@@ -178,7 +341,7 @@ class IpxRequestRefreshView(HomeAssistantView):
                 str(request.url),
             )
         _LOGGER.debug("Update asked from IPX PUSH")
-        await self.coordinator.async_request_refresh()
+        await coordinator.async_request_refresh()
         return web.Response(status=HTTPStatus.OK, text="OK")
 
 
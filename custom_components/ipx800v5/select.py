@@ -4,7 +4,7 @@ from collections.abc import Mapping
 import logging
 from typing import Any
 
-from pypx800v5 import EXT_XDISPLAY, IPX800, XDisplay
+from pypx800v5 import EXT_XDISPLAY, XDisplay
 
 from homeassistant.components.select import SelectEntity
 from homeassistant.config_entries import ConfigEntry
@@ -12,8 +12,9 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import CONF_DEVICES, CONF_EXT_TYPE, CONTROLLER, COORDINATOR, DOMAIN
+from .controller import IpxController
 from .entity import IpxEntity
+from .helpers import EntityClasses, IpxDeviceRecord, async_setup_platform_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,17 +25,9 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the IPX800 switches."""
-    controller = hass.data[DOMAIN][entry.entry_id][CONTROLLER]
-    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
-    devices = hass.data[DOMAIN][entry.entry_id][CONF_DEVICES]["select"]
-
-    entities: list[SelectEntity] = [
-        XDisplayScreenSelect(device, controller, coordinator)
-        for device in devices
-        if device[CONF_EXT_TYPE] == EXT_XDISPLAY
-    ]
-
-    async_add_entities(entities, True)
+    async_setup_platform_entities(
+        hass, entry, "select", ENTITY_CLASSES, async_add_entities
+    )
 
 
 class XDisplayScreenSelect(IpxEntity, SelectEntity):
@@ -42,13 +35,14 @@ class XDisplayScreenSelect(IpxEntity, SelectEntity):
 
     def __init__(
         self,
-        device_config: dict,
-        ipx: IPX800,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
         coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the X-Display screen select."""
         super().__init__(device_config, ipx, coordinator, suffix_name="Current screen")
-        self.control = XDisplay(ipx, self._ext_number)
+        self.control = ipx.get_control(XDisplay, self._ext_number)
+        self._set_state_ids(self.control.ana_current_screen_id)
         self._attr_icon = "mdi:overscan"
 
     @property
@@ -93,3 +87,8 @@ class XDisplayScreenSelect(IpxEntity, SelectEntity):
         """Call when entity is added to hass."""
         await self.control.refresh_screens()
         await super().async_added_to_hass()
+
+
+ENTITY_CLASSES: EntityClasses = {
+    EXT_XDISPLAY: (XDisplayScreenSelect,),
+}
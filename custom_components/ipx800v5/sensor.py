@@ -1,5 +1,6 @@
 """Support for IPX800 V5 sensors."""
 
+from functools import partial
 import logging
 
 import pypx800v5
@@ -7,7 +8,6 @@ from pypx800v5 import (
     EXT_XDISPLAY,
     EXT_XTHL,
     IPX,
-    IPX800,
     OBJECT_ACCESS_CONTROL,
     TYPE_ANA,
     XTHL,
@@ -22,20 +22,21 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
-    CONF_NAME,
-    CONF_TYPE,
     LIGHT_LUX,
     PERCENTAGE,
     EntityCategory,
     UnitOfTemperature,
+    UnitOfTime,
 )
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import CONF_DEVICES, CONF_EXT_TYPE, CONTROLLER, COORDINATOR, DOMAIN
+from .const import POLL_TIER_NORMAL, POLL_TIER_SLOW, TYPE_IPX_SCAN_INTERVAL
+from .controller import IpxController
 from .entity import IpxEntity
+from .helpers import EntityClasses, IpxDeviceRecord, async_setup_platform_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -46,68 +47,9 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the IPX800 sensors."""
-    controller = hass.data[DOMAIN][entry.entry_id][CONTROLLER]
-    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
-    devices = hass.data[DOMAIN][entry.entry_id][CONF_DEVICES]["sensor"]
-
-    entities: list[SensorEntity] = []
-
-    for device in devices:
-        if device.get(CONF_TYPE) == TYPE_ANA:
-            entities.append(AnalogSensor(device, controller, coordinator))
-        elif device[CONF_EXT_TYPE] == IPX:
-            entities.append(IpxAnalogInputSensor(device, controller, coordinator))
-        elif device[CONF_EXT_TYPE] == EXT_XTHL:
-            entities.append(
-                XTHLSensor(
-                    device,
-                    controller,
-                    coordinator,
-                    SensorDeviceClass.TEMPERATURE,
-                    UnitOfTemperature.CELSIUS,
-                    "TEMP",
-                    "Temperature",
-                    device[CONF_NAME],
-                )
-            )
-            entities.append(
-                XTHLSensor(
-                    device,
-                    controller,
-                    coordinator,
-                    SensorDeviceClass.HUMIDITY,
-                    PERCENTAGE,
-                    "HUM",
-                    "Humidity",
-                    device[CONF_NAME],
-                )
-            )
-            entities.append(
-                XTHLSensor(
-                    device,
-                    controller,
-                    coordinator,
-                    SensorDeviceClass.ILLUMINANCE,
-                    LIGHT_LUX,
-                    "LUM",
-                    "Luminance",
-                    device[CONF_NAME],
-                )
-            )
-        elif device[CONF_EXT_TYPE] == EXT_XDISPLAY:
-            entities.append(XDisplayAutoOffSensor(device, controller, coordinator))
-            entities.append(XDisplaySensitiveSensor(device, controller, coordinator))
-        elif device[CONF_EXT_TYPE] == OBJECT_ACCESS_CONTROL:
-            entities.append(
-                GenericAnalogSensor(
-                    device,
-                    controller,
-                    coordinator,
-                    pypx_object_name="AccessControl",
-                    pypx_property_name="last_code",
-                )
-            )
-    async_add_entities(entities, True)
+    async_setup_platform_entities(
+        hass, entry, "sensor", ENTITY_CLASSES, async_add_entities
+    )
 
 
 class GenericAnalogSensor(IpxEntity, SensorEntity):
@@ -115,8 +57,8 @@ class GenericAnalogSensor(IpxEntity, SensorEntity):
 
     def __init__(
         self,
-        device_config: dict,
-        ipx: IPX800,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
         coordinator: DataUpdateCoordinator,
         pypx_object_name: str,
         pypx_property_name: str,
@@ -125,8 +67,9 @@ class GenericAnalogSensor(IpxEntity, SensorEntity):
         """Initialize the analog sensor."""
         super().__init__(device_config, ipx, coordinator)
         pypx_object = getattr(pypx800v5, pypx_object_name)
-        self.control = pypx_object(ipx, self._ext_number)
+        self.control = ipx.get_control(pypx_object, self._ext_number)
         self._pypx_property_name = pypx_property_name
+        self._set_state_ids(getattr(self.control, pypx_property_name))
         self._attr_device_class = device_class
 
     @property
@@ -140,6 +83,8 @@ class GenericAnalogSensor(IpxEntity, SensorEntity):
 class AnalogSensor(IpxEntity, SensorEntity):
     """Representation of an analog as a sensor."""
 
+    _push_analog = True
+
     @property
     def native_value(self) -> float:
         """Return the current value."""
@@ -149,12 +94,18 @@ class AnalogSensor(IpxEntity, SensorEntity):
 class IpxAnalogInputSensor(IpxEntity, SensorEntity):
     """Representation of a IPX analog input as a sensor."""
 
+    _push_analog = True
+
     def __init__(
-        self, device_config: dict, ipx: IPX800, coordinator: DataUpdateCoordinator
+        self,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
+        coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the analog input sensor of the IPX800."""
         super().__init__(device_config, ipx, coordinator)
-        self.control = IPX800AnalogInput(ipx, self._io_number)
+        self.control = ipx.get_control(IPX800AnalogInput, self._io_number)
+        self._set_state_ids(self.control.ana_state_id)
 
     @property
     def native_value(self) -> float:
@@ -165,20 +116,24 @@ class IpxAnalogInputSensor(IpxEntity, SensorEntity):
 class XTHLSensor(IpxEntity, SensorEntity):
     """Representation of a X-THL sensor."""
 
+    _poll_tier = POLL_TIER_SLOW
+    _push_analog = True
+
     def __init__(
         self,
-        device_config: dict,
-        ipx: IPX800,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
         coordinator: DataUpdateCoordinator,
         device_class: SensorDeviceClass,
         unit_of_measurement: str,
         req_type: str,
         suffix_name: str,
-        device_name: str,
     ) -> None:
         """Initialize the X-THL sensor."""
-        super().__init__(device_config, ipx, coordinator, suffix_name, device_name)
-        self.control = XTHL(ipx, self._ext_number)
+        super().__init__(
+            device_config, ipx, coordinator, suffix_name, device_config.name
+        )
+        self.control = ipx.get_control(XTHL, self._ext_number)
         self._attr_device_class = device_class
         self._attr_native_unit_of_measurement = unit_of_measurement
         self._attr_state_class = SensorStateClass.MEASUREMENT
@@ -188,6 +143,7 @@ class XTHLSensor(IpxEntity, SensorEntity):
             self._state_id = self.control.hum_state_id
         elif req_type == "LUM":
             self._state_id = self.control.lum_state_id
+        self._set_state_ids(self._state_id)
 
     @property
     def native_value(self) -> float:
@@ -199,11 +155,15 @@ class XDisplayAutoOffSensor(IpxEntity, SensorEntity):
     """Representation of a X-Display auto off sensor."""
 
     def __init__(
-        self, device_config: dict, ipx: IPX800, coordinator: DataUpdateCoordinator
+        self,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
+        coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(device_config, ipx, coordinator, suffix_name="Auto off")
-        self.control = XDisplay(ipx, self._ext_number)
+        self.control = ipx.get_control(XDisplay, self._ext_number)
+        self._set_state_ids()
         self._attr_icon = "mdi:timer"
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
 
@@ -217,11 +177,15 @@ class XDisplaySensitiveSensor(IpxEntity, SensorEntity):
     """Representation of a X-Display auto off sensor."""
 
     def __init__(
-        self, device_config: dict, ipx: IPX800, coordinator: DataUpdateCoordinator
+        self,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
+        coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(device_config, ipx, coordinator, suffix_name="Sensitive")
-        self.control = XDisplay(ipx, self._ext_number)
+        self.control = ipx.get_control(XDisplay, self._ext_number)
+        self._set_state_ids()
         self._attr_icon = "mdi:fingerprint"
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
 
@@ -229,3 +193,62 @@ class XDisplaySensitiveSensor(IpxEntity, SensorEntity):
     def native_value(self) -> float:
         """Return the current value."""
         return self.control.sensitive
+
+
+class ScanIntervalSensor(IpxEntity, SensorEntity):
+    """Representation of the scan interval in effect with adaptive polling."""
+
+    def __init__(
+        self,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
+        coordinator: DataUpdateCoordinator,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(device_config, ipx, coordinator)
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_native_unit_of_measurement = UnitOfTime.SECONDS
+        self._attr_icon = "mdi:timer-sync"
+
+    @property
+    def native_value(self) -> float:
+        """Return the current scan interval."""
+        return self.coordinator.poll_intervals[POLL_TIER_NORMAL]
+
+
+ENTITY_CLASSES: EntityClasses = {
+    TYPE_ANA: (AnalogSensor,),
+    TYPE_IPX_SCAN_INTERVAL: (ScanIntervalSensor,),
+    IPX: (IpxAnalogInputSensor,),
+    EXT_XTHL: (
+        partial(
+            XTHLSensor,
+            device_class=SensorDeviceClass.TEMPERATURE,
+            unit_of_measurement=UnitOfTemperature.CELSIUS,
+            req_type="TEMP",
+            suffix_name="Temperature",
+        ),
+        partial(
+            XTHLSensor,
+            device_class=SensorDeviceClass.HUMIDITY,
+            unit_of_measurement=PERCENTAGE,
+            req_type="HUM",
+            suffix_name="Humidity",
+        ),
+        partial(
+            XTHLSensor,
+            device_class=SensorDeviceClass.ILLUMINANCE,
+            unit_of_measurement=LIGHT_LUX,
+            req_type="LUM",
+            suffix_name="Luminance",
+        ),
+    ),
+    EXT_XDISPLAY: (XDisplayAutoOffSensor, XDisplaySensitiveSensor),
+    OBJECT_ACCESS_CONTROL: (
+        partial(
+            GenericAnalogSensor,
+            pypx_object_name="AccessControl",
+            pypx_property_name="last_code",
+        ),
+    ),
+}
@@ -7,7 +7,6 @@ from pypx800v5 import (
     EXT_X8R,
     EXT_XDISPLAY,
     IPX,
-    IPX800,
     OBJECT_TEMPO,
     TYPE_IO,
     X8R,
@@ -19,20 +18,15 @@ from pypx800v5 import (
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_TYPE, EntityCategory
+from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import (
-    CONF_DEVICES,
-    CONF_EXT_TYPE,
-    CONTROLLER,
-    COORDINATOR,
-    DOMAIN,
-    TYPE_IPX_OPENCOLL,
-)
+from .const import TYPE_IPX_OPENCOLL
+from .controller import IpxController
 from .entity import IpxEntity
+from .helpers import EntityClasses, IpxDeviceRecord, async_setup_platform_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -43,29 +37,9 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the IPX800 switches."""
-    controller = hass.data[DOMAIN][entry.entry_id][CONTROLLER]
-    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
-    devices = hass.data[DOMAIN][entry.entry_id][CONF_DEVICES]["switch"]
-
-    entities: list[SwitchEntity] = []
-
-    for device in devices:
-        if device.get(CONF_TYPE) == TYPE_IO:
-            entities.append(IOSwitch(device, controller, coordinator))
-        elif device[CONF_EXT_TYPE] == IPX:
-            if device.get(CONF_TYPE) == TYPE_IPX_OPENCOLL:
-                entities.append(IpxOpenCollSwitch(device, controller, coordinator))
-            else:
-                entities.append(IpxSwitch(device, controller, coordinator))
-        elif device[CONF_EXT_TYPE] == EXT_X8R:
-            entities.append(X8RSwitch(device, controller, coordinator))
-        elif device[CONF_EXT_TYPE] == EXT_XDISPLAY:
-            entities.append(XDisplayScreenStateSwitch(device, controller, coordinator))
-            entities.append(XDisplayScreenLockSwitch(device, controller, coordinator))
-        elif device[CONF_EXT_TYPE] == OBJECT_TEMPO:
-            entities.append(TempoEnableSwitch(device, controller, coordinator))
-
-    async_add_entities(entities, True)
+    async_setup_platform_entities(
+        hass, entry, "switch", ENTITY_CLASSES, async_add_entities
+    )
 
 
 class IOSwitch(IpxEntity, SwitchEntity):
@@ -79,17 +53,17 @@ class IOSwitch(IpxEntity, SwitchEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the switch."""
         await self.ipx.update_io(self._io_id, True)
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command({self._io_id: {"on": True}})
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the switch."""
         await self.ipx.update_io(self._io_id, False)
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command({self._io_id: {"on": False}})
 
     async def async_toggle(self, **kwargs: Any) -> None:
         """Toggle the switch."""
         await self.ipx.update_io(self._io_id, True, "toggle")
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command({self._io_id: {"on": not self.is_on}})
 
 
 class IpxSwitch(IpxEntity, SwitchEntity):
@@ -97,13 +71,14 @@ class IpxSwitch(IpxEntity, SwitchEntity):
 
     def __init__(
         self,
-        device_config: dict,
-        ipx: IPX800,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
         coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the RelaySwitch."""
         super().__init__(device_config, ipx, coordinator)
-        self.control = IPX800Relay(ipx, self._io_number)
+        self.control = ipx.get_control(IPX800Relay, self._io_number)
+        self._set_state_ids(self.control.io_state_id)
 
     @property
     def is_on(self) -> bool:
@@ -113,17 +88,19 @@ class IpxSwitch(IpxEntity, SwitchEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the switch."""
         await self.control.on()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command({self.control.io_state_id: {"on": True}})
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the switch."""
         await self.control.off()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command({self.control.io_state_id: {"on": False}})
 
     async def async_toggle(self, **kwargs: Any) -> None:
         """Toggle the switch."""
         await self.control.toggle()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command(
+            {self.control.io_state_id: {"on": not self.is_on}}
+        )
 
 
 class IpxOpenCollSwitch(IpxEntity, SwitchEntity):
@@ -131,13 +108,14 @@ class IpxOpenCollSwitch(IpxEntity, SwitchEntity):
 
     def __init__(
         self,
-        device_config: dict,
-        ipx: IPX800,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
         coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the RelaySwitch."""
         super().__init__(device_config, ipx, coordinator)
-        self.control = IPX800OpenColl(ipx, self._io_number)
+        self.control = ipx.get_control(IPX800OpenColl, self._io_number)
+        self._set_state_ids(self.control.io_state_id)
 
     @property
     def is_on(self) -> bool:
@@ -147,17 +125,19 @@ class IpxOpenCollSwitch(IpxEntity, SwitchEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the switch."""
         await self.control.on()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command({self.control.io_state_id: {"on": True}})
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the switch."""
         await self.control.off()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command({self.control.io_state_id: {"on": False}})
 
     async def async_toggle(self, **kwargs: Any) -> None:
         """Toggle the switch."""
         await self.control.toggle()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command(
+            {self.control.io_state_id: {"on": not self.is_on}}
+        )
 
 
 class X8RSwitch(IpxEntity, SwitchEntity):
@@ -165,13 +145,14 @@ class X8RSwitch(IpxEntity, SwitchEntity):
 
     def __init__(
         self,
-        device_config: dict,
-        ipx: IPX800,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
         coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the RelaySwitch."""
         super().__init__(device_config, ipx, coordinator)
-        self.control = X8R(ipx, self._ext_number, self._io_number)
+        self.control = ipx.get_control(X8R, self._ext_number, self._io_number)
+        self._set_state_ids(self.control.io_state_id)
 
     @property
     def is_on(self) -> bool:
@@ -181,17 +162,19 @@ class X8RSwitch(IpxEntity, SwitchEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the switch."""
         await self.control.on()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command({self.control.io_state_id: {"on": True}})
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the switch."""
         await self.control.off()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command({self.control.io_state_id: {"on": False}})
 
     async def async_toggle(self, **kwargs: Any) -> None:
         """Toggle the switch."""
         await self.control.toggle()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command(
+            {self.control.io_state_id: {"on": not self.is_on}}
+        )
 
 
 class XDisplayScreenStateSwitch(IpxEntity, SwitchEntity):
@@ -199,19 +182,26 @@ class XDisplayScreenStateSwitch(IpxEntity, SwitchEntity):
 
     def __init__(
         self,
-        device_config: dict,
-        ipx: IPX800,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
         coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the switch."""
         super().__init__(device_config, ipx, coordinator, suffix_name="Screen state")
-        self.control = XDisplay(ipx, self._ext_number)
+        self.control = ipx.get_control(XDisplay, self._ext_number)
+        self._set_state_ids(self.control.io_on_screen_id)
 
     @property
     def is_on(self) -> bool:
         """Return the state."""
         return self.coordinator.data[self.control.io_on_screen_id]["on"] is not True
 
+    def get_pushed_values(self, state: str) -> dict[int, dict] | None:
+        """Return the screen IO value, which is on while the screen is off."""
+        if (values := super().get_pushed_values(state)) is None:
+            return None
+        return {state_id: {"on": not value["on"]} for state_id, value in values.items()}
+
     @property
     def icon(self) -> str:
         """Return icon according to state."""
@@ -222,17 +212,19 @@ class XDisplayScreenStateSwitch(IpxEntity, SwitchEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the switch."""
         await self.control.screen_on()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command({self.control.io_on_screen_id: {"on": False}})
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the switch."""
         await self.control.screen_off()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command({self.control.io_on_screen_id: {"on": True}})
 
     async def async_toggle(self, **kwargs: Any) -> None:
         """Toggle the switch."""
         await self.control.screen_toggle()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command(
+            {self.control.io_on_screen_id: {"on": self.is_on}}
+        )
 
 
 class XDisplayScreenLockSwitch(IpxEntity, SwitchEntity):
@@ -240,13 +232,14 @@ class XDisplayScreenLockSwitch(IpxEntity, SwitchEntity):
 
     def __init__(
         self,
-        device_config: dict,
-        ipx: IPX800,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
         coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the switch."""
         super().__init__(device_config, ipx, coordinator, suffix_name="Screen lock")
-        self.control = XDisplay(ipx, self._ext_number)
+        self.control = ipx.get_control(XDisplay, self._ext_number)
+        self._set_state_ids(self.control.io_lock_screen_id)
 
     @property
     def is_on(self) -> bool:
@@ -263,17 +256,19 @@ class XDisplayScreenLockSwitch(IpxEntity, SwitchEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the switch."""
         await self.control.screen_lock()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command({self.control.io_lock_screen_id: {"on": True}})
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the switch."""
         await self.control.screen_unlock()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command({self.control.io_lock_screen_id: {"on": False}})
 
     async def async_toggle(self, **kwargs: Any) -> None:
         """Toggle the switch."""
         await self.control.screen_toggle_lock()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command(
+            {self.control.io_lock_screen_id: {"on": not self.is_on}}
+        )
 
 
 class TempoEnableSwitch(IpxEntity, SwitchEntity):
@@ -281,13 +276,14 @@ class TempoEnableSwitch(IpxEntity, SwitchEntity):
 
     def __init__(
         self,
-        device_config: dict,
-        ipx: IPX800,
+        device_config: IpxDeviceRecord,
+        ipx: IpxController,
         coordinator: DataUpdateCoordinator,
     ) -> None:
         """Initialize the RelaySwitch."""
         super().__init__(device_config, ipx, coordinator, suffix_name="Enable")
-        self.control = Tempo(ipx, self._ext_number)
+        self.control = ipx.get_control(Tempo, self._ext_number)
+        self._set_state_ids(self.control.io_enabled_id)
         self._attr_icon = "mdi:toggle-switch"
         self._attr_entity_category = EntityCategory.CONFIG
 
@@ -299,9 +295,19 @@ class TempoEnableSwitch(IpxEntity, SwitchEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the switch."""
         await self.control.on()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command({self.control.io_enabled_id: {"on": True}})
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the switch."""
         await self.control.off()
-        await self.coordinator.async_request_refresh()
+        await self.async_after_command({self.control.io_enabled_id: {"on": False}})
+
+
+ENTITY_CLASSES: EntityClasses = {
+    TYPE_IO: (IOSwitch,),
+    (IPX, TYPE_IPX_OPENCOLL): (IpxOpenCollSwitch,),
+    IPX: (IpxSwitch,),
+    EXT_X8R: (X8RSwitch,),
+    EXT_XDISPLAY: (XDisplayScreenStateSwitch, XDisplayScreenLockSwitch),
+    OBJECT_TEMPO: (TempoEnableSwitch,),
+}
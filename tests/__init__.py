@@ -0,0 +1 @@
+"""Tests for the GCE IPX800 V5 integration."""
@@ -0,0 +1,158 @@
+"""Fixtures for the IPX800 V5 tests."""
+
+import asyncio
+from typing import Any
+from unittest.mock import patch
+
+from pypx800v5 import IPX800CannotConnectError, IPX800RequestError
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ipx800v5.const import CONF_DEVICES, DOMAIN
+from homeassistant.const import CONF_API_KEY, CONF_HOST, CONF_NAME, CONF_PORT
+
+MAC_ADDRESS = "00:04:a3:00:00:01"
+
+# ids of the IPX800 IO/ANA by config key, as returned with the filter_id option
+IPX_CONFIG = {
+    "ioRelayState_id": list(range(1, 9)),
+    "ioRelays_id": list(range(101, 109)),
+    "ioCollOutputState_id": list(range(11, 15)),
+    "ioCollOutput_id": list(range(111, 115)),
+    "ioDInput_id": list(range(21, 29)),
+    "ioCollInput_id": list(range(31, 35)),
+    "ana_IPX_Input": list(range(41, 45)),
+}
+
+
+class FakeIpxApi:
+    """Answer the IPX800 API requests and record them."""
+
+    def __init__(self, latency: float = 0) -> None:
+        """Initialize the API with every IO off and every ANA at 0."""
+        self.latency = latency
+        self.requests: list[tuple[str, str]] = []
+        # start and end of the requests, in order
+        self.events: list[tuple[str, str, str]] = []
+        self.failing_paths: set[str] = set()
+        self.offline = False
+        self.running = 0
+        self.max_running = 0
+        self.ipx_config: dict[str, Any] = dict(IPX_CONFIG)
+        self.extensions: dict[str, list] = {}
+        self.objects: dict[str, list] = {}
+        self.io: dict[int, dict] = {}
+        self.ana: dict[int, dict] = {}
+        for key, ids in IPX_CONFIG.items():
+            for state_id in ids:
+                if key.startswith("io"):
+                    self.io[state_id] = {"_id": state_id, "on": False}
+                else:
+                    self.ana[state_id] = {"_id": state_id, "value": 0}
+
+    def add_extensions(
+        self, ext_type: str, count: int, io_key: str, io_count: int
+    ) -> None:
+        """Add extensions of a type, each with IO read through a config key."""
+        extensions = self.extensions.setdefault(ext_type, [])
+        for _ in range(count):
+            first_id = max(self.io, default=0) + 1
+            io_ids = list(range(first_id, first_id + io_count))
+            extensions.append(
+                {
+                    "_id": 1000 + len(extensions),
+                    "name": f"{ext_type} {len(extensions) + 1}",
+                    io_key: io_ids,
+                }
+            )
+            for state_id in io_ids:
+                self.io[state_id] = {"_id": state_id, "on": False}
+
+    def count(self, path: str | None = None, method: str = "GET") -> int:
+        """Return the number of requests, of a path when given."""
+        return sum(
+            1
+            for request_method, request_path in self.requests
+            if request_method == method and path in (None, request_path)
+        )
+
+    async def request_api(
+        self,
+        path: str,
+        data: dict | None = None,
+        params: dict | None = None,
+        method: str = "GET",
+    ) -> Any:
+        """Answer a request to the IPX800 API."""
+        self.requests.append((method, path))
+        self.events.append(("start", method, path))
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.latency)
+            if self.offline:
+                raise IPX800CannotConnectError("Timeout occurred while connecting")
+            if path in self.failing_paths:
+                raise IPX800RequestError(f"IPX800 API request error 400: {path}")
+            return self._answer(path, data, method)
+        finally:
+            self.running -= 1
+            self.events.append(("end", method, path))
+
+    def _answer(self, path: str, data: dict | None, method: str) -> Any:
+        """Return the response of a request."""
+        if path == "system/info":
+            return {
+                "firmwareVersion": "5.6.1",
+                "macAdress": MAC_ADDRESS,
+                "hostName": "ipx800",
+            }
+        if path == "system/ipx":
+            return self.ipx_config
+        category, _, name = path.partition("/")
+        if category == "ebx":
+            return self.extensions.get(name, [])
+        if category == "object":
+            return self.objects.get(name, [])
+        value_type, _, state_id = name.partition("/")
+        table = self.io if value_type == "io" else self.ana
+        if not state_id:
+            return [dict(value) for value in table.values()]
+        if method == "PUT":
+            table[int(state_id)] |= data
+        return dict(table[int(state_id)])
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Enable the custom integrations in every test."""
+    return
+
+
+@pytest.fixture
+def ipx_api() -> FakeIpxApi:
+    """Patch the IPX800 API requests with a fake IPX800."""
+    api = FakeIpxApi()
+    with patch(
+        "custom_components.ipx800v5.controller.IpxController.request_api",
+        side_effect=api.request_api,
+    ):
+        yield api
+
+
+@pytest.fixture
+def config_entry() -> MockConfigEntry:
+    """Return an entry created from the UI, without options."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        source="user",
+        title="192.168.1.240",
+        unique_id=f"{DOMAIN}, 192.168.1.240",
+        data={
+            CONF_NAME: "IPX800 V5",
+            CONF_HOST: "192.168.1.240",
+            CONF_PORT: 80,
+            CONF_API_KEY: "apikey",
+            CONF_DEVICES: [],
+        },
+    )
@@ -0,0 +1,158 @@
+"""Tests for the IPX800 V5 API client."""
+
+import asyncio
+import logging
+from time import perf_counter
+
+from pypx800v5 import EXT_X8R, IPX800, IPX800Relay, IPX800RequestError
+import pytest
+
+from custom_components.ipx800v5.const import COMMAND_BATCH_CONCURRENCY
+from custom_components.ipx800v5.controller import IpxController
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .conftest import FakeIpxApi
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _get_controller(hass: HomeAssistant) -> IpxController:
+    """Return a controller of the fake IPX800."""
+    return IpxController(
+        host="192.168.1.240",
+        port=80,
+        api_key="apikey",
+        session=async_get_clientsession(hass),
+    )
+
+
+async def test_init_config_concurrency(
+    hass: HomeAssistant, ipx_api: FakeIpxApi
+) -> None:
+    """Test the configuration requests share a single limit of parallel requests."""
+    ipx = _get_controller(hass)
+
+    await ipx.init_config()
+
+    assert ipx_api.count() > COMMAND_BATCH_CONCURRENCY
+    assert ipx_api.max_running == COMMAND_BATCH_CONCURRENCY
+
+
+async def test_controls_kept_for_same_config(
+    hass: HomeAssistant, ipx_api: FakeIpxApi
+) -> None:
+    """Test the control objects are only built again for a new configuration."""
+    ipx = _get_controller(hass)
+    await ipx.init_config()
+    control = ipx.get_control(IPX800Relay, 1)
+
+    await ipx.update_extensions_and_objects_config()
+    assert ipx.get_control(IPX800Relay, 1) is control
+
+    ipx_api.add_extensions(EXT_X8R, 1, "ioOutput_id", 8)
+    await ipx.update_extensions_and_objects_config()
+    assert ipx.get_control(IPX800Relay, 1) is not control
+
+
+async def test_write_errors(hass: HomeAssistant, ipx_api: FakeIpxApi) -> None:
+    """Test each caller of a batch gets the result of its own write."""
+    ipx = _get_controller(hass)
+    ipx_api.failing_paths.add("core/io/2")
+
+    results = await asyncio.gather(
+        ipx.update_io(1, True),
+        ipx.update_io(2, True),
+        ipx.update_io(3, True),
+        return_exceptions=True,
+    )
+
+    assert results[0] is None
+    assert isinstance(results[1], IPX800RequestError)
+    assert results[2] is None
+    assert ipx_api.count(method="PUT") == 3
+
+
+async def test_writes_of_an_id_in_order(
+    hass: HomeAssistant, ipx_api: FakeIpxApi
+) -> None:
+    """Test a write queued while the previous batch is sent waits for it."""
+    ipx_api.latency = 0.05
+    ipx = _get_controller(hass)
+
+    first = hass.async_create_task(ipx.update_io(1, True))
+    # the first batch is being sent
+    await asyncio.sleep(0.03)
+    assert ipx_api.running == 1
+    await asyncio.gather(first, ipx.update_io(1, False))
+
+    assert ipx_api.events == [
+        ("start", "PUT", "core/io/1"),
+        ("end", "PUT", "core/io/1"),
+        ("start", "PUT", "core/io/1"),
+        ("end", "PUT", "core/io/1"),
+    ]
+    assert ipx_api.io[1]["on"] is False
+
+
+async def test_cancel_writes(hass: HomeAssistant, ipx_api: FakeIpxApi) -> None:
+    """Test the callers of cancelled writes get an error."""
+    ipx_api.latency = 0.05
+    ipx = _get_controller(hass)
+
+    sent = hass.async_create_task(ipx.update_io(1, True))
+    await asyncio.sleep(0.03)
+    queued = hass.async_create_task(ipx.update_io(2, True))
+    await asyncio.sleep(0)
+    await ipx.async_cancel_writes()
+
+    for write in (sent, queued):
+        with pytest.raises(IPX800RequestError):
+            await write
+
+
+@pytest.mark.parametrize("outputs", [8, 32, 64])
+async def test_scene_benchmark(
+    hass: HomeAssistant, ipx_api: FakeIpxApi, outputs: int
+) -> None:
+    """Benchmark a scene writing outputs twice, such as a scene and a group.
+
+    The batched writes are compared with one request per write, as before.
+    """
+    ipx_api.latency = 0.005
+    ipx_api.add_extensions(EXT_X8R, 8, "ioOutput_id", 8)
+    state_ids = list(ipx_api.io)[-outputs:]
+    ipx = _get_controller(hass)
+
+    results = {}
+    for name, update_io in (
+        ("unbatched", lambda state_id, value: IPX800.update_io(ipx, state_id, value)),
+        ("batched", ipx.update_io),
+    ):
+        ipx_api.requests.clear()
+        ipx_api.max_running = 0
+        started_at = perf_counter()
+        await asyncio.gather(
+            *(
+                update_io(state_id, value)
+                for value in (False, True)
+                for state_id in state_ids
+            )
+        )
+        results[name] = (
+            perf_counter() - started_at,
+            ipx_api.count(method="PUT"),
+            ipx_api.max_running,
+        )
+        _LOGGER.info(
+            "%s outputs %s: %.1f ms, %s requests, %s in parallel",
+            outputs,
+            name,
+            results[name][0] * 1000,
+            results[name][1],
+            results[name][2],
+        )
+
+    assert results["unbatched"][1:] == (2 * outputs, 2 * outputs)
+    assert results["batched"][1:] == (outputs, min(outputs, COMMAND_BATCH_CONCURRENCY))
+    assert all(ipx_api.io[state_id]["on"] for state_id in state_ids)
@@ -0,0 +1,182 @@
+"""Tests for the IPX800 V5 data update coordinator."""
+
+import asyncio
+import logging
+from time import perf_counter
+from unittest.mock import patch
+
+from pypx800v5 import EXT_X24D
+
+from custom_components.ipx800v5.const import (
+    COORDINATOR,
+    DOMAIN,
+    PARTIAL_POLLING_CONCURRENCY,
+    PARTIAL_POLLING_MAX_IDS,
+    POLL_TIER_NORMAL,
+)
+from custom_components.ipx800v5.controller import IpxController
+from custom_components.ipx800v5.coordinator import (
+    IpxDataUpdateCoordinator,
+    get_changed_state_ids,
+)
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.entity import Entity
+
+from .conftest import FakeIpxApi
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def _async_setup(hass: HomeAssistant, config_entry) -> None:
+    """Set up the entry and wait for its entities."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+
+def _get_controller(hass: HomeAssistant) -> IpxController:
+    """Return a controller of the fake IPX800."""
+    return IpxController(
+        host="192.168.1.240",
+        port=80,
+        api_key="apikey",
+        session=async_get_clientsession(hass),
+    )
+
+
+def _track_state_writes(hass: HomeAssistant) -> list[str]:
+    """Return the list the entity ids of the next state writes are added to."""
+    writes: list[str] = []
+    hass.bus.async_listen(
+        EVENT_STATE_CHANGED, lambda event: writes.append(event.data["entity_id"])
+    )
+    return writes
+
+
+async def test_poll_updates_changed_entities(
+    hass: HomeAssistant, ipx_api: FakeIpxApi, config_entry
+) -> None:
+    """Test a poll only writes the state of the entities whose IO changed."""
+    await _async_setup(hass, config_entry)
+    coordinator = hass.data[DOMAIN][config_entry.entry_id][COORDINATOR]
+    writes = _track_state_writes(hass)
+
+    ipx_api.io[1]["on"] = True
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert writes == ["switch.ipx800_v5_relais_1"]
+    assert hass.states.get("switch.ipx800_v5_relais_1").state == "on"
+
+
+async def test_partial_polling_requests(
+    hass: HomeAssistant, ipx_api: FakeIpxApi
+) -> None:
+    """Test the requests of a partial poll and their limit of parallel requests."""
+    ipx_api.latency = 0.01
+    coordinator = IpxDataUpdateCoordinator(
+        hass,
+        _get_controller(hass),
+        "IPX800 V5",
+        {POLL_TIER_NORMAL: 15},
+        partial_polling=True,
+    )
+    await coordinator.async_refresh()
+    assert ipx_api.count() == 2
+
+    io_ids = set(ipx_api.io)
+    ana_ids = set(ipx_api.ana)
+    ipx_api.requests.clear()
+    data = await coordinator._async_fetch_state_ids(io_ids | ana_ids)
+    # 24 IO are read with their table, the 4 ANA one by one
+    assert ipx_api.count("core/io") == 1
+    assert ipx_api.count() == 1 + len(ana_ids)
+    assert data == coordinator.data
+
+    ipx_api.requests.clear()
+    ipx_api.max_running = 0
+    await coordinator._async_fetch_state_ids(
+        set(list(io_ids)[:PARTIAL_POLLING_MAX_IDS]) | ana_ids
+    )
+    assert ipx_api.count() == PARTIAL_POLLING_MAX_IDS + len(ana_ids)
+    assert ipx_api.max_running == PARTIAL_POLLING_CONCURRENCY
+
+
+async def test_optimistic_verification_keeps_pushes(
+    hass: HomeAssistant, ipx_api: FakeIpxApi
+) -> None:
+    """Test the read back of optimistic values keeps the values pushed meanwhile."""
+    ipx_api.latency = 0.01
+    coordinator = IpxDataUpdateCoordinator(
+        hass,
+        _get_controller(hass),
+        "IPX800 V5",
+        {POLL_TIER_NORMAL: 15},
+        optimistic=True,
+    )
+    await coordinator.async_refresh()
+
+    # the IPX800 doesn't apply the commands
+    coordinator.async_set_optimistic({1: {"on": True}, 2: {"on": True}})
+    verification = hass.async_create_task(coordinator._async_verify_optimistic())
+    await asyncio.sleep(0)
+    coordinator.async_set_pushed({1: {"on": True}, 3: {"on": True}})
+    await verification
+
+    assert coordinator.data[1]["on"] is True
+    assert coordinator.data[2]["on"] is False
+    assert coordinator.data[3]["on"] is True
+
+
+async def test_poll_dispatch_benchmark(
+    hass: HomeAssistant, ipx_api: FakeIpxApi, config_entry
+) -> None:
+    """Benchmark the dispatch of a poll changing 10 IO to 1000 entities.
+
+    The previous behavior, where every entity is written on each poll, is
+    measured as a dispatch to every listener.
+    """
+    ipx_api.add_extensions(EXT_X24D, 41, "ioInput_id", 24)
+    await _async_setup(hass, config_entry)
+    coordinator = hass.data[DOMAIN][config_entry.entry_id][COORDINATOR]
+    entities = len(hass.states.async_all())
+    assert entities >= 1000
+
+    previous = coordinator.data
+    for state_id in list(ipx_api.io)[-10:]:
+        ipx_api.io[state_id]["on"] = True
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    current = coordinator.data
+
+    durations: dict[str, float] = {}
+    state_writes: dict[str, int] = {}
+    for dispatch in ("changed ids", "full"):
+        with patch.object(
+            Entity,
+            "async_write_ha_state",
+            autospec=True,
+            side_effect=Entity.async_write_ha_state,
+        ) as write_ha_state:
+            started_at = perf_counter()
+            coordinator.changed_ids = (
+                get_changed_state_ids(previous, current)
+                if dispatch == "changed ids"
+                else None
+            )
+            coordinator.async_update_listeners()
+            durations[dispatch] = perf_counter() - started_at
+        state_writes[dispatch] = write_ha_state.call_count
+
+    _LOGGER.info(
+        "%s entities, changed ids dispatch: %.2f ms, full dispatch: %.2f ms",
+        entities,
+        durations["changed ids"] * 1000,
+        durations["full"] * 1000,
+    )
+    # entities without IO/ANA ids, such as the reboot button, are always written
+    unfiltered = len(coordinator.subscriptions.get_entities(()))
+    assert state_writes == {"changed ids": 10 + unfiltered, "full": entities}
+    assert durations["changed ids"] < durations["full"]
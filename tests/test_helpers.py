@@ -0,0 +1,191 @@
+"""Tests for the helpers building the IPX800 V5 entities."""
+
+import copy
+import logging
+import random
+from time import perf_counter
+
+from pypx800v5 import (
+    EXT_X8R,
+    EXT_X24D,
+    EXT_XTHL,
+    IPX,
+    OBJECT_COUNTER,
+    OBJECT_TEMPO,
+    TYPE_ANA,
+    TYPE_IO,
+)
+
+from custom_components.ipx800v5.const import (
+    CONF_COMPONENT,
+    CONF_EXT_NAME,
+    CONF_EXT_NUMBER,
+    CONF_EXT_TYPE,
+    CONF_IO_NUMBER,
+    CONF_IO_NUMBERS,
+)
+from custom_components.ipx800v5.helpers import (
+    SINGLE_DEVICE_TYPES,
+    DevicesConfigIndex,
+    remove_duplicate_entities,
+)
+from homeassistant.const import CONF_NAME, CONF_TYPE
+
+_LOGGER = logging.getLogger(__name__)
+
+EXT_TYPES = [IPX, EXT_X8R, EXT_X24D, EXT_XTHL, OBJECT_TEMPO, OBJECT_COUNTER]
+COMPONENTS = ["light", "switch", "binary_sensor", "sensor"]
+
+
+def _get_device_linear(
+    devices_config: list, device_auto: dict, use_device_name_as_ext_name: bool = False
+) -> dict:
+    """Match a device config with a scan of the list, as done before the index."""
+    device = None
+    found_devices = [
+        device_conf
+        for device_conf in devices_config
+        if str(device_conf[CONF_EXT_TYPE]) == str(device_auto[CONF_EXT_TYPE])
+        and int(device_conf[CONF_EXT_NUMBER]) == int(device_auto[CONF_EXT_NUMBER])
+        and (
+            str(device_conf[CONF_COMPONENT]) == str(device_auto[CONF_COMPONENT])
+            or (
+                str(device_auto[CONF_EXT_TYPE]) in [IPX, EXT_X8R]
+                and str(device_auto[CONF_COMPONENT]) in ["light", "switch"]
+                and str(device_conf[CONF_COMPONENT]) in ["light", "switch"]
+            )
+        )
+        and (device_conf.get(CONF_TYPE) == device_auto.get(CONF_TYPE))
+    ]
+    for device_config in found_devices:
+        if (
+            device_config[CONF_EXT_TYPE] in SINGLE_DEVICE_TYPES
+            and len(found_devices) == 1
+        ):
+            device = device_config
+            break
+        if CONF_IO_NUMBER in device_auto and CONF_IO_NUMBER in device_config:
+            if device_config[CONF_IO_NUMBER] == device_auto[CONF_IO_NUMBER]:
+                device = device_config
+                break
+        elif CONF_IO_NUMBERS in device_auto and CONF_IO_NUMBERS in device_config:
+            if device_config[CONF_IO_NUMBERS] == device_auto[CONF_IO_NUMBERS]:
+                device = device_config
+                break
+    if device is not None:
+        if use_device_name_as_ext_name:
+            device[CONF_EXT_NAME] = device[CONF_NAME]
+        elif CONF_EXT_NAME not in device:
+            device[CONF_EXT_NAME] = device_auto.get(CONF_EXT_NAME, device[CONF_NAME])
+        return dict(device)
+    return device_auto
+
+
+def _build_entities_linear(
+    devices_config: list, devices_auto: list, use_device_name: list[bool]
+) -> list:
+    """Build the entities as done before the index, mutating the devices config."""
+    auto_entities = [
+        _get_device_linear(devices_config, device, use_name)
+        for device, use_name in zip(devices_auto, use_device_name, strict=True)
+    ]
+    filtered_auto_entities = list(auto_entities)
+    for entity in auto_entities:
+        entity["original"] = True
+        config = _get_device_linear(devices_config, entity)
+        if "original" not in config:
+            filtered_auto_entities.remove(entity)
+    for entity in filtered_auto_entities:
+        del entity["original"]
+    return [*devices_config, *filtered_auto_entities]
+
+
+def _random_device(rng: random.Random, name: str, ext_numbers: int) -> dict:
+    """Return a device config with random keys."""
+    device = {
+        CONF_NAME: name,
+        CONF_EXT_TYPE: rng.choice(EXT_TYPES),
+        CONF_EXT_NUMBER: rng.randrange(ext_numbers),
+        CONF_COMPONENT: rng.choice(COMPONENTS),
+    }
+    if rng.random() < 0.5:
+        device[CONF_TYPE] = rng.choice([TYPE_IO, TYPE_ANA])
+    if rng.random() < 0.8:
+        device[CONF_IO_NUMBER] = rng.randint(1, 24)
+    if rng.random() < 0.3:
+        device[CONF_IO_NUMBERS] = [rng.randint(1, 4), rng.randint(1, 4)]
+    if rng.random() < 0.2:
+        device[CONF_EXT_NAME] = f"{name} extension"
+    return device
+
+
+def _random_devices(
+    rng: random.Random, count: int, prefix: str, ext_numbers: int
+) -> list[dict]:
+    """Return random device configs."""
+    return [
+        _random_device(rng, f"{prefix} {number}", ext_numbers)
+        for number in range(count)
+    ]
+
+
+def test_devices_config_index_benchmark() -> None:
+    """Compare the index with a scan of the list on 2000 x 2000 devices."""
+    rng = random.Random(2000)
+    devices_config = _random_devices(rng, 2000, "Config", 40)
+    devices_auto = _random_devices(rng, 2000, "Auto", 40)
+    indexed_config = copy.deepcopy(devices_config)
+    linear_config = copy.deepcopy(devices_config)
+
+    started_at = perf_counter()
+    devices_index = DevicesConfigIndex(indexed_config)
+    indexed = [devices_index.get_device(device) for device in devices_auto]
+    indexed_duration = perf_counter() - started_at
+
+    started_at = perf_counter()
+    linear = [_get_device_linear(linear_config, device) for device in devices_auto]
+    linear_duration = perf_counter() - started_at
+
+    _LOGGER.info(
+        "2000 x 2000 devices, index: %.2f ms, scan: %.2f ms",
+        indexed_duration * 1000,
+        linear_duration * 1000,
+    )
+    assert indexed == linear
+    assert any(device[CONF_NAME].startswith("Config") for device in indexed)
+    assert indexed_duration < linear_duration
+
+
+def test_build_entities_matches_previous() -> None:
+    """Test the entities built with the index on random configs.
+
+    They are the ones built before the index, and the devices config given
+    is left unchanged.
+    """
+    for seed in range(200):
+        rng = random.Random(seed)
+        devices_config = _random_devices(rng, rng.randint(0, 30), "Config", 3)
+        devices_auto = _random_devices(rng, rng.randint(0, 60), "Auto", 3)
+        use_device_name = [rng.random() < 0.2 for _ in devices_auto]
+        original_config = copy.deepcopy(devices_config)
+
+        expected = _build_entities_linear(
+            copy.deepcopy(devices_config),
+            copy.deepcopy(devices_auto),
+            use_device_name,
+        )
+
+        devices_index = DevicesConfigIndex(devices_config)
+        auto_entities = [
+            devices_index.get_device(device, use_name)
+            for device, use_name in zip(
+                copy.deepcopy(devices_auto), use_device_name, strict=True
+            )
+        ]
+        entities = [
+            *devices_index.devices,
+            *remove_duplicate_entities(auto_entities, devices_index),
+        ]
+
+        assert entities == expected, f"seed {seed}"
+        assert devices_config == original_config, f"seed {seed}"
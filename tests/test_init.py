@@ -0,0 +1,163 @@
+"""Tests for the setup of the IPX800 V5."""
+
+import asyncio
+from unittest.mock import patch
+
+from pypx800v5 import EXT_X8R, EXTENSIONS
+
+from custom_components.ipx800v5.const import (
+    CONF_FAST_POLL_ENTITIES,
+    CONF_PARTIAL_POLLING,
+    CONF_SLOW_POLL_ENTITIES,
+    COORDINATOR,
+    DOMAIN,
+    POLL_TIER_NORMAL,
+    POLL_TIER_SLOW,
+)
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_OPTIMISTIC, CONF_SCAN_INTERVAL
+from homeassistant.core import HomeAssistant
+
+from .conftest import MAC_ADDRESS, FakeIpxApi
+
+RELAY_1_UNIQUE_ID = f"{DOMAIN}_{MAC_ADDRESS}_ipx_0_switch_ipx800_v5_relais_1"
+
+
+async def _async_setup_and_unload(hass: HomeAssistant, config_entry) -> None:
+    """Set up the entry once to cache its configuration, then unload it."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_setup_entry(
+    hass: HomeAssistant, ipx_api: FakeIpxApi, config_entry
+) -> None:
+    """Test the entities of the IPX800 are set up."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert config_entry.state is ConfigEntryState.LOADED
+    assert hass.states.get("switch.ipx800_v5_relais_1").state == "off"
+
+
+async def test_setup_entry_requests(
+    hass: HomeAssistant, ipx_api: FakeIpxApi, config_entry
+) -> None:
+    """Test the setup reads the configuration and the IO/ANA values only once."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    config_paths = [
+        "system/info",
+        "system/ipx",
+        *(f"ebx/{extension_type}" for extension_type in EXTENSIONS),
+        "object/thermostat",
+        "object/counter",
+        "object/timer",
+        "object/access_control",
+    ]
+    assert sorted(path for _, path in ipx_api.requests) == sorted(
+        [*config_paths, "core/io", "core/ana"]
+    )
+
+
+async def test_setup_entry_polling_options(
+    hass: HomeAssistant, ipx_api: FakeIpxApi, config_entry
+) -> None:
+    """Test the polling options win over the values of the entry creation."""
+    config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        config_entry,
+        data=config_entry.data
+        | {
+            CONF_SCAN_INTERVAL: 15,
+            CONF_PARTIAL_POLLING: False,
+            CONF_OPTIMISTIC: False,
+            CONF_FAST_POLL_ENTITIES: [],
+            CONF_SLOW_POLL_ENTITIES: [],
+        },
+        options=config_entry.data
+        | {
+            CONF_SCAN_INTERVAL: 30,
+            CONF_PARTIAL_POLLING: True,
+            CONF_OPTIMISTIC: True,
+            CONF_SLOW_POLL_ENTITIES: [RELAY_1_UNIQUE_ID],
+        },
+    )
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][config_entry.entry_id][COORDINATOR]
+    assert coordinator.poll_intervals[POLL_TIER_NORMAL] == 30
+    assert coordinator.partial_polling
+    assert coordinator.optimistic
+    assert coordinator.poll_tier_overrides == {RELAY_1_UNIQUE_ID: POLL_TIER_SLOW}
+
+
+async def test_update_polling_options(
+    hass: HomeAssistant, ipx_api: FakeIpxApi, config_entry
+) -> None:
+    """Test a change of a polling option is applied without a reload."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][config_entry.entry_id][COORDINATOR]
+
+    with patch.object(hass.config_entries, "async_reload") as async_reload:
+        hass.config_entries.async_update_entry(
+            config_entry,
+            options=config_entry.data
+            | {CONF_SCAN_INTERVAL: 45, CONF_PARTIAL_POLLING: True},
+        )
+        await hass.async_block_till_done()
+
+    async_reload.assert_not_called()
+    assert hass.data[DOMAIN][config_entry.entry_id][COORDINATOR] is coordinator
+    assert coordinator.poll_intervals[POLL_TIER_NORMAL] == 45
+    assert coordinator.partial_polling
+
+
+async def test_setup_entry_cached_config_offline(
+    hass: HomeAssistant, ipx_api: FakeIpxApi, config_entry
+) -> None:
+    """Test the entities are added once an IPX800 offline at startup answers."""
+    await _async_setup_and_unload(hass, config_entry)
+    ipx_api.offline = True
+
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert config_entry.state is ConfigEntryState.LOADED
+    assert hass.states.get("switch.ipx800_v5_relais_1").state == "unavailable"
+
+    ipx_api.offline = False
+    coordinator = hass.data[DOMAIN][config_entry.entry_id][COORDINATOR]
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get("switch.ipx800_v5_relais_1").state == "off"
+
+
+async def test_setup_entry_cached_config_changed(
+    hass: HomeAssistant, ipx_api: FakeIpxApi, config_entry
+) -> None:
+    """Test a change of the cached configuration updates the entities in place."""
+    await _async_setup_and_unload(hass, config_entry)
+    ipx_api.add_extensions(EXT_X8R, 1, "ioOutputState_id", 8)
+    extension = ipx_api.extensions[EXT_X8R][0]
+    for key, offset in (("ioOutput_id", 100), ("ioLongPush_id", 200)):
+        extension[key] = [x + offset for x in extension["ioOutputState_id"]]
+        for state_id in extension[key]:
+            ipx_api.io[state_id] = {"_id": state_id, "on": False}
+
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    coordinator = hass.data[DOMAIN][config_entry.entry_id][COORDINATOR]
+    assert hass.states.get("switch.x8r_1_relais_1") is None
+    await asyncio.gather(*config_entry._background_tasks)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("switch.x8r_1_relais_1").state == "off"
+    assert hass.data[DOMAIN][config_entry.entry_id][COORDINATOR] is coordinator
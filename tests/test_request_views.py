@@ -0,0 +1,227 @@
+"""Tests for the views receiving the pushes of the IPX800 V5."""
+
+from http import HTTPStatus
+
+import aiohttp
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ipx800v5.const import (
+    CONF_DEVICES,
+    CONF_PUSH_PASSWORD,
+    COORDINATOR,
+    DOMAIN,
+    PUSH_USERNAME,
+)
+from homeassistant.const import CONF_API_KEY, CONF_HOST, CONF_NAME, CONF_PORT
+from homeassistant.core import HomeAssistant
+
+from .conftest import FakeIpxApi
+
+PUSH_AUTH = aiohttp.BasicAuth(PUSH_USERNAME, "pushpassword")
+
+
+@pytest.fixture
+def push_config_entry() -> MockConfigEntry:
+    """Return an entry receiving the pushes of an IPX800 on the local host."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        source="user",
+        title="127.0.0.1",
+        unique_id=f"{DOMAIN}, 127.0.0.1",
+        data={
+            CONF_NAME: "IPX800 V5",
+            CONF_HOST: "127.0.0.1",
+            CONF_PORT: 80,
+            CONF_API_KEY: "apikey",
+            CONF_PUSH_PASSWORD: "pushpassword",
+            CONF_DEVICES: [],
+        },
+    )
+
+
+async def test_push_entity_state_after_reload(
+    hass: HomeAssistant,
+    hass_client_no_auth,
+    ipx_api: FakeIpxApi,
+    push_config_entry: MockConfigEntry,
+) -> None:
+    """Test the entity and data pushes reach the coordinator of a reloaded entry."""
+    push_config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(push_config_entry.entry_id)
+    await hass.async_block_till_done()
+    client = await hass_client_no_auth()
+
+    assert await hass.config_entries.async_reload(push_config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][push_config_entry.entry_id][COORDINATOR]
+
+    response = await client.get(
+        "/api/ipx800_v5/switch.ipx800_v5_relais_1/on", auth=PUSH_AUTH
+    )
+    assert response.status == HTTPStatus.OK
+    await hass.async_block_till_done()
+    assert hass.states.get("switch.ipx800_v5_relais_1").state == "on"
+    assert coordinator.data[1]["on"] is True
+
+    response = await client.get(
+        "/api/ipx800_v5_data/switch.ipx800_v5_relais_2=1", auth=PUSH_AUTH
+    )
+    assert response.status == HTTPStatus.OK
+    await hass.async_block_till_done()
+    assert hass.states.get("switch.ipx800_v5_relais_2").state == "on"
+    assert coordinator.data[2]["on"] is True
+
+
+async def test_push_password_changed(
+    hass: HomeAssistant,
+    hass_client_no_auth,
+    ipx_api: FakeIpxApi,
+    push_config_entry: MockConfigEntry,
+) -> None:
+    """Test the views registered once check the password of the reloaded entry."""
+    push_config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(push_config_entry.entry_id)
+    await hass.async_block_till_done()
+    client = await hass_client_no_auth()
+
+    hass.config_entries.async_update_entry(
+        push_config_entry,
+        data=push_config_entry.data | {CONF_PUSH_PASSWORD: "newpassword"},
+    )
+    await hass.async_block_till_done()
+
+    response = await client.get("/api/ipx800_v5_refresh", auth=PUSH_AUTH)
+    assert response.status == HTTPStatus.UNAUTHORIZED
+    response = await client.get(
+        "/api/ipx800_v5_refresh",
+        auth=aiohttp.BasicAuth(PUSH_USERNAME, "newpassword"),
+    )
+    assert response.status == HTTPStatus.OK
+
+
+async def test_push_ids_after_reload(
+    hass: HomeAssistant,
+    hass_client_no_auth,
+    ipx_api: FakeIpxApi,
+    push_config_entry: MockConfigEntry,
+) -> None:
+    """Test the ids pushes reach the coordinator of a reloaded entry."""
+    push_config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(push_config_entry.entry_id)
+    await hass.async_block_till_done()
+    client = await hass_client_no_auth()
+
+    assert await hass.config_entries.async_reload(push_config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][push_config_entry.entry_id][COORDINATOR]
+
+    response = await client.get("/api/ipx800_v5_ids/io/1=1&io/2=1", auth=PUSH_AUTH)
+    assert response.status == HTTPStatus.OK
+    await hass.async_block_till_done()
+    assert coordinator.data[1]["on"] is True
+    assert hass.states.get("switch.ipx800_v5_relais_2").state == "on"
+
+
+async def test_push_ids_wrong_type(
+    hass: HomeAssistant,
+    hass_client_no_auth,
+    ipx_api: FakeIpxApi,
+    push_config_entry: MockConfigEntry,
+) -> None:
+    """Test an id pushed with the type of another is skipped."""
+    push_config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(push_config_entry.entry_id)
+    await hass.async_block_till_done()
+    client = await hass_client_no_auth()
+    coordinator = hass.data[DOMAIN][push_config_entry.entry_id][COORDINATOR]
+
+    # 41 is an ANA of the IPX800, 1 is the IO of its first relay
+    response = await client.get(
+        "/api/ipx800_v5_ids/io/41=1&ana/1=12&io/2=1", auth=PUSH_AUTH
+    )
+    assert response.status == HTTPStatus.OK
+    await hass.async_block_till_done()
+    assert coordinator.data[41] == {"_id": 41, "value": 0}
+    assert coordinator.data[1] == {"_id": 1, "on": False}
+    assert coordinator.data[2]["on"] is True
+
+
+async def test_push_bulk_after_reload(
+    hass: HomeAssistant,
+    hass_client_no_auth,
+    ipx_api: FakeIpxApi,
+    push_config_entry: MockConfigEntry,
+) -> None:
+    """Test the bulk pushes reach the coordinator of a reloaded entry."""
+    push_config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(push_config_entry.entry_id)
+    await hass.async_block_till_done()
+    client = await hass_client_no_auth()
+
+    assert await hass.config_entries.async_reload(push_config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][push_config_entry.entry_id][COORDINATOR]
+
+    response = await client.post(
+        "/api/ipx800_v5_bulk", json={"io/1": 1, "io/2": "on"}, auth=PUSH_AUTH
+    )
+    assert response.status == HTTPStatus.OK
+    await hass.async_block_till_done()
+    assert coordinator.data[1]["on"] is True
+    assert hass.states.get("switch.ipx800_v5_relais_2").state == "on"
+
+
+async def test_push_bulk_form_wrong_type(
+    hass: HomeAssistant,
+    hass_client_no_auth,
+    ipx_api: FakeIpxApi,
+    push_config_entry: MockConfigEntry,
+) -> None:
+    """Test a form bulk push skips the ids pushed with the type of another."""
+    push_config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(push_config_entry.entry_id)
+    await hass.async_block_till_done()
+    client = await hass_client_no_auth()
+    coordinator = hass.data[DOMAIN][push_config_entry.entry_id][COORDINATOR]
+
+    response = await client.post(
+        "/api/ipx800_v5_bulk",
+        data={"io/42": "1", "ana/41": "12.5", "io/3": "on"},
+        auth=PUSH_AUTH,
+    )
+    assert response.status == HTTPStatus.OK
+    await hass.async_block_till_done()
+    assert coordinator.data[42] == {"_id": 42, "value": 0}
+    assert coordinator.data[41]["value"] == 12.5
+    assert hass.states.get("switch.ipx800_v5_relais_3").state == "on"
+
+
+async def test_push_entry_not_loaded(
+    hass: HomeAssistant,
+    hass_client_no_auth,
+    ipx_api: FakeIpxApi,
+    push_config_entry: MockConfigEntry,
+) -> None:
+    """Test the pushes are refused while the entry is unloaded."""
+    push_config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(push_config_entry.entry_id)
+    await hass.async_block_till_done()
+    client = await hass_client_no_auth()
+
+    assert await hass.config_entries.async_unload(push_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    for path in (
+        "/api/ipx800_v5/switch.ipx800_v5_relais_1/on",
+        "/api/ipx800_v5_data/switch.ipx800_v5_relais_1=1",
+        "/api/ipx800_v5_refresh",
+        "/api/ipx800_v5_ids/io/1=1",
+    ):
+        response = await client.get(path, auth=PUSH_AUTH)
+        assert response.status == HTTPStatus.SERVICE_UNAVAILABLE, path
+
+    response = await client.post(
+        "/api/ipx800_v5_bulk", json={"io/1": 1}, auth=PUSH_AUTH
+    )
+    assert response.status == HTTPStatus.SERVICE_UNAVAILABLE